@@ -1,14 +1,15 @@
-import logging
 from typing import TypedDict, Dict, Any, List
-from langgraph.graph import StateGraph, END
 
 from app.intent.detector import IntentDetector
 from app.memory.session_store import SessionStore
 from app.graph.multi_intent_planner import execute_intents
-from app.graph.clarifier import get_missing_args
+from app.graph.clarifier import validate_intents
+from app.graph.arg_resume import ClarificationResumer
 from app.graph.response_builder import ResponseBuilder
+from app.intent.hf_client import run_in_llm_pool
+from app.logs import get_logger
 
-logger = logging.getLogger("app.graph.agent_graph")
+logger = get_logger("app.graph.agent_graph")
 
 
 class AgentState(TypedDict):
@@ -16,6 +17,7 @@ class AgentState(TypedDict):
     session_id: str
     user_message: str
     intents: List[Dict[str, Any]]
+    validations: Dict[str, List[str]]   # normalized intent name → missing required args
     clarifications: List[Dict[str, Any]]
     results: Dict[str, Any]
     assistant_response: str
@@ -27,21 +29,45 @@ class AgentGraphWorkflow:
         self.detector = detector
         self.memory = memory
         self.response_builder = ResponseBuilder()
+        self.resumer = ClarificationResumer(detector.client)
         self.graph = self._build_graph()
 
     def _build_graph(self):
+        # Imported here: langgraph is heavy and only needed once the workflow is built
+        from langgraph.graph import StateGraph, END
+
         workflow = StateGraph(AgentState)
         workflow.add_node("detect_intent", self._detect_intent_node)
         workflow.add_node("clarify", self._clarify_node)
         workflow.add_node("execute", self._execute_node)
         workflow.add_node("respond", self._respond_node)
         workflow.set_entry_point("detect_intent")
-        workflow.add_edge("detect_intent", "clarify")
-        workflow.add_edge("clarify", "execute")
+        # Chit-chat / fallback turns skip clarify + execute entirely;
+        # fully specified intents go straight to execute
+        workflow.add_conditional_edges(
+            "detect_intent", self._route_after_detect,
+            {"clarify": "clarify", "execute": "execute", "respond": "respond"}
+        )
+        # Turns that need clarification skip execute
+        workflow.add_conditional_edges(
+            "clarify", self._route_after_clarify, {"execute": "execute", "respond": "respond"}
+        )
         workflow.add_edge("execute", "respond")
         workflow.add_edge("respond", END)
         return workflow.compile()
 
+    @staticmethod
+    def _route_after_detect(state: AgentState) -> str:
+        if not state.get("intents"):
+            return "respond"
+        if any(state.get("validations", {}).values()):
+            return "clarify"
+        return "execute"
+
+    @staticmethod
+    def _route_after_clarify(state: AgentState) -> str:
+        return "respond" if state.get("clarifications") else "execute"
+
     async def _detect_intent_node(self, state: AgentState) -> AgentState:
         session_id = state["session_id"]
         user_message = state["user_message"]
@@ -51,13 +77,24 @@ class AgentGraphWorkflow:
         memory_summary = self._summarize_memory(session)
         conversation_state = self.memory.get_state(session_id)
 
-        detection = await self.detector.detect(user_message, memory_summary)
+        # Fast path: a reply to a pending clarification only needs the pending fields parsed
+        if conversation_state["status"] == "awaiting_args" and conversation_state["active_intent"]:
+            resumed = await self.resumer.resume(
+                conversation_state["active_intent"],
+                conversation_state["pending_args"],
+                conversation_state["provided_args"],
+                user_message,
+            )
+            if resumed is not None:
+                return await self._resume_intent(state, resumed)
+
+        detection = await self.detector.detect(user_message, memory_summary, conversation_state["active_intent"])
         intents = detection.get("intents", [])
 
         self.memory.add_message(session_id, "user", user_message)
         self.memory.add_intents(session_id, intents)
 
-        logger.info(f"[TRACE:{trace_id}] Detected intents={intents}, prev_state={conversation_state}")
+        logger.info(f"[TRACE:{trace_id}] Detected intents", intents=intents, prev_state=conversation_state)
 
         # Chit-chat override (if only null args HR intents detected)
         is_chitchat = (
@@ -73,6 +110,10 @@ class AgentGraphWorkflow:
             state["intents"] = []
             return state
 
+        # Every intent is validated exactly once per turn; clarify/execute reuse the result
+        validations = await validate_intents(intents) if intents else {}
+        state["validations"] = validations
+
         # Resume unfinished flow if new args provided
         if conversation_state["status"] == "awaiting_args" and intents:
             active_intent = conversation_state["active_intent"]
@@ -87,9 +128,12 @@ class AgentGraphWorkflow:
 
         # Fresh HR intent
         elif intents:
-            missing_args = await get_missing_args(intents[0]["name"], intents[0].get("args", {}))
+            missing_args = validations.get(intents[0]["name"].strip().lower(), [])
             if missing_args:
-                self.memory.set_state(session_id, intents[0]["name"], "awaiting_args", pending_args=missing_args)
+                given = {k: v for k, v in (intents[0].get("args") or {}).items() if v not in (None, "")}
+                self.memory.set_state(
+                    session_id, intents[0]["name"], "awaiting_args", pending_args=missing_args, provided_args=given
+                )
             else:
                 self.memory.set_state(session_id, intents[0]["name"], "executing")
 
@@ -101,14 +145,39 @@ class AgentGraphWorkflow:
         state["intents"] = intents
         return state
 
+    async def _resume_intent(self, state: AgentState, resumed: Dict[str, Any]) -> AgentState:
+        """Continue the active intent with args parsed by the clarification fast path."""
+        session_id = state["session_id"]
+        intents = [resumed]
+
+        self.memory.add_message(session_id, "user", state["user_message"])
+        self.memory.add_intents(session_id, intents)
+
+        validations = await validate_intents(intents)
+        missing = validations.get(resumed["name"].strip().lower(), [])
+        self.memory.set_state(
+            session_id,
+            resumed["name"],
+            "awaiting_args" if missing else "executing",
+            pending_args=missing,
+            provided_args=resumed["args"],
+        )
+        logger.info(f"[TRACE:{state['trace_id']}] Fast-path resume of {resumed['name']}, still missing={missing}")
+
+        state["intents"] = intents
+        state["validations"] = validations
+        return state
+
     async def _clarify_node(self, state: AgentState) -> AgentState:
         session_id = state["session_id"]
         intents = state["intents"]
         trace_id = state["trace_id"]
 
+        validations = state.get("validations", {})
+
         clarifications = []
         for intent in intents:
-            missing = await get_missing_args(intent["name"], intent.get("args", {}))
+            missing = validations.get(intent["name"].strip().lower(), [])
             if missing:
                 self.memory.add_clarification(session_id, intent["name"], missing)
                 self.memory.set_state(session_id, intent["name"], "awaiting_args", pending_args=missing)
@@ -116,7 +185,7 @@ class AgentGraphWorkflow:
 
         state["clarifications"] = clarifications
         if clarifications:
-            logger.warning(f"[TRACE:{trace_id}] Clarifications required={clarifications}")
+            logger.warning(f"[TRACE:{trace_id}] Clarifications required", clarifications=clarifications)
         return state
 
     async def _execute_node(self, state: AgentState) -> AgentState:
@@ -128,26 +197,34 @@ class AgentGraphWorkflow:
         results = state.get("results", {})
         if not clarifications and intents:
             self.memory.set_state(session_id, intents[0]["name"], "executing")
-            results = await execute_intents(intents, self.memory, session_id)
+            results = await execute_intents(intents, self.memory, session_id, state.get("validations"))
             self.memory.set_state(session_id, intents[0]["name"], "completed")
 
-        logger.info(f"[TRACE:{trace_id}] Execution results={results}")
+        logger.info(f"[TRACE:{trace_id}] Execution results", results=results)
         state["results"] = results
         return state
 
-    def _respond_node(self, state: AgentState) -> AgentState:
+    async def _respond_node(self, state: AgentState) -> AgentState:
         session_id = state["session_id"]
         results = state.get("results", {})
         clarifications = state.get("clarifications", [])
         trace_id = state["trace_id"]
         user_message = state.get("user_message", "")
 
+        # Background jobs that finished since the last reply are reported in this one
+        if not clarifications:
+            finished_jobs = self.memory.take_finished_jobs(session_id)
+            if finished_jobs:
+                results = {k: v for k, v in results.items() if k != "fallback"}
+                results.update(finished_jobs)
+                state["results"] = results
+
         # Fetch conversation state before building response
         conv_state = self.memory.get_state(session_id)
 
-        # Pass conversation state into ResponseBuilder
-        assistant_response = self.response_builder.build(
-            results, clarifications, user_message, state=conv_state
+        # Pass conversation state into ResponseBuilder (its LLM call blocks: run it in the HF pool)
+        assistant_response = await run_in_llm_pool(
+            self.response_builder.build, results, clarifications, user_message, state=conv_state, session_id=session_id
         )
         self.memory.add_message(session_id, "assistant", assistant_response)
 
@@ -160,7 +237,7 @@ class AgentGraphWorkflow:
         state["assistant_response"] = assistant_response
         state["history"] = self.memory.full_history(session_id)
 
-        logger.info(f"[TRACE:{trace_id}] Assistant response={assistant_response}")
+        logger.info(f"[TRACE:{trace_id}] Assistant response", response=assistant_response)
         return state
 
     def _summarize_memory(self, session: Dict[str, Any]) -> str:
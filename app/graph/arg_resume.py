@@ -0,0 +1,268 @@
+import re
+import logging
+import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.intent.hf_client import HFModelClient
+from app.graph.mcp_client import mcp_client
+from app.graph.schema_utils import extract_schema
+
+logger = logging.getLogger("app.graph.arg_resume")
+
+# Clarification answers are short ("tanggal 10 sampai 12"); longer messages
+# are more likely a new request and go through full intent detection.
+MAX_REPLY_WORDS = 12
+
+MONTHS = {
+    "jan": 1, "januari": 1, "january": 1,
+    "feb": 2, "februari": 2, "february": 2, "pebruari": 2,
+    "mar": 3, "maret": 3, "march": 3,
+    "apr": 4, "april": 4,
+    "mei": 5, "may": 5,
+    "jun": 6, "juni": 6, "june": 6,
+    "jul": 7, "juli": 7, "july": 7,
+    "agu": 8, "agt": 8, "agus": 8, "agustus": 8, "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "okt": 10, "oktober": 10, "oct": 10, "october": 10,
+    "nov": 11, "nopember": 11, "november": 11,
+    "des": 12, "desember": 12, "dec": 12, "december": 12,
+}
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+_RANGE = r"\s*(?:-|–|s/d|s\.d\.?|sd|sampai|hingga|to|until)\s*"
+
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_DMY_DATE = re.compile(r"\b(\d{1,2})[/.](\d{1,2})[/.](\d{4})\b")
+_NAMED_DATE = re.compile(
+    rf"\b(\d{{1,2}})(?:{_RANGE}(\d{{1,2}}))?\s+({_MONTH})\b(?:\s+(\d{{4}}))?"
+)
+_BARE_DAY = re.compile(rf"\b(?:tanggal|tgl\.?)\s*(\d{{1,2}})(?:{_RANGE}(?:tanggal|tgl\.?)?\s*(\d{{1,2}}))?\b")
+_RELATIVE_DAY = re.compile(r"\b(hari ini|today|besok|tomorrow|lusa)\b")
+_RELATIVE_OFFSETS = {"hari ini": 0, "today": 0, "besok": 1, "tomorrow": 1, "lusa": 2}
+
+_ISO_PERIOD = re.compile(r"\b(\d{4})-(\d{2})\b(?!-\d)")
+_NAMED_PERIOD = re.compile(rf"\b({_MONTH})\s+(\d{{4}})\b")
+_RELATIVE_PERIOD = re.compile(r"\b(bulan ini|this month|bulan lalu|last month)\b")
+
+# Employee IDs look like E-001; "ke-25" / "tgl-12" must not match
+_EMPLOYEE_ID = re.compile(r"\be-?(\d{3,6})\b")
+_UUID = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b")
+
+# Informal / Indonesian words for enum values (e.g. LeaveType)
+ENUM_SYNONYMS = {
+    "annual": ["tahunan", "annual"],
+    "sick": ["sakit", "sick"],
+    "unpaid": ["tidak dibayar", "unpaid", "tanpa gaji"],
+    "maternity": ["melahirkan", "hamil", "maternity"],
+    "other": ["lainnya", "lain", "other"],
+}
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[datetime.date]:
+    try:
+        return datetime.date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _next_occurrence(d: Optional[datetime.date], by_month: bool) -> Optional[datetime.date]:
+    if d is None:
+        return None
+    if by_month:
+        year, month = (d.year + 1, 1) if d.month == 12 else (d.year, d.month + 1)
+        return _safe_date(year, month, d.day)
+    return _safe_date(d.year + 1, d.month, d.day)
+
+
+def _roll_forward(dates: List[Optional[datetime.date]], today: datetime.date,
+                  by_month: bool) -> List[Optional[datetime.date]]:
+    """
+    Dates given without a year (or month) refer to the next occurrence. A range moves as
+    one unit, by its start ("tgl 3 s/d 5" on the 5th is next month's 3rd to 5th), and an
+    end that still falls before its start is in the following month/year ("28 s/d 2").
+    """
+    if dates[0] is not None and dates[0] < today:
+        dates = [_next_occurrence(d, by_month) for d in dates]
+    if len(dates) == 2 and None not in dates and dates[1] < dates[0]:
+        dates[1] = _next_occurrence(dates[1], by_month)
+    return dates
+
+
+def _overlaps(span: Tuple[int, int], taken: List[Tuple[int, int]]) -> bool:
+    return any(span[0] < e and s < span[1] for s, e in taken)
+
+
+def find_dates(text: str, today: datetime.date) -> List[datetime.date]:
+    """All calendar dates mentioned in `text`, in order of appearance."""
+    found: List[Tuple[int, datetime.date]] = []
+    taken: List[Tuple[int, int]] = []
+
+    def add(match, dates):
+        if _overlaps(match.span(), taken):
+            return
+        taken.append(match.span())
+        for offset, d in enumerate(dates):
+            if d is not None:
+                found.append((match.start() + offset, d))
+
+    for m in _ISO_DATE.finditer(text):
+        add(m, [_safe_date(int(m[1]), int(m[2]), int(m[3]))])
+    for m in _DMY_DATE.finditer(text):
+        add(m, [_safe_date(int(m[3]), int(m[2]), int(m[1]))])
+    for m in _NAMED_DATE.finditer(text):
+        month = MONTHS[m[3]]
+        year = int(m[4]) if m[4] else today.year
+        days = [int(m[1])] + ([int(m[2])] if m[2] else [])
+        dates = [_safe_date(year, month, day) for day in days]
+        if not m[4]:
+            dates = _roll_forward(dates, today, by_month=False)
+        add(m, dates)
+    for m in _BARE_DAY.finditer(text):
+        days = [int(m[1])] + ([int(m[2])] if m[2] else [])
+        dates = _roll_forward([_safe_date(today.year, today.month, day) for day in days], today, by_month=True)
+        add(m, dates)
+    for m in _RELATIVE_DAY.finditer(text):
+        add(m, [today + datetime.timedelta(days=_RELATIVE_OFFSETS[m[1]])])
+
+    return [d for _, d in sorted(found, key=lambda item: item[0])]
+
+
+def find_periods(text: str, today: datetime.date) -> List[str]:
+    """Payroll/attendance periods (YYYY-MM) mentioned in `text`, in order of appearance."""
+    found: List[Tuple[int, str]] = []
+    for m in _ISO_PERIOD.finditer(text):
+        found.append((m.start(), f"{m[1]}-{m[2]}"))
+    for m in _NAMED_PERIOD.finditer(text):
+        found.append((m.start(), f"{m[2]}-{MONTHS[m[1]]:02d}"))
+    for m in _RELATIVE_PERIOD.finditer(text):
+        ref = today if m[1] in ("bulan ini", "this month") else today.replace(day=1) - datetime.timedelta(days=1)
+        found.append((m.start(), f"{ref.year}-{ref.month:02d}"))
+    return [p for _, p in sorted(found)]
+
+
+def _field_kind(name: str, prop: Dict[str, Any]) -> str:
+    if prop.get("format") == "date":
+        return "date"
+    if "enum" in prop:
+        return "enum"
+    if name == "employee_id":
+        return "employee_id"
+    if name == "request_id":
+        return "uuid"
+    if name.endswith("period") or "YYYY-MM" in (prop.get("description") or ""):
+        return "period"
+    return "text"
+
+
+def parse_pending_args(
+    reply: str,
+    pending: List[str],
+    schema: Dict[str, Any],
+    today: Optional[datetime.date] = None,
+) -> Dict[str, Any]:
+    """
+    Deterministically extract values for the `pending` fields of `schema` from a short reply.
+    Only fields with a recognisable shape (dates, periods, IDs, enums) are parsed;
+    anything else is left for the LLM fallback.
+    """
+    today = today or datetime.date.today()
+    text = reply.lower()
+    props = schema.get("properties", {})
+    kinds = {name: _field_kind(name, props.get(name, {})) for name in pending}
+    parsed: Dict[str, Any] = {}
+
+    date_fields = [n for n in pending if kinds[n] == "date"]
+    if date_fields:
+        dates = find_dates(text, today)
+        if len(dates) == 1:
+            # "cuti tanggal 10" → single-day range
+            dates = dates * len(date_fields)
+        for name, d in zip(date_fields, dates):
+            parsed[name] = d.isoformat()
+
+    period_fields = [n for n in pending if kinds[n] == "period"]
+    if period_fields:
+        for name, p in zip(period_fields, find_periods(text, today)):
+            parsed[name] = p
+
+    for name in pending:
+        kind = kinds[name]
+        if kind == "employee_id":
+            m = _EMPLOYEE_ID.search(text)
+            if m:
+                parsed[name] = f"E-{m[1]}"
+        elif kind == "uuid":
+            m = _UUID.search(text)
+            if m:
+                parsed[name] = m[0]
+        elif kind == "enum":
+            for value in props[name]["enum"]:
+                if any(re.search(rf"\b{re.escape(w)}\b", text) for w in ENUM_SYNONYMS.get(value, [value])):
+                    parsed[name] = value
+                    break
+
+    return parsed
+
+
+class ClarificationResumer:
+    """
+    Fast path for answers to a clarification question.
+    While a session is `awaiting_args`, the reply is parsed only for the pending fields of
+    the active intent's schema: deterministically first, then with a tiny targeted LLM
+    prompt for whatever is still missing. Full intent detection is skipped when it works.
+    """
+
+    def __init__(self, client: HFModelClient):
+        self.client = client
+
+    async def _llm_extract(self, reply: str, fields: List[str], schema: Dict[str, Any], today: datetime.date) -> Dict[str, Any]:
+        props = schema.get("properties", {})
+        lines = []
+        for name in fields:
+            prop = props.get(name, {})
+            kind = "date YYYY-MM-DD" if prop.get("format") == "date" else prop.get("type", "string")
+            desc = prop.get("description")
+            lines.append(f"- {name} ({kind}){': ' + desc if desc else ''}")
+
+        system_prompt = (
+            "Extract the listed fields from the user's reply. "
+            "Return a JSON object with exactly these keys; use null when the reply does not contain a value. "
+            "Do not guess."
+        )
+        user_prompt = "Fields:\n" + "\n".join(lines) + f"\nToday: {today.isoformat()}\nReply: {reply}"
+        answer_schema = {"type": "object", "properties": {name: {} for name in fields}, "required": list(fields)}
+        result = await self.client.achat_json(system_prompt, user_prompt, route="arg_extraction",
+                                              validate=lambda r: all(k in r for k in fields), schema=answer_schema)
+        return {k: v for k, v in result.items() if k in fields and v not in (None, "")}
+
+    async def resume(
+        self,
+        intent: str,
+        pending: List[str],
+        provided: Dict[str, Any],
+        reply: str,
+        today: Optional[datetime.date] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the resumed intent ({"name", "confidence", "args"}) with the new values merged
+        into the already provided ones, or None when the reply does not look like an answer.
+        """
+        if not pending or len(reply.split()) > MAX_REPLY_WORDS:
+            return None
+
+        tool = next((t for t in await mcp_client.list_tools() if t.name == intent), None)
+        if tool is None:
+            return None
+        schema = extract_schema(tool)
+        today = today or datetime.date.today()
+
+        parsed = parse_pending_args(reply, pending, schema, today)
+        remaining = [f for f in pending if f not in parsed]
+        if remaining:
+            parsed.update(await self._llm_extract(reply, remaining, schema, today))
+
+        if not parsed:
+            logger.info(f"[RESUME] Nothing for {pending} in reply, falling back to full detection.")
+            return None
+
+        logger.info(f"[RESUME] Resumed {intent} with {parsed} (pending was {pending})")
+        return {"name": intent, "confidence": 1.0, "args": {**provided, **parsed}}
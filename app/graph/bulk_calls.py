@@ -0,0 +1,65 @@
+import json
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger("app.graph.bulk_calls")
+
+# `<tool>_many` takes `employee_ids` instead of one `employee_id`
+BULK_SUFFIX = "_many"
+
+
+class ToolCall(NamedTuple):
+    tool: str                       # tool to call (the bulk variant when steps were merged)
+    args: Dict[str, Any]
+    members: List[int]              # indexes of the original steps this call answers
+    employee_ids: Optional[List[str]] = None   # set when merged into a bulk call
+
+
+def merge_bulk_calls(calls: Sequence[Tuple[str, Dict[str, Any]]], tool_names: Iterable[str]) -> List[ToolCall]:
+    """
+    Merge calls of the same tool that differ only in `employee_id` into one call of its
+    `<tool>_many` variant (when the server has one). Order follows each group's first step.
+    """
+    available = set(tool_names)
+    merged: List[ToolCall] = []
+    groups: Dict[Tuple[str, str], ToolCall] = {}
+
+    for idx, (tool, args) in enumerate(calls):
+        eid = args.get("employee_id")
+        if not eid or tool + BULK_SUFFIX not in available:
+            merged.append(ToolCall(tool, args, [idx]))
+            continue
+        shared = {k: v for k, v in args.items() if k != "employee_id"}
+        key = (tool, json.dumps(shared, sort_keys=True, default=str))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = ToolCall(tool, args, [idx], [eid])
+            merged.append(group)
+        else:
+            group.members.append(idx)
+            if eid not in group.employee_ids:
+                group.employee_ids.append(eid)
+
+    calls_out = []
+    for call in merged:
+        if call.employee_ids is not None and len(call.employee_ids) > 1:
+            shared = {k: v for k, v in call.args.items() if k != "employee_id"}
+            bulk = ToolCall(call.tool + BULK_SUFFIX, {**shared, "employee_ids": call.employee_ids},
+                            call.members, call.employee_ids)
+            logger.info(f"[BULK] Merged {len(call.members)} '{call.tool}' calls into {bulk.tool} "
+                        f"for {len(call.employee_ids)} employees")
+            calls_out.append(bulk)
+        else:
+            calls_out.append(ToolCall(call.tool, call.args, call.members))
+    return calls_out
+
+
+def result_for(bulk_result: Any, employee_id: str) -> Dict[str, Any]:
+    """One employee's entry of a `<tool>_many` result, shaped like the single-employee tool's result."""
+    if isinstance(bulk_result, dict):
+        for item in bulk_result.get("results", []):
+            if item.get("employee_id") == employee_id:
+                return item
+        if employee_id in bulk_result.get("not_found", []):
+            return {"employee_id": employee_id, "error": "not_found"}
+    return {"employee_id": employee_id, "raw_text": str(bulk_result)}
@@ -1,12 +1,40 @@
-from typing import List, Dict
+from typing import List, Dict, Any
 from .mcp_client import mcp_client
 from .schema_utils import extract_schema
+from app.offload import offloader
 import logging
 import json
 
 logger = logging.getLogger("app.graph.clarifier")
 
 
+def _log_schema(tool, given_args: Dict):
+    """Full schema and arguments for debug traceability (pretty-printed: run off the event loop)."""
+    logger.debug(
+        "[CLARIFIER] Tool=%s schema=%s given_args=%s",
+        tool.name,
+        json.dumps(extract_schema(tool), ensure_ascii=False, indent=2),
+        json.dumps(given_args, ensure_ascii=False, indent=2)
+    )
+
+
+def _missing_for(tool, given_args: Dict) -> List[str]:
+    """Required args of `tool` that are absent or empty in `given_args`."""
+    schema = extract_schema(tool)
+    required = schema.get("required", [])
+
+    missing = [
+        r for r in required
+        if r not in given_args or given_args[r] is None or given_args[r] == ""
+    ]
+
+    if missing:
+        logger.info(f"[CLARIFIER] Missing args for {tool.name}: {missing}")
+    else:
+        logger.debug(f"[CLARIFIER] No missing args for {tool.name}")
+    return missing
+
+
 async def get_missing_args(intent: str, given_args: Dict) -> List[str]:
     """
     Inspect MCP schema to determine required args missing from the user's input.
@@ -15,26 +43,23 @@ async def get_missing_args(intent: str, given_args: Dict) -> List[str]:
     tools = await mcp_client.list_tools()   # always a list[Tool]
     for t in tools:
         if t.name == intent:
-            schema = extract_schema(t)
-            required = schema.get("required", [])
-
-            # Log full schema and arguments for debug traceability
-            logger.debug(
-                "[CLARIFIER] Tool=%s schema=%s given_args=%s",
-                t.name,
-                json.dumps(schema, ensure_ascii=False, indent=2),
-                json.dumps(given_args, ensure_ascii=False, indent=2)
-            )
-
-            missing = [
-                r for r in required
-                if r not in given_args or given_args[r] is None or given_args[r] == ""
-            ]
-
-            if missing:
-                logger.info(f"[CLARIFIER] Missing args for {intent}: {missing}")
-            else:
-                logger.debug(f"[CLARIFIER] No missing args for {intent}")
-
-            return missing
+            if logger.isEnabledFor(logging.DEBUG):
+                await offloader.run(_log_schema, t, given_args)
+            return _missing_for(t, given_args)
     return []
+
+
+async def validate_intents(intents: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Check every intent of a turn against its tool schema with a single tool listing.
+    Returns {normalized intent name: missing required args}; unknown tools map to [].
+    """
+    tools = {t.name.strip().lower(): t for t in await mcp_client.list_tools()}
+    validations: Dict[str, List[str]] = {}
+    for intent in intents:
+        name = intent["name"].strip().lower()
+        tool = tools.get(name)
+        if tool and logger.isEnabledFor(logging.DEBUG):
+            await offloader.run(_log_schema, tool, intent.get("args") or {})
+        validations[name] = _missing_for(tool, intent.get("args") or {}) if tool else []
+    return validations
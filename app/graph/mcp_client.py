@@ -1,11 +1,21 @@
-import logging
 import json
+import time
+import asyncio
+import functools
+import itertools
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Dict, Any, Optional, List
 import os
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.shared.session import ProgressFnT
 
-logger = logging.getLogger("app.graph.mcp_client")
+from app.offload import offloader
+from app.logs import get_logger
+from app.replay.recorder import recorder, active_cassette
+
+logger = get_logger("app.graph.mcp_client")
 
 
 def make_json_block(data: dict) -> dict:
@@ -20,56 +30,233 @@ def make_json_block(data: dict) -> dict:
         return TextContent(type="text", text=json.dumps(data))
 
 
+def _default_endpoints(mode: str) -> List[str]:
+    """MCP_ENDPOINTS (comma-separated) or a single local endpoint built from MCP_HOST/MCP_PORT."""
+    raw = os.getenv("MCP_ENDPOINTS", "")
+    endpoints = [e.strip() for e in raw.split(",") if e.strip()]
+    if endpoints:
+        return endpoints
+    host = os.getenv("MCP_HOST", "127.0.0.1")
+    if host in ("0.0.0.0", "::"):
+        host = "127.0.0.1"
+    port = os.getenv("MCP_PORT", "8001")
+    return [f"http://{host}:{port}/{'sse' if mode == 'sse' else 'mcp'}"]
+
+
+class _MCPConnection:
+    """
+    One transport + ClientSession, owned for its whole lifetime by a single task
+    so they are entered and exited from the same task (anyio cancel scopes require it).
+    """
+
+    RECONNECT_AFTER_S = float(os.getenv("MCP_RECONNECT_S", "5"))
+
+    def __init__(self, label: str, open_streams):
+        self.label = label
+        self._open_streams = open_streams
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self.failed_at: Optional[float] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None
+
+    @property
+    def retry_due(self) -> bool:
+        return self.failed_at is None or time.monotonic() - self.failed_at >= self.RECONNECT_AFTER_S
+
+    async def _run(self, ready: asyncio.Future):
+        try:
+            async with AsyncExitStack() as stack:
+                streams = await stack.enter_async_context(self._open_streams())
+                session = await stack.enter_async_context(ClientSession(streams[0], streams[1]))
+                await session.initialize()
+                self.session = session
+                self.failed_at = None
+                ready.set_result(None)
+                await self._closing.wait()
+        except Exception as e:
+            self.failed_at = time.monotonic()
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error(f"[MCP-CLIENT] MCP session {self.label} terminated: {e}", exc_info=True)
+        finally:
+            self.session = None
+            # Cancelled (or a BaseException) before the session came up: don't leave start() waiting
+            if not ready.done():
+                ready.cancel()
+
+    async def start(self):
+        self._closing = asyncio.Event()
+        ready = asyncio.get_running_loop().create_future()
+        self._runner = asyncio.create_task(self._run(ready))
+        await ready
+
+    async def stop(self):
+        if self._runner:
+            self._closing.set()
+            await self._runner
+            self._runner = None
+
+
 class MCPToolClient:
     """
     Wrapper around MCP client.
     Manages a session with the MCP server and provides tool calls.
     Always normalizes tools to a plain list[Tool].
+
+    Transport is picked by `mode` (default: MCP_MODE env):
+      - "stdio":     spawn `mcp_server.server` as a subprocess (default)
+      - "inprocess": run the same MCP Server in this event loop over memory streams,
+                     for co-located tool servers (no subprocess, no pipe I/O)
+      - "http":      streamable HTTP to remote tool servers
+      - "sse":       legacy HTTP+SSE to remote tool servers
+
+    For "http"/"sse", `endpoints` (default: MCP_ENDPOINTS env) may list several servers.
+    One keep-alive session is held per endpoint and each call goes to the endpoint with
+    the fewest in-flight calls (round-robin on ties). Unreachable endpoints are skipped
+    and retried after MCP_RECONNECT_S seconds.
     """
 
-    def __init__(self):
+    MODES = ("stdio", "inprocess", "http", "sse")
+
+    def __init__(self, mode: Optional[str] = None, endpoints: Optional[List[str]] = None):
+        self.mode = (mode or os.getenv("MCP_MODE", "stdio")).strip().lower()
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unsupported MCP_MODE '{self.mode}', expected one of {self.MODES}")
+
         self.params = StdioServerParameters(
             command="python",
             args=["-m", "mcp_server.server", "stdio"],
             env={"PYTHONPATH": "/app", **os.environ},
         )
-        self.session: Optional[ClientSession] = None
-        self._ctx = None
-        self._aio = None
+        if self.mode in ("http", "sse"):
+            self.endpoints = list(endpoints or _default_endpoints(self.mode))
+        else:
+            self.endpoints = [self.mode]
+
+        self._connections = [
+            _MCPConnection(ep, functools.partial(self._open_streams, ep)) for ep in self.endpoints
+        ]
+        self._rr = itertools.count()
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def session(self) -> Optional[ClientSession]:
+        """First live session (single-endpoint modes have exactly one)."""
+        return next((c.session for c in self._connections if c.alive), None)
+
+    def _open_streams(self, endpoint: str):
+        if self.mode == "inprocess":
+            return self._inprocess_streams()
+        if self.mode == "http":
+            return self._http_streams(endpoint)
+        if self.mode == "sse":
+            from mcp.client.sse import sse_client
+            return sse_client(endpoint)
+        return stdio_client(self.params)
+
+    @asynccontextmanager
+    async def _inprocess_streams(self):
+        """Serve mcp_server in this event loop and hand back the client side of memory streams."""
+        from mcp.shared.memory import create_client_server_memory_streams
+        from mcp_server import hr_tools
+        from mcp_server.server import build_server
+
+        # Opening, seeding and indexing the store blocks; keep it off the API's event loop
+        await anyio.to_thread.run_sync(hr_tools.services.warm)
+        server = build_server()
+        async with create_client_server_memory_streams() as (client_streams, server_streams):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(
+                    server.run,
+                    server_streams[0],
+                    server_streams[1],
+                    server.create_initialization_options(),
+                )
+                try:
+                    yield client_streams
+                finally:
+                    tg.cancel_scope.cancel()
+
+    @asynccontextmanager
+    async def _http_streams(self, url: str):
+        """Streamable HTTP over a keep-alive httpx client."""
+        try:
+            from mcp.client.streamable_http import streamable_http_client
+        except ImportError:
+            # Older MCP SDKs only ship the legacy name (it keeps its own keep-alive client)
+            from mcp.client.streamable_http import streamablehttp_client
+            async with streamablehttp_client(url) as streams:
+                yield streams
+            return
+
+        import httpx
+        limits = httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30, read=300), limits=limits) as http:
+            async with streamable_http_client(url, http_client=http) as streams:
+                yield streams
 
     async def start(self):
-        """Start MCP subprocess + session once."""
-        if self.session:
+        """Start MCP transport + session(s) once; reconnect dead endpoints when due."""
+        if all(c.alive for c in self._connections):
             return
 
-        logger.info("[MCP-CLIENT] Starting MCP server subprocess...")
-        self._ctx = stdio_client(self.params)
-        self._aio = self._ctx.__aenter__()
-        read, write = await self._aio
-        self.session = ClientSession(read, write)
-        await self.session.__aenter__()
-        await self.session.initialize()
-        logger.info("[MCP-CLIENT] MCP session initialized successfully.")
-
-        raw_tools = await self.session.list_tools()
-        parsed = (
-            raw_tools if isinstance(raw_tools, list)
-            else getattr(raw_tools, "tools", [])
-        )
-        logger.info(f"[MCP-CLIENT] Tools available at startup: {[t.name for t in parsed]}")
+        async with self._start_lock:
+            pending = [c for c in self._connections if not c.alive and c.retry_due]
+            if not pending:
+                if any(c.alive for c in self._connections):
+                    return
+                raise RuntimeError(f"[MCP-CLIENT] No MCP endpoint reachable: {self.endpoints}")
+
+            first_start = not any(c.alive for c in self._connections)
+            logger.info(f"[MCP-CLIENT] Starting MCP server ({self.mode}) → {[c.label for c in pending]}")
+            outcomes = await asyncio.gather(*(c.start() for c in pending), return_exceptions=True)
+            errors = [o for o in outcomes if isinstance(o, BaseException)]
+            for conn, outcome in zip(pending, outcomes):
+                if isinstance(outcome, BaseException):
+                    logger.warning(f"[MCP-CLIENT] Endpoint {conn.label} unavailable: {outcome}")
+
+            if not any(c.alive for c in self._connections):
+                raise errors[0]
+            logger.info("[MCP-CLIENT] MCP session initialized successfully.")
+
+            if first_start:
+                raw_tools = await self.session.list_tools()
+                parsed = (
+                    raw_tools if isinstance(raw_tools, list)
+                    else getattr(raw_tools, "tools", [])
+                )
+                logger.info(f"[MCP-CLIENT] Tools available at startup: {[t.name for t in parsed]}")
 
     async def stop(self):
-        if self.session:
-            await self.session.__aexit__(None, None, None)
-            self.session = None
-        if self._ctx:
-            await self._ctx.__aexit__(None, None, None)
+        for conn in self._connections:
+            await conn.stop()
         logger.info("[MCP-CLIENT] MCP session stopped.")
 
+    async def _acquire(self) -> _MCPConnection:
+        """Least in-flight live connection, rotating the start point for round-robin ties."""
+        await self.start()
+        offset = next(self._rr)
+        n = len(self._connections)
+        rotated = [self._connections[(offset + i) % n] for i in range(n)]
+        live = [c for c in rotated if c.alive]
+        if not live:
+            raise RuntimeError(f"[MCP-CLIENT] No live MCP session for {self.endpoints}")
+        return min(live, key=lambda c: c.in_flight)
+
     async def list_tools(self):
         """Always return plain list[Tool]."""
-        await self.start()
-        raw_tools = await self.session.list_tools()
+        cassette = active_cassette()
+        if cassette is not None and cassette.catalog is not None:
+            return cassette.catalog
+
+        conn = await self._acquire()
+        raw_tools = await conn.session.list_tools()
         if isinstance(raw_tools, list):
             parsed = raw_tools
         elif hasattr(raw_tools, "tools"):
@@ -77,70 +264,54 @@ class MCPToolClient:
         else:
             parsed = []
         logger.debug(f"[MCP-CLIENT] list_tools → {[t.name for t in parsed]}")
+        recorder.record_catalog(parsed)
         return parsed
 
-    async def call(self, tool: str, args: Dict[str, Any]) -> Any:
-        """Call an MCP tool and unwrap results into plain dicts/values."""
-        await self.start()
+    async def call(self, tool: str, args: Dict[str, Any], progress: Optional[ProgressFnT] = None) -> Any:
+        """
+        Call an MCP tool and unwrap results into plain dicts/values.
+        `progress(done, total, message)` receives the server's progress notifications, if any.
+        """
         safe_tool = tool.strip().lower()
-        logger.info(f"[MCP-CLIENT] Calling tool '{safe_tool}' with args={args}")
+        cassette = active_cassette()
+        if cassette is not None and not cassette.live_tools:
+            return cassette.next_tool(safe_tool, args)
+
+        started = time.perf_counter()
+        result = await self._call(safe_tool, args, progress)
+        recorder.record_tool(safe_tool, args, result, time.perf_counter() - started)
+        return result
+
+    async def _call(self, safe_tool: str, args: Dict[str, Any], progress: Optional[ProgressFnT] = None) -> Any:
+        conn = await self._acquire()
+        logger.info(f"[MCP-CLIENT] Calling tool '{safe_tool}' via {conn.label}", args=args)
 
         try:
-            res = await self.session.call_tool(safe_tool, arguments=args)
+            conn.in_flight += 1
+            try:
+                res = await conn.session.call_tool(safe_tool, arguments=args, progress_callback=progress)
+            finally:
+                conn.in_flight -= 1
 
-            blocks: List[Any] = (
-                    getattr(res, "outputs", None)
-                    or getattr(res, "structuredContent", None)
-                    or getattr(res, "content", None)
-                    or []
-            )
+            # Native structured result: already a dict, nothing to re-parse
+            structured = getattr(res, "structuredContent", None)
+            if structured is not None and not getattr(res, "isError", False):
+                logger.info(f"[MCP-CLIENT] Tool '{safe_tool}' executed successfully (structured).")
+                return structured
 
+            # Compatibility fallback: servers that only send content blocks
+            blocks: List[Any] = getattr(res, "content", None) or []
             if not blocks:
                 logger.warning(f"[MCP-CLIENT] Tool '{safe_tool}' returned no content blocks.")
                 return []
 
-            results = []
-            for idx, block in enumerate(blocks):
-                logger.debug(f"[MCP-CLIENT] Raw block[{idx}] = {block!r}")
-
-                if hasattr(block, "type"):
-                    logger.debug(f"[MCP-CLIENT] Block[{idx}].type={block.type}")
-                    if block.type == "json":
-                        results.append(getattr(block, "data", None))
-                    elif block.type == "text":
-                        txt = getattr(block, "text", "")
-                        logger.debug(f"[MCP-CLIENT] Block[{idx}].text={txt!r}")
-                        try:
-                            results.append(json.loads(txt))
-                        except Exception as e:
-                            logger.warning(f"[MCP-CLIENT] Failed to parse block[{idx}] text as JSON: {e}")
-                            results.append(txt)
-                    else:
-                        results.append(block)
-
-                elif isinstance(block, dict):
-                    logger.debug(f"[MCP-CLIENT] Block[{idx}] is dict")
-                    btype = block.get("type")
-                    if btype == "json":
-                        results.append(block.get("data"))
-                    elif btype == "text":
-                        txt = block.get("text", "")
-                        logger.debug(f"[MCP-CLIENT] Block[{idx}]['text']={txt!r}")
-                        try:
-                            results.append(json.loads(txt))
-                        except Exception as e:
-                            logger.warning(f"[MCP-CLIENT] Failed to parse dict block[{idx}] text as JSON: {e}")
-                            results.append(txt)
-                    else:
-                        results.append(block)
-
-                else:
-                    results.append(block)
-
-            if results:
-                logger.info(f"[MCP-CLIENT] Tool '{safe_tool}' executed successfully. Parsed results={results}")
+            # Large text payloads are JSON-decoded off the event loop
+            size = sum(len(getattr(b, "text", None) or "") for b in blocks)
+            results = await offloader.run(lambda: [self._parse_block(block) for block in blocks], size=size)
+            if getattr(res, "isError", False):
+                logger.warning(f"[MCP-CLIENT] Tool '{safe_tool}' reported an error", results=results)
             else:
-                logger.warning(f"[MCP-CLIENT] Tool '{safe_tool}' produced blocks but no parsed results.")
+                logger.info(f"[MCP-CLIENT] Tool '{safe_tool}' executed successfully (content blocks).")
 
             return results[0] if len(results) == 1 else results
 
@@ -148,6 +319,24 @@ class MCPToolClient:
             logger.error(f"[MCP-CLIENT] Error while calling tool '{safe_tool}': {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _parse_block(block: Any) -> Any:
+        """Unwrap one legacy content block (pydantic or dict) into a plain value."""
+        if isinstance(block, dict):
+            btype, get = block.get("type"), block.get
+        else:
+            btype, get = getattr(block, "type", None), lambda key, default=None: getattr(block, key, default)
+
+        if btype == "json":
+            return get("data")
+        if btype == "text":
+            txt = get("text", "")
+            try:
+                return json.loads(txt)
+            except ValueError:
+                return txt
+        return block
+
     async def call_tool(self, tool: str, args: Dict[str, Any], as_json: bool = True) -> Dict[str, Any]:
         result = await self.call(tool, args)
 
@@ -1,24 +1,32 @@
-import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.graph.mcp_client import mcp_client
+from app.graph.bulk_calls import merge_bulk_calls
+from app.jobs import LONG_RUNNING_META, job_manager
 from app.graph.clarifier import get_missing_args
 from app.graph.schema_utils import extract_schema
 from app.memory.session_store import SessionStore
+from app.logs import get_logger
 
-logger = logging.getLogger("app.graph.multi_intent_planner")
+logger = get_logger("app.graph.multi_intent_planner")
 async def execute_intents(
     intents: List[Dict[str, Any]],
     session_store: SessionStore,
-    session_id: str
+    session_id: str,
+    validations: Optional[Dict[str, List[str]]] = None
 ) -> Dict[str, Any]:
     """
     Executes multiple intents in the natural order provided by Hugging Face.
     Uses MCP tools for execution and clarifies missing arguments if needed.
+    Same-tool intents for different employees run as one `<tool>_many` call.
+    Long-running tools go through the job pool: when they outlast the inline wait the
+    intent's result is a job handle, and the result is pushed into the session later.
 
     Args:
         intents: List of intent dicts
         session_store: SessionStore instance to persist history.
         session_id: Current session identifier.
+        validations: Missing args per intent already computed this turn
+            (see clarifier.validate_intents); checked again only when absent.
 
     Returns:
         dict with aggregated results
@@ -29,11 +37,13 @@ async def execute_intents(
     # Preload available tools
     tools = await mcp_client.list_tools()
     tool_names = [t.name.strip().lower() for t in tools]
+    long_running = {t.name.strip().lower() for t in tools if (t.meta or {}).get(LONG_RUNNING_META)}
+    ready = []
 
     for intent in intents:
         intent_name = intent["name"].strip().lower()
         args = intent.get("args", {}) or {}
-        logger.debug(f"[MULTI-INTENT] Processing {intent_name} with args={args}")
+        logger.debug(f"[MULTI-INTENT] Processing {intent_name}", args=args)
 
         # ---- Tool matching ----
         if intent_name not in tool_names:
@@ -51,11 +61,16 @@ async def execute_intents(
         schema = extract_schema(tool)
         required = schema.get("required", [])
 
-        # Normalize args → always include required keys
-        normalized_args = {k: args.get(k) for k in required}
+        # Normalize args → always include required keys, keep provided optional ones
+        normalized_args = {k: v for k, v in args.items() if v is not None}
+        for k in required:
+            normalized_args.setdefault(k, args.get(k))
 
         # ---- Clarify missing values ----
-        missing = await get_missing_args(intent_name, normalized_args)
+        if validations is not None and intent_name in validations:
+            missing = validations[intent_name]
+        else:
+            missing = await get_missing_args(intent_name, normalized_args)
         if missing:
             logger.warning(f"[MULTI-INTENT] Missing args for {intent_name}: {missing}")
             results[intent_name] = {
@@ -65,16 +80,35 @@ async def execute_intents(
             session_store.add_clarification(session_id, intent_name, missing)
             continue
 
-        # ---- Execute tool ----
+        ready.append((intent_name, normalized_args))
+
+    # ---- Execute tools ----
+    for call in merge_bulk_calls(ready, tool_names):
+        intent_name = ready[call.members[0]][0]
         try:
-            result = await mcp_client.call(intent_name, normalized_args)
-            logger.info(f"[MULTI-INTENT] Executed {intent_name} successfully.")
+            if call.tool in long_running:
+                job, result = await job_manager.run(
+                    session_id, call.tool, call.args,
+                    lambda progress, call=call: mcp_client.call(call.tool, call.args, progress),
+                    on_done=lambda job: session_store.finish_job(job.session_id, job.id, job.status, job.result, job.error),
+                )
+                if job is not None:
+                    session_store.add_job(session_id, job.id, call.tool, call.args)
+                    results[intent_name] = {
+                        "status": "accepted",
+                        "job_id": job.id,
+                        "message": f"{call.tool} masih diproses di latar belakang; cek GET /jobs/{job.id}",
+                    }
+                    continue
+            else:
+                result = await mcp_client.call(call.tool, call.args)
+            logger.info(f"[MULTI-INTENT] Executed {call.tool} successfully.")
 
             results[intent_name] = {"status": "success", "result": result}
-            session_store.add_tool_call(session_id, intent_name, normalized_args, result)
+            session_store.add_tool_call(session_id, call.tool, call.args, result)
 
         except Exception as e:
-            logger.error(f"[MULTI-INTENT] Failed {intent_name}: {str(e)}", exc_info=True)
+            logger.error(f"[MULTI-INTENT] Failed {call.tool}: {str(e)}", exc_info=True)
             results[intent_name] = {"status": "error", "error": str(e)}
 
     return results
@@ -1,7 +1,9 @@
 import json
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from app.intent.hf_client import HFModelClient, HFConfig
+from app.graph.result_summary import summarize_for_llm
+from app.intent.language import session_languages
 
 logger = logging.getLogger("app.graph.response_builder")
 
@@ -13,6 +15,7 @@ class ResponseBuilder:
       - Clarifications (dynamic, based on missing/provided args)
       - Tool results
       - Greetings / fallback / chit-chat
+    Replies in the session's language (Bahasa Indonesia unless the user writes in English).
     """
 
     def __init__(self):
@@ -23,18 +26,27 @@ class ResponseBuilder:
         results: Dict[str, Any],
         clarifications: List[Dict[str, Any]],
         user_message: str = "",
-        state: Dict[str, Any] = None   # NEW: pass conversation state
+        state: Dict[str, Any] = None,   # NEW: pass conversation state
+        session_id: Optional[str] = None,
     ) -> str:
         """
         Build a natural chatbot response with the help of LLM.
         """
+        lang = session_languages.language(session_id, user_message, default="id")
+        language = "bahasa Indonesia" if lang == "id" else "English"
 
         # ---- Case 0: Fallback / no intent ----
         if results.get("fallback"):
             text = user_message.lower()
-            greetings = ["halo", "hai", "assalamualaikum", "pagi", "siang", "sore", "malam"]
+            greetings = ["halo", "hai", "assalamualaikum", "pagi", "siang", "sore", "malam",
+                         "hello", "morning", "afternoon", "evening"]
 
             if any(g in text for g in greetings):
+                if lang == "en":
+                    return (
+                        "Hello! Happy to help. "
+                        "Is there anything HR-related you'd like to ask, such as leave, payroll, or your leave status?"
+                    )
                 return (
                     "Halo! Senang bisa membantu Anda. "
                     "Apakah ada yang ingin ditanyakan terkait HR, seperti cuti, payroll, atau status cuti Anda?"
@@ -44,10 +56,10 @@ class ResponseBuilder:
             system_prompt = (
                 "Anda adalah asisten HR yang ramah. "
                 "Jika pengguna bertanya hal di luar HR tools (cuti, payroll, status cuti), "
-                "tetap jawab dengan sopan dan alami dalam bahasa Indonesia. "
+                f"tetap jawab dengan sopan dan alami dalam {language}. "
                 "Hindari jawaban kaku, tetap bantu menjaga percakapan."
             )
-            return self.client.chat_text(system_prompt, user_message)
+            return self.client.chat_text(system_prompt, user_message, route="response")
 
         # ---- Case 1: Explicit clarifications ----
         if clarifications:
@@ -61,20 +73,29 @@ class ResponseBuilder:
                 ack_parts = []
                 for arg, val in provided_args.items():
                     if val not in (None, ""):
-                        ack_parts.append(f"{arg} sudah tercatat ({val})")
+                        ack_parts.append(f"{arg} sudah tercatat ({val})" if lang == "id" else f"{arg} ({val})")
 
                 ack_text = ""
                 if ack_parts:
-                    ack_text = "Oke, saya sudah mencatat " + ", ".join(ack_parts) + ". "
+                    prefix = "Oke, saya sudah mencatat " if lang == "id" else "OK, I have noted "
+                    ack_text = prefix + ", ".join(ack_parts) + ". "
 
-                if pending_args:
+                if pending_args and lang == "id":
                     missing_text = (
                         "Saya masih perlu informasi berikut: "
                         + ", ".join(pending_args)
                         + ". Bisa Anda lengkapi?"
                     )
-                else:
+                elif pending_args:
+                    missing_text = (
+                        "I still need the following information: "
+                        + ", ".join(pending_args)
+                        + ". Could you provide it?"
+                    )
+                elif lang == "id":
                     missing_text = "Semua data sudah lengkap, saya bisa melanjutkan proses."
+                else:
+                    missing_text = "All details are complete, I can continue."
 
                 return ack_text + missing_text
 
@@ -82,25 +103,34 @@ class ResponseBuilder:
             clarif_text = {"clarifications": clarifications}
             system_prompt = (
                 "Anda adalah asisten HR. Permintaan pengguna masih kurang informasi. "
-                "Tolong tanyakan field yang hilang dengan sopan dan alami, dalam bahasa Indonesia."
+                f"Tolong tanyakan field yang hilang dengan sopan dan alami, dalam {language}."
             )
-            return self.client.chat_text(system_prompt, json.dumps(clarif_text, ensure_ascii=False))
+            return self.client.chat_text(system_prompt, json.dumps(clarif_text, ensure_ascii=False), route="response")
 
         # ---- Case 2: Results exist ----
         if results:
-            payload = {"results": results}
+            payload = {"results": summarize_for_llm(results)}
             system_prompt = (
                 "Anda adalah asisten HR. Berdasarkan JSON hasil dari tools berikut, "
-                "buat jawaban alami, singkat, dan sopan dalam bahasa Indonesia.\n\n"
+                f"buat jawaban alami, singkat, dan sopan dalam {language}.\n\n"
                 "- Jika hasil adalah pengajuan cuti (leave_request), pastikan menyebutkan ID permintaan, "
                 "periode cuti, dan statusnya.\n"
                 "- Jika hasil adalah payroll_lookup, jelaskan gaji bersih dan rincian utama secara ringkas.\n"
-                "- Jika hasil adalah leave_status, jelaskan sisa cuti per jenis cuti.\n\n"
+                "- Jika hasil adalah leave_status, jelaskan sisa cuti per jenis cuti.\n"
+                "- Jika status hasil adalah 'accepted', sampaikan bahwa laporan masih diproses "
+                "dan sebutkan job_id-nya.\n"
+                "- Hasil berkunci 'job:<id>' adalah proses latar belakang dari permintaan sebelumnya yang kini "
+                "selesai ('done') atau gagal ('error'): sampaikan hal itu beserta ringkasan hasilnya.\n\n"
                 "Jangan menambahkan fakta baru, hanya parafrasa data yang ada."
             )
-            return self.client.chat_text(system_prompt, json.dumps(payload, ensure_ascii=False))
+            return self.client.chat_text(system_prompt, json.dumps(payload, ensure_ascii=False), route="response")
 
         # ---- Case 3: Nothing matched ----
+        if lang == "en":
+            return (
+                "Sorry, I didn't understand. "
+                "Would you like to ask about leave, payroll, or your leave status?"
+            )
         return (
             "Maaf, saya tidak mengerti maksud Anda. "
             "Apakah Anda ingin menanyakan tentang cuti, payroll, atau status cuti?"
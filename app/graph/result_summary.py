@@ -0,0 +1,26 @@
+import os
+from typing import Any
+
+# How much of a tool result reaches the rephrasing LLM
+LLM_LIST_PREVIEW = int(os.getenv("LLM_LIST_PREVIEW", "10"))
+LLM_TEXT_PREVIEW = int(os.getenv("LLM_TEXT_PREVIEW", "2000"))
+
+# Opaque pagination fields the LLM has no use for (total_count is kept)
+_DROP_KEYS = {"next_cursor"}
+
+
+def summarize_for_llm(value: Any, list_preview: int = LLM_LIST_PREVIEW, text_preview: int = LLM_TEXT_PREVIEW) -> Any:
+    """
+    Copy of a tool result small enough for an LLM prompt: lists keep their first
+    `list_preview` items plus a "... N more" marker, long strings are cut.
+    """
+    if isinstance(value, dict):
+        return {k: summarize_for_llm(v, list_preview, text_preview) for k, v in value.items() if k not in _DROP_KEYS}
+    if isinstance(value, (list, tuple)):
+        head = [summarize_for_llm(v, list_preview, text_preview) for v in value[:list_preview]]
+        if len(value) > list_preview:
+            head.append(f"... {len(value) - list_preview} more")
+        return head
+    if isinstance(value, str) and len(value) > text_preview:
+        return value[:text_preview] + f"... ({len(value) - text_preview} more characters)"
+    return value
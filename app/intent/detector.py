@@ -1,9 +1,12 @@
-import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.graph.mcp_client import mcp_client
 from app.intent.hf_client import HFModelClient, HFConfig
-from app.prompts import build_dynamic_intent_prompt
+from app.intent.structured_output import intents_schema
+from app.intent.tool_retriever import tool_retriever
+from app.prompts import render_intent_prompt
+from app.logs import get_logger
 
-logger = logging.getLogger("app.intent.detector")
+logger = get_logger("app.intent.detector")
 
 
 class IntentDetector:
@@ -14,19 +17,19 @@ class IntentDetector:
     def __init__(self):
         self.client = HFModelClient(HFConfig())
 
-    async def detect(self, user_message: str, memory_summary: str = "") -> Dict[str, Any]:
+    async def detect(self, user_message: str, memory_summary: str = "",
+                     active_intent: Optional[str] = None) -> Dict[str, Any]:
         """
         Detect intent(s) for a user message + memory context.
-        Builds schema-aware prompt dynamically from MCP.
+        Builds schema-aware prompt dynamically from MCP (top-k relevant tools only).
         """
-        system_prompt = await build_dynamic_intent_prompt()
+        tools = tool_retriever.select(
+            await mcp_client.list_tools(), user_message, memory_summary, [active_intent] if active_intent else ()
+        )
+        system_prompt = render_intent_prompt(tools)
 
         # Log the full dynamic system prompt for debugging
-        logger.debug(
-            "[HF-DETECTOR] --- Dynamic Intent Prompt Start ---\n"
-            f"{system_prompt}\n"
-            "[HF-DETECTOR] --- Dynamic Intent Prompt End ---"
-        )
+        logger.debug("[HF-DETECTOR] Dynamic intent prompt", system_prompt=system_prompt)
 
         # Combine with conversation context
         prompt = f"""{system_prompt}
@@ -38,10 +41,12 @@ User message:
 {user_message}
 """
 
-        logger.debug(f"[HF-DETECTOR] Final composed prompt=\n{prompt}")
+        logger.debug("[HF-DETECTOR] Final composed prompt", prompt=prompt)
 
         # Call the HF client
-        result = self.client.chat_json(system_prompt, prompt)
+        result = await self.client.achat_json(system_prompt, prompt, route="intent_detection",
+                                              validate=lambda r: isinstance(r.get("intents"), list),
+                                              schema=intents_schema(tools))
 
-        logger.info(f"[HF-DETECTOR] detected intents={result.get('intents', [])}")
+        logger.info("[HF-DETECTOR] Detected intents", intents=result.get("intents", []))
         return result
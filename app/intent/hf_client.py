@@ -1,14 +1,50 @@
 import os
-import json
-import re
+import time
+import asyncio
+import logging
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Optional
 from dotenv import load_dotenv
 
+from app.intent.llm_scheduler import scheduler
+from app.intent.model_router import Route, model_router
+from app.intent.structured_output import parse_json_object, response_format
+from app.metrics import metrics
+from app.replay.recorder import recorder, active_cassette
+
 load_dotenv()
 
+logger = logging.getLogger("app.intent.hf_client")
+
+# One pooled HTTP session for all clients: keep-alive + TLS reuse across calls
+_http = requests.Session()
+
+# Send JSON schemas as `response_format` (models that reject it are remembered and sent none)
+RESPONSE_FORMAT = os.getenv("HF_RESPONSE_FORMAT", "true").lower() in ("1", "true", "yes")
+_no_response_format: set = set()
+
+# HF calls block (HTTP, and waits in the outbound queue when rate limited) in their own
+# threads, so a backlog of LLM calls never occupies the default executor
+HF_WORKERS = int(os.getenv("HF_WORKERS", "16"))
+_llm_pool = ThreadPoolExecutor(HF_WORKERS, thread_name_prefix="hf-call")
+
+
+async def run_in_llm_pool(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking code that makes LLM calls in the HF pool, in a copy of the caller's context."""
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(_llm_pool, functools.partial(ctx.run, fn, *args, **kwargs))
+
+JSON_GUARD = "You MUST return ONLY a valid JSON object."
+REPAIR_PROMPT = (
+    "The text below was meant to be a single JSON object but is not valid JSON. "
+    "Return ONLY the corrected JSON object: keep its content, fix the syntax, add nothing else."
+)
+
 
 @dataclass
 class HFConfig:
@@ -50,9 +86,21 @@ class HFModelClient:
             "Content-Type": "application/json"
         }
 
-    def _call(self, system: str, user: str) -> str:
+    def _call(self, system: str, user: str, model: Optional[str] = None,
+              schema: Optional[Dict[str, Any]] = None) -> str:
+        model = model or self.cfg.model_name
+        cassette = active_cassette()
+        if cassette is not None:
+            return cassette.next_llm(model, system, user)
+
+        started = time.perf_counter()
+        content = self._post(system, user, model, schema)
+        recorder.record_llm(model, system, user, content, time.perf_counter() - started)
+        return content
+
+    def _post(self, system: str, user: str, model: str, schema: Optional[Dict[str, Any]] = None) -> str:
         payload = {
-            "model": self.cfg.model_name,
+            "model": model,
             "temperature": self.cfg.temperature,
             "max_tokens": self.cfg.max_tokens,
             "messages": [
@@ -60,9 +108,20 @@ class HFModelClient:
                 {"role": "user", "content": user},
             ],
         }
-        r = requests.post(self.cfg.api_url, headers=self.headers, json=payload, timeout=60)
+        constrained = schema is not None and RESPONSE_FORMAT and model not in _no_response_format
+        if constrained:
+            payload["response_format"] = response_format("answer", schema)
+        # ~4 characters per prompt token, plus the completion budget
+        estimate = (len(system) + len(user)) // 4 + self.cfg.max_tokens
+        r = self._send(model, payload, estimate)
+        if constrained and r.status_code in (400, 422):
+            logger.warning(f"[HF-CLIENT] {model} rejected response_format ({r.status_code}), sending prompts only")
+            _no_response_format.add(model)
+            del payload["response_format"]
+            r = self._send(model, payload, estimate)
         r.raise_for_status()
         data = r.json()
+        scheduler.settle(model, estimate, (data.get("usage") or {}).get("total_tokens"))
 
         if "choices" in data and len(data["choices"]) > 0:
             choice = data["choices"][0]
@@ -72,35 +131,120 @@ class HFModelClient:
                 return choice["text"]
         return ""
 
-    def _strip_think_tags(self, text: str) -> str:
-        """Remove <think>...</think> from reasoning model output."""
-        return re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL).strip()
-
-    def chat_text(self, system: str, user: str) -> str:
-        """Return raw text response"""
-        return self._call(system, user)
-
-    def chat_json(self, system: str, user: str) -> Dict[str, Any]:
-        """Return JSON-parsed response. Guardrails enforce JSON only."""
-        guard = "You MUST return ONLY a valid JSON object."
-        text = self._call(system, f"{user}\n{guard}")
-        try:
-            s, e = text.find("{"), text.rfind("}")
-            return json.loads(text[s:e+1]) if s != -1 and e != -1 else {}
-        except Exception:
-            return {}
-
-    def chat_json_reasoning(self, system: str, user: str) -> Dict[str, Any]:
+    def _send(self, model: str, payload: Dict[str, Any], estimate: int) -> requests.Response:
+        """POST through the shared outbound scheduler; a 429 pauses the model and is retried once."""
+        for attempt in range(2):
+            scheduler.acquire(model, estimate)
+            r = _http.post(self.cfg.api_url, headers=self.headers, json=payload, timeout=60)
+            if r.status_code == 429 and attempt == 0:
+                try:
+                    retry_after = float(r.headers.get("Retry-After", "5"))
+                except ValueError:
+                    retry_after = 5.0
+                scheduler.backoff(model, retry_after)
+                continue
+            return r
+
+    def warm(self):
+        """Open (and pool) the TLS connection to the API host ahead of the first real call."""
+        _http.head(self.cfg.api_url, headers=self.headers, timeout=10)
+
+    def _cascade(self, route_name: Optional[str], system: str, user: str,
+                 parse: Callable[[str, str], Any], check: Callable[[Any, Route], Optional[str]],
+                 schema: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Try the route's models cheapest first. `check(parsed, route)` returns why the answer
+        is not good enough (the reason to escalate) or None; the last model's answer is kept
+        whatever it is. Latency per model and escalations per route go to app.metrics.
+        """
+        route = model_router.route(route_name, self.cfg.model_name)
+        metrics.inc("llm_requests_total", route=route.name)
+        for i, model in enumerate(route.models):
+            last = i == len(route.models) - 1
+            started = time.perf_counter()
+            try:
+                result = parse(self._call(system, user, model, schema), model)
+                reason = check(result, route)
+            except Exception:
+                if last:
+                    metrics.inc("llm_calls_total", route=route.name, model=model, outcome="error")
+                    raise
+                result, reason = None, "error"
+            finally:
+                metrics.observe("llm_call_seconds", time.perf_counter() - started, route=route.name, model=model)
+            if reason is None or last:
+                metrics.inc("llm_calls_total", route=route.name, model=model, outcome=reason or "ok")
+                return result
+            metrics.inc("llm_calls_total", route=route.name, model=model, outcome=reason)
+            metrics.inc("llm_escalations_total", route=route.name, reason=reason)
+            logger.info(f"[HF-ROUTER] {route.name}: {model} → {route.models[i + 1]} ({reason})")
+
+    def _json_parser(self, route_name: Optional[str], schema: Optional[Dict[str, Any]]) -> Callable[[str, str], Any]:
         """
-        Reasoning-safe JSON parsing.
-        Strips <think> tags before parsing.
-        Used by autonomous flow (planner, reflection).
+        Tolerant JSON parsing with one targeted repair per request: the first answer that
+        does not parse is sent back to the same model to fix its syntax.
         """
-        guard = "You MUST return ONLY a valid JSON object."
-        text = self._call(system, f"{user}\n{guard}")
-        text = self._strip_think_tags(text)
-        try:
-            s, e = text.find("{"), text.rfind("}")
-            return json.loads(text[s:e + 1]) if s != -1 and e != -1 else {}
-        except Exception:
-            return {}
+        route = route_name or "default"
+        repaired = False
+
+        def parse(text: str, model: str) -> Optional[Dict[str, Any]]:
+            nonlocal repaired
+            result = parse_json_object(text)
+            if result is not None:
+                return result
+            metrics.inc("llm_json_parse_failures_total", route=route, model=model)
+            if repaired or not text.strip():
+                return None
+            repaired = True
+            result = parse_json_object(self._call(REPAIR_PROMPT, text[:4000], model, schema))
+            metrics.inc("llm_json_repairs_total", route=route, outcome="ok" if result is not None else "failed")
+            logger.info(f"[HF-CLIENT] {route}: repaired malformed JSON from {model}: {result is not None}")
+            return result
+
+        return parse
+
+    @staticmethod
+    def _confidence(result: Dict[str, Any]) -> Optional[float]:
+        """`confidence` of the answer, or the lowest of its intents' confidences."""
+        if isinstance(result.get("confidence"), (int, float)):
+            return result["confidence"]
+        scores = [i.get("confidence") for i in result.get("intents") or [] if isinstance(i, dict)]
+        scores = [c for c in scores if isinstance(c, (int, float))]
+        return min(scores) if scores else None
+
+    def _json_check(self, validate: Optional[Callable[[Dict[str, Any]], bool]]):
+        def check(result: Optional[Dict[str, Any]], route: Route) -> Optional[str]:
+            if not isinstance(result, dict):
+                return "parse"
+            if validate is not None and not validate(result):
+                return "schema"
+            confidence = self._confidence(result)
+            if route.min_confidence is not None and confidence is not None and confidence < route.min_confidence:
+                return "confidence"
+            return None
+        return check
+
+    def chat_text(self, system: str, user: str, route: Optional[str] = None) -> str:
+        """Return raw text response (escalating along `route` on an empty answer)"""
+        return self._cascade(route, system, user, lambda text, _: text,
+                             lambda text, _: None if text and text.strip() else "empty")
+
+    def chat_json(self, system: str, user: str, route: Optional[str] = None,
+                  validate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                  schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Return JSON-parsed response. Guardrails enforce JSON only; `schema` is also sent
+        as response_format. Malformed JSON gets one repair retry. Along `route`, escalates
+        when the JSON still does not parse, `validate` rejects it or its confidence is
+        below the route's min_confidence.
+        """
+        result = self._cascade(route, system, f"{user}\n{JSON_GUARD}", self._json_parser(route, schema),
+                               self._json_check(validate), schema)
+        return result if isinstance(result, dict) else {}
+
+    # Async variants: the HTTP call (and any wait in the outbound queue) runs in the HF pool
+    async def achat_text(self, *args, **kwargs) -> str:
+        return await run_in_llm_pool(self.chat_text, *args, **kwargs)
+
+    async def achat_json(self, *args, **kwargs) -> Dict[str, Any]:
+        return await run_in_llm_pool(self.chat_json, *args, **kwargs)
@@ -0,0 +1,198 @@
+import os
+import re
+import math
+import threading
+import logging
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("app.intent.language")
+
+LANGUAGES = ("id", "en")
+
+# A session's language is pinned by the first message identified with at least this confidence
+LANG_PIN_CONFIDENCE = float(os.getenv("LANG_PIN_CONFIDENCE", "0.97"))
+LANG_SESSION_CACHE = int(os.getenv("LANG_SESSION_CACHE", "10000"))
+
+_WORD = re.compile(r"[a-z]+")
+
+# Words (incl. chat slang) that are strong evidence on their own; shared HR terms (payroll, status) are left out
+LEXICON = {
+    "id": {
+        "saya", "aku", "gue", "gw", "kamu", "anda", "dong", "donk", "deh", "sih", "nih", "kok", "kah", "ya", "yg",
+        "gak", "ga", "nggak", "ngga", "enggak", "tidak", "belum", "sudah", "udah", "aja", "saja", "juga", "lagi",
+        "mau", "minta", "tolong", "bisa", "boleh", "ingin", "pengen", "cek", "lihat", "liat", "berapa", "gimana",
+        "bagaimana", "kapan", "apa", "apakah", "kenapa", "mana", "ini", "itu", "yang", "untuk", "buat", "dan",
+        "atau", "dengan", "dari", "ke", "di", "pada", "sampai", "sampe", "hingga", "terus", "trus", "tanggal",
+        "tgl", "bulan", "hari", "minggu", "depan", "lalu", "kemarin", "besok", "lusa", "cuti", "gaji", "sisa",
+        "ajukan", "ajuin", "pengajuan", "izin", "ijin", "sakit", "tahunan", "lembur", "absen", "absensi",
+        "kehadiran", "potongan", "tunjangan", "slip", "karyawan", "halo", "hai", "pagi", "siang", "sore", "malam",
+        "terima", "kasih", "makasih", "thx", "mohon", "batalkan", "riwayat", "saldo", "jatah", "aturan",
+    },
+    "en": {
+        "i", "my", "me", "mine", "you", "your", "the", "a", "an", "is", "are", "was", "were", "am", "be", "do",
+        "does", "did", "can", "could", "would", "should", "will", "please", "pls", "want", "need", "like",
+        "get", "have", "has", "how", "what", "when", "where", "which", "why", "much", "many", "left", "remaining",
+        "for", "from", "to", "until", "of", "and", "or", "with", "this", "that", "last", "next", "month", "day",
+        "days", "week", "today", "tomorrow", "yesterday", "leave", "salary", "payslip", "pay", "balance",
+        "request", "submit", "cancel", "check", "show", "annual", "sick", "unpaid", "overtime", "attendance",
+        "history", "policy", "employee", "hello", "hi", "hey", "morning", "afternoon", "evening", "thanks",
+        "thank", "off", "time", "about", "on", "in", "at", "it", "any", "still", "again", "already",
+    },
+}
+LEXICON_WEIGHT = 2.0    # log-odds per lexicon word, on top of its character n-grams
+# A word's overlapping n-grams are far from independent evidence: damp their sum
+NGRAM_WEIGHT = 0.3
+
+# Seed text for the character n-gram profiles: HR chat in each language, formal and casual
+SEED_TEXT = {
+    "id": """
+        saya mau ajukan cuti tahunan tanggal sepuluh sampai dua belas bulan depan
+        berapa sisa cuti saya tahun ini tolong cek dong
+        cek gaji saya bulan lalu ya terus potongan pajaknya berapa
+        ajuin cuti sakit besok donk soalnya lagi demam
+        bagaimana status pengajuan cuti saya yang kemarin apakah sudah disetujui
+        tolong tampilkan riwayat gaji tiga bulan terakhir beserta tunjangan
+        kehadiran saya minggu ini gimana ada keterlambatan tidak
+        saya ingin membatalkan permintaan cuti yang sudah diajukan
+        apa aturan perusahaan tentang cuti melahirkan dan cuti tanpa gaji
+        jumlah lembur bulan ini sudah berapa jam ya
+        halo selamat pagi saya karyawan baru ingin bertanya soal absensi
+        slip gaji saya belum keluar kenapa ya mohon dibantu
+        kapan gajian bulan ini dan apakah ada bonus tahunan
+        gak jadi deh cutinya dibatalin aja makasih banyak
+        tolong rekap kehadiran seluruh karyawan di departemen keuangan
+        saldo cuti saya masih ada berapa hari lagi sebelum akhir tahun
+    """,
+    "en": """
+        i would like to request annual leave from the tenth to the twelfth of next month
+        how many leave days do i have left this year please check
+        show me my salary for last month and how much tax was deducted
+        can i take sick leave tomorrow because i have a fever
+        what is the status of the leave request i submitted yesterday has it been approved
+        please show my payroll history for the last three months including allowances
+        how was my attendance this week was i late on any day
+        i want to cancel the leave request that i already submitted
+        what is the company policy on maternity leave and unpaid leave
+        how many overtime hours have i worked this month
+        hello good morning i am a new employee with a question about attendance
+        my payslip has not been released yet why is that please help
+        when is payday this month and is there an annual bonus
+        never mind cancel that leave thanks a lot
+        please summarise attendance for all employees in the finance department
+        how many days of leave balance do i still have before the end of the year
+    """,
+}
+NGRAM_ORDERS = (1, 2, 3)
+
+
+def _ngrams(word: str):
+    padded = f" {word} "
+    for n in NGRAM_ORDERS:
+        for i in range(len(padded) - n + 1):
+            yield padded[i:i + n]
+
+
+class LanguageIdentifier:
+    """
+    Deterministic Indonesian/English identification for short chat messages.
+
+    Each word scores its character 1-3-grams under per-language profiles built from
+    SEED_TEXT (add-one smoothed log-likelihoods), plus a fixed bonus when it is in a
+    language's LEXICON, which is what carries slang like "ajuin cuti donk". Digits,
+    punctuation and stray letters (the "E" of "E-002") are ignored. Profiles are
+    built once, on first use.
+    """
+
+    def __init__(self, seed_text: Optional[Dict[str, str]] = None, lexicon: Optional[Dict[str, set]] = None):
+        self.seed_text = seed_text or SEED_TEXT
+        self.lexicon = lexicon or LEXICON
+        self._profiles: Optional[Dict[str, Dict[str, float]]] = None
+        self._unseen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _build(self):
+        with self._lock:
+            if self._profiles is not None:
+                return
+            counts = {lang: Counter(g for w in _WORD.findall(text.lower()) for g in _ngrams(w))
+                      for lang, text in self.seed_text.items()}
+            vocab = len(set().union(*counts.values()))
+            profiles = {}
+            for lang, c in counts.items():
+                total = sum(c.values()) + vocab
+                profiles[lang] = {g: math.log((n + 1) / total) for g, n in c.items()}
+                self._unseen[lang] = math.log(1 / total)
+            self._profiles = profiles
+
+    def warm(self):
+        self._build()
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Log-score per language (only differences between them are meaningful)."""
+        if self._profiles is None:
+            self._build()
+        scores = dict.fromkeys(self.seed_text, 0.0)
+        for word in _WORD.findall(text.lower()):
+            known = [lang for lang in scores if word in self.lexicon.get(lang, ())]
+            if len(word) < 2 and not known:
+                continue
+            for lang, profile in self._profiles.items():
+                unseen = self._unseen[lang]
+                scores[lang] += NGRAM_WEIGHT * sum(profile.get(g, unseen) for g in _ngrams(word))
+            for lang in known:
+                scores[lang] += LEXICON_WEIGHT
+        return scores
+
+    def identify(self, text: str, default: str = "id") -> Tuple[str, float]:
+        """(language, confidence in 0.5-1.0); `default` with confidence 0.5 when the text has no words."""
+        s = self.scores(text)
+        margin = s["id"] - s["en"]
+        if margin == 0:
+            return default, 0.5
+        confidence = 1 / (1 + math.exp(-min(abs(margin), 50.0)))
+        return ("id" if margin > 0 else "en"), confidence
+
+    def detect(self, text: str, default: str = "id") -> str:
+        return self.identify(text, default)[0]
+
+
+class SessionLanguages:
+    """
+    Per-session memo: a session's language is decided once, by its first message identified
+    with LANG_PIN_CONFIDENCE, and reused for the rest of the session. Messages before that
+    (greetings, bare IDs) get their own best guess. Least recently used sessions are evicted.
+    """
+
+    def __init__(self, identifier: LanguageIdentifier, max_sessions: int = LANG_SESSION_CACHE,
+                 pin_confidence: float = LANG_PIN_CONFIDENCE):
+        self.identifier = identifier
+        self.max_sessions, self.pin_confidence = max_sessions, pin_confidence
+        self._pinned: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def language(self, session_id: Optional[str], text: str, default: str = "id") -> str:
+        if session_id is not None:
+            with self._lock:
+                lang = self._pinned.get(session_id)
+                if lang is not None:
+                    self._pinned.move_to_end(session_id)
+                    return lang
+
+        lang, confidence = self.identifier.identify(text, default)
+        if session_id is not None and confidence >= self.pin_confidence:
+            with self._lock:
+                self._pinned[session_id] = lang
+                self._pinned.move_to_end(session_id)
+                while len(self._pinned) > self.max_sessions:
+                    self._pinned.popitem(last=False)
+            logger.debug(f"[LANG] Session {session_id} pinned to '{lang}' ({confidence:.2f})")
+        return lang
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._pinned.pop(session_id, None)
+
+
+language_id = LanguageIdentifier()
+session_languages = SessionLanguages(language_id)
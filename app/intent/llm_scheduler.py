@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Optional
+
+from app.metrics import metrics
+
+logger = logging.getLogger("app.intent.llm_scheduler")
+
+# Served strictly in this order: live chat before batch/background work
+PRIORITIES = ("interactive", "batch")
+
+# Per-model limits: HF_RATE_LIMITS='{"<model>": {"rpm": 60, "tpm": 100000}}', else HF_RPM / HF_TPM (0 = unlimited)
+DEFAULT_RPM = float(os.getenv("HF_RPM", "0"))
+DEFAULT_TPM = float(os.getenv("HF_TPM", "0"))
+QUEUE_TIMEOUT_S = float(os.getenv("HF_QUEUE_TIMEOUT_S", "60"))
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("llm_priority", default="interactive")
+_session: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_session", default=None)
+
+
+@contextmanager
+def llm_context(session: Optional[str] = None, priority: Optional[str] = None):
+    """Tag the LLM calls made inside (including from HF pool workers) with a session and priority class."""
+    if priority is not None and priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority '{priority}', expected one of {PRIORITIES}")
+    tokens = []
+    if session is not None:
+        tokens.append((_session, _session.set(session)))
+    if priority is not None:
+        tokens.append((_priority, _priority.set(priority)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute up to a one-minute burst; per_minute <= 0 means unlimited."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.per_minute, self.level + (now - self.updated) * self.per_minute / 60.0)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until `amount` (capped at the burst size) is available."""
+        if self.per_minute <= 0:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.per_minute) - self.level
+        return max(0.0, missing * 60.0 / self.per_minute)
+
+    def take(self, amount: float):
+        if self.per_minute > 0:
+            self.level -= amount     # may go negative: the debt is paid back before the next grant
+
+
+class _Waiter:
+    __slots__ = ("session", "priority", "tokens")
+
+    def __init__(self, session: str, priority: str, tokens: int):
+        self.session, self.priority, self.tokens = session, priority, tokens
+
+
+class _ModelQueue:
+    """Waiting calls for one model: per priority class, one FIFO per session served round-robin."""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.paused_until = 0.0
+        self.classes: Dict[str, "OrderedDict[str, Deque[_Waiter]]"] = {p: OrderedDict() for p in PRIORITIES}
+
+    def push(self, waiter: _Waiter):
+        self.classes[waiter.priority].setdefault(waiter.session, deque()).append(waiter)
+
+    def head(self) -> Optional[_Waiter]:
+        for sessions in self.classes.values():
+            if sessions:
+                return next(iter(sessions.values()))[0]
+        return None
+
+    def remove(self, waiter: _Waiter):
+        sessions = self.classes[waiter.priority]
+        pending = sessions[waiter.session]
+        pending.remove(waiter)
+        if not pending:
+            del sessions[waiter.session]
+        else:
+            sessions.move_to_end(waiter.session)    # next turn goes to the next session
+
+    def delay(self, tokens: int, now: float) -> float:
+        return max(self.paused_until - now, self.requests.delay(1, now), self.tokens.delay(tokens, now))
+
+    def depth(self, priority: str) -> int:
+        return sum(len(q) for q in self.classes[priority].values())
+
+
+class OutboundScheduler:
+    """
+    Shared gate in front of the HF API for every HFModelClient. Each model has token
+    buckets for requests and tokens per minute. Interactive calls are granted before
+    batch calls, and within a class sessions take turns so one busy session cannot
+    starve the others. Callers block until granted, in the HF client's own thread pool
+    (`run_in_llm_pool`), never in the event loop's default executor.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 default_rpm: float = DEFAULT_RPM, default_tpm: float = DEFAULT_TPM,
+                 timeout_s: float = QUEUE_TIMEOUT_S):
+        if limits is None:
+            try:
+                limits = json.loads(os.getenv("HF_RATE_LIMITS", "") or "{}")
+            except ValueError as e:
+                logger.warning(f"[LLM-QUEUE] Ignoring invalid HF_RATE_LIMITS: {e}")
+                limits = {}
+        self.limits = limits
+        self.default_rpm, self.default_tpm = default_rpm, default_tpm
+        self.timeout_s = timeout_s
+        self._cond = threading.Condition()
+        self._queues: Dict[str, _ModelQueue] = {}
+
+    def _queue(self, model: str) -> _ModelQueue:
+        queue = self._queues.get(model)
+        if queue is None:
+            limit = self.limits.get(model, {})
+            queue = self._queues[model] = _ModelQueue(limit.get("rpm", self.default_rpm), limit.get("tpm", self.default_tpm))
+        return queue
+
+    def _report_depth(self, model: str, queue: _ModelQueue):
+        for priority in PRIORITIES:
+            metrics.set("llm_queue_depth", queue.depth(priority), model=model, priority=priority)
+
+    def acquire(self, model: str, tokens: int) -> float:
+        """Wait for a slot to send ~`tokens` tokens to `model`; returns seconds waited. Raises TimeoutError."""
+        waiter = _Waiter(_session.get() or "-", _priority.get(), tokens)
+        started = time.monotonic()
+        deadline = started + self.timeout_s
+        with self._cond:
+            queue = self._queue(model)
+            queue.push(waiter)
+            self._report_depth(model, queue)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = queue.delay(tokens, now) if queue.head() is waiter else None
+                    if delay == 0.0:
+                        queue.requests.take(1)
+                        queue.tokens.take(tokens)
+                        break
+                    if now >= deadline:
+                        metrics.inc("llm_queue_timeouts_total", model=model, priority=waiter.priority)
+                        raise TimeoutError(f"Waited {self.timeout_s:g}s for an HF API slot for {model}")
+                    self._cond.wait(min(delay if delay is not None else deadline - now, deadline - now))
+            finally:
+                queue.remove(waiter)
+                self._report_depth(model, queue)
+                self._cond.notify_all()
+
+        waited = time.monotonic() - started
+        metrics.observe("llm_queue_wait_seconds", waited, model=model, priority=waiter.priority)
+        if waited > 1.0:
+            logger.info(f"[LLM-QUEUE] {waiter.priority} call for {model} (session {waiter.session}) waited {waited:.1f}s")
+        return waited
+
+    def settle(self, model: str, estimated: int, actual: Optional[int]):
+        """Correct the token bucket once the response reports real usage."""
+        if actual is None:
+            return
+        with self._cond:
+            self._queue(model).tokens.take(actual - estimated)
+            self._cond.notify_all()
+
+    def backoff(self, model: str, seconds: float):
+        """Hold every call to `model` for `seconds` (provider said 429)."""
+        with self._cond:
+            queue = self._queue(model)
+            queue.paused_until = max(queue.paused_until, time.monotonic() + seconds)
+        metrics.inc("llm_rate_limited_total", model=model)
+        logger.warning(f"[LLM-QUEUE] {model} rate limited by provider, pausing {seconds:.1f}s")
+
+
+scheduler = OutboundScheduler()
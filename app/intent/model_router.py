@@ -0,0 +1,61 @@
+import os
+import re
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("app.intent.model_router")
+
+MODEL_ROUTES_PATH = os.getenv(
+    "MODEL_ROUTES_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "..", "config", "model_routes.json"),
+)
+
+_ENV_REF = re.compile(r"\$\{(\w+)\}")
+
+
+@dataclass
+class Route:
+    """Models to try for one call site, cheapest first, and when to move on to the next one."""
+    name: str
+    models: List[str] = field(default_factory=list)
+    min_confidence: Optional[float] = None      # escalate when the answer's confidence is lower
+
+
+def _expand(model: str) -> str:
+    """`${VAR}` → the environment value ("" when unset)."""
+    return _ENV_REF.sub(lambda m: os.getenv(m.group(1), ""), model).strip()
+
+
+class ModelRouter:
+    """
+    Per-call-site model cascades from config/model_routes.json. Model names may reference
+    env vars (`${HF_SMALL_MODEL}`). An unset cheaper entry is skipped, so a cascade with no
+    small model configured is just the large model; an unset last (largest) entry falls
+    back to the client's own model, so there is always something to escalate to.
+    Unknown routes use the client's own model.
+    """
+
+    def __init__(self, path: str = MODEL_ROUTES_PATH):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                self._config: Dict[str, Dict] = json.load(fh)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[MODEL-ROUTER] No model routes from {path}: {e}")
+            self._config = {}
+
+    def route(self, name: Optional[str], default_model: str) -> Route:
+        spec = self._config.get(name, {}) if name else {}
+        models = []
+        # Expanded per call: env (and .env) may be loaded after import
+        expanded = [_expand(m) for m in spec.get("models", [])]
+        if expanded and not expanded[-1]:
+            expanded[-1] = default_model
+        for model in expanded:
+            if model and model not in models:
+                models.append(model)
+        return Route(name or "default", models or [default_model], spec.get("min_confidence"))
+
+
+model_router = ModelRouter()
@@ -0,0 +1,138 @@
+import re
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.graph.schema_utils import extract_schema
+
+_THINK = re.compile(r"<think>.*?(</think>|$)", flags=re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_LAST_KEY = re.compile(r'"(?:[^"\\]|\\.)*"\s*$')
+_CLOSERS = {"{": "}", "[": "]"}
+
+_decoder = json.JSONDecoder()
+
+
+# ---- Schemas (sent as response_format) ----
+
+def _call_item(name_key: str, tool) -> Dict[str, Any]:
+    """One tool's branch: its name, and its argument names without type constraints (null is allowed)."""
+    props = extract_schema(tool).get("properties", {})
+    return {
+        "type": "object",
+        "properties": {
+            name_key: {"const": tool.name},
+            "args": {"type": "object", "properties": {p: {} for p in props}},
+        },
+        "required": [name_key, "args"],
+    }
+
+
+def intents_schema(tools: Iterable[Any]) -> Dict[str, Any]:
+    """{"intents": [{"name", "confidence", "args"}]} restricted to the given tools."""
+    branches = []
+    for tool in tools:
+        item = _call_item("name", tool)
+        item["properties"]["confidence"] = {"type": "number", "minimum": 0, "maximum": 1}
+        branches.append(item)
+    return {
+        "type": "object",
+        "properties": {"intents": {"type": "array", "items": {"anyOf": branches} if branches else {"type": "object"}}},
+        "required": ["intents"],
+    }
+
+
+def plan_schema(tools: Iterable[Any]) -> Dict[str, Any]:
+    """{"plan": [{"action", "args"}]} restricted to the given tools."""
+    branches = [_call_item("action", tool) for tool in tools]
+    return {
+        "type": "object",
+        "properties": {"plan": {"type": "array", "items": {"anyOf": branches} if branches else {"type": "object"}}},
+        "required": ["plan"],
+    }
+
+
+def response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI-compatible `response_format` for the chat/completions payload."""
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": False}}
+
+
+# ---- Tolerant parsing ----
+
+def _close_truncated(text: str) -> str:
+    """
+    Close any open objects/arrays of an answer cut off by max_tokens. A string cut
+    mid-way is dropped with its key rather than kept half-written.
+    """
+    stack: List[str] = []
+    in_string = escaped = False
+    string_start = 0
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string, string_start = True, i
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in "}]" and stack:
+            stack.pop()
+    if in_string:
+        return _close_truncated(text[:string_start])
+    tail = text.rstrip()
+    if tail.endswith(":"):
+        tail = _LAST_KEY.sub("", tail[:-1])
+    return tail.rstrip().rstrip(",") + "".join(reversed(stack))
+
+
+def _object_starts(text: str) -> List[int]:
+    """Offsets of the `{` that open top-level objects (nested ones are never answers on their own)."""
+    starts, depth = [], 0
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"' and depth:
+            in_string = True
+        elif ch in "{[":
+            if ch == "{" and depth == 0:
+                starts.append(i)
+            depth += 1
+        elif ch in "}]" and depth:
+            depth -= 1
+    return starts
+
+
+def parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    First JSON object in a model answer, or None. Skips <think> blocks, prose and code
+    fences around it, ignores anything after it, and recovers trailing commas and
+    answers truncated mid-object.
+    """
+    if not text:
+        return None
+    text = _THINK.sub("", text)
+    for start in _object_starts(text):
+        candidate = text[start:]
+        for attempt in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+            try:
+                value, _ = _decoder.raw_decode(attempt)
+                if isinstance(value, dict):
+                    return value
+            except ValueError:
+                pass
+        try:
+            value, _ = _decoder.raw_decode(_close_truncated(_TRAILING_COMMA.sub(r"\1", candidate)))
+            if isinstance(value, dict):
+                return value
+        except ValueError:
+            pass
+    return None
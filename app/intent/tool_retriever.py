@@ -0,0 +1,160 @@
+import os
+import re
+import json
+import math
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+logger = logging.getLogger("app.intent.tool_retriever")
+
+TOOLS_CONFIG_PATH = os.getenv(
+    "TOOLS_CONFIG_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "..", "config", "tools_config.json"),
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Common Indonesian affixes, so "pengajuan"/"ajukan"/"ajuin" share a stem with "aju"
+_PREFIXES = ("peng", "pem", "pen", "per", "me", "di", "ber", "ter")
+_SUFFIXES = ("kan", "nya", "an", "in", "i")
+_STOPWORDS = {
+    "saya", "aku", "gue", "gw", "dong", "donk", "deh", "ya", "yang", "di", "ke", "dari", "untuk",
+    "dan", "atau", "terus", "berapa", "apa", "apakah", "ini", "itu", "tolong", "mau", "ingin",
+    "the", "a", "an", "my", "me", "i", "to", "of", "for", "is", "what", "how", "please", "tool",
+}
+
+
+def _stem(token: str) -> str:
+    for p in _PREFIXES:
+        if token.startswith(p) and len(token) - len(p) >= 4:
+            token = token[len(p):]
+            break
+    for s in _SUFFIXES:
+        if token.endswith(s) and len(token) - len(s) >= 3:
+            return token[: -len(s)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Words + their stems + character trigrams (marked '#'), for slang-tolerant matching."""
+    terms = []
+    for tok in _TOKEN.findall(text.lower()):
+        if tok in _STOPWORDS:
+            continue
+        stem = _stem(tok)
+        terms.append(tok)
+        if stem != tok:
+            terms.append(stem)
+        padded = f"^{stem}$"
+        terms.extend("#" + padded[i:i + 3] for i in range(len(padded) - 2))
+    return terms
+
+
+def load_tool_metadata(path: str = TOOLS_CONFIG_PATH) -> Dict[str, Dict[str, Any]]:
+    """Descriptions, examples and keywords per tool from config/tools_config.json (if present)."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return {t["name"]: t for t in json.load(fh).get("tools", [])}
+    except (OSError, ValueError) as e:
+        logger.warning(f"[TOOL-RETRIEVER] No tool metadata from {path}: {e}")
+        return {}
+
+
+class ToolRetriever:
+    """
+    Ranks MCP tools against a user message (+ session context) with BM25 over an
+    in-memory inverted index, so prompts carry only the top-k tool descriptions.
+
+    Scoring only touches the postings of the query's terms, so selection cost and
+    prompt size stay flat as the catalog grows. When the best match is weak the
+    full catalog is returned instead (never hide the right tool on a guess).
+    """
+
+    K1 = 1.5
+    B = 0.75
+    TRIGRAM_WEIGHT = 0.25     # trigrams only nudge the ranking (typos, slang)
+    CONTEXT_WEIGHT = 0.3      # session context counts less than the current message
+
+    def __init__(self, top_k: Optional[int] = None, min_score: Optional[float] = None,
+                 metadata: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.top_k = top_k or int(os.getenv("TOOL_TOP_K", "6"))
+        self.min_score = min_score if min_score is not None else float(os.getenv("TOOL_MIN_SCORE", "2.0"))
+        self.metadata = metadata if metadata is not None else load_tool_metadata()
+        self._signature: Optional[Tuple[str, ...]] = None
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._idf: Dict[str, float] = {}
+        self._doc_len: List[int] = []
+        self._avg_len = 1.0
+
+    def document(self, tool) -> str:
+        """Searchable text of a tool: name, description and configured examples/keywords."""
+        meta = self.metadata.get(tool.name, {})
+        parts = [
+            tool.name.replace("_", " "),
+            getattr(tool, "title", None) or "",
+            tool.description or "",
+            meta.get("title", ""),
+            meta.get("description", ""),
+            " ".join(meta.get("examples", [])),
+            " ".join(meta.get("keywords", [])),
+        ]
+        return " ".join(parts)
+
+    def _build(self, tools: List[Any]):
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._doc_len = []
+        for idx, tool in enumerate(tools):
+            counts = Counter(tokenize(self.document(tool)))
+            self._doc_len.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings[term].append((idx, tf))
+
+        n = len(tools)
+        self._postings = dict(postings)
+        self._idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in postings.items()}
+        self._avg_len = (sum(self._doc_len) / n) if n else 1.0
+        self._signature = tuple(t.name for t in tools)
+        logger.info(f"[TOOL-RETRIEVER] Indexed {n} tools, {len(self._postings)} terms")
+
+    def _accumulate(self, scores: Dict[int, float], text: str, weight: float):
+        for term, qtf in Counter(tokenize(text)).items():
+            plist = self._postings.get(term)
+            if not plist:
+                continue
+            w = weight * (self.TRIGRAM_WEIGHT if term.startswith("#") else 1.0) * self._idf[term]
+            for idx, tf in plist:
+                norm = tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * self._doc_len[idx] / self._avg_len))
+                scores[idx] = scores.get(idx, 0.0) + w * norm
+
+    def rank(self, tools: List[Any], query: str, context: str = "") -> List[Tuple[Any, float]]:
+        if self._signature != tuple(t.name for t in tools):
+            self._build(tools)
+        scores: Dict[int, float] = {}
+        self._accumulate(scores, query, 1.0)
+        if context:
+            self._accumulate(scores, context, self.CONTEXT_WEIGHT)
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        return [(tools[idx], score) for idx, score in ranked]
+
+    def select(self, tools: List[Any], query: str, context: str = "",
+               always: Iterable[str] = ()) -> List[Any]:
+        """
+        Top-k tools for the prompt, keeping catalog order.
+        Tools named in `always` (e.g. the session's active intent) are kept regardless of score.
+        """
+        if len(tools) <= self.top_k or not query:
+            return tools
+
+        ranked = self.rank(tools, query, context)
+        if not ranked or ranked[0][1] < self.min_score:
+            logger.info(f"[TOOL-RETRIEVER] Low confidence (top={ranked[0][1] if ranked else 0:.2f}), "
+                        f"using full catalog of {len(tools)} tools")
+            return tools
+
+        keep = {t.name for t, _ in ranked[: self.top_k]} | set(always)
+        selected = [t for t in tools if t.name in keep]
+        logger.debug(f"[TOOL-RETRIEVER] Selected {[t.name for t in selected]} for {query!r}")
+        return selected
+
+
+tool_retriever = ToolRetriever()
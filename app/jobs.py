@@ -0,0 +1,154 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger("app.jobs")
+
+# Tool _meta flag set by the MCP server on tools that can run long (see mcp_server/hr_tools.py)
+LONG_RUNNING_META = "hr-ai/long_running"
+
+ProgressFn = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+
+class Job:
+    """One background tool call: status, last progress notification and outcome."""
+
+    def __init__(self, session_id: str, tool: str, args: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.tool = tool
+        self.args = args
+        self.status = "queued"          # queued | running | done | error
+        self.progress: Optional[float] = None
+        self.total: Optional[float] = None
+        self.message: Optional[str] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.exception: Optional[BaseException] = None
+        self.detached = False           # handed back as a job handle (caller stopped waiting)
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "session_id": self.session_id,
+            "tool": self.tool,
+            "args": self.args,
+            "status": self.status,
+            "progress": self.progress,
+            "total": self.total,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Bounded background pool for long-running tool calls.
+
+    Every call runs as a task holding one of `workers` slots (at most `max_pending` more
+    wait for a slot). The caller waits up to `inline_wait_s`; a call that finishes in time
+    is returned inline, otherwise the caller gets the Job as a handle and `on_done(job)`
+    fires when it finishes. Finished jobs are kept for `ttl_s` seconds for GET /jobs/{id}.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 inline_wait_s: Optional[float] = None, ttl_s: Optional[float] = None):
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "4"))
+        self.max_pending = max_pending if max_pending is not None else int(os.getenv("JOB_MAX_PENDING", "100"))
+        self.inline_wait_s = inline_wait_s if inline_wait_s is not None else float(os.getenv("JOB_INLINE_WAIT_S", "2.0"))
+        self.ttl_s = ttl_s if ttl_s is not None else float(os.getenv("JOB_TTL_S", "3600"))
+        self._slots: Optional[asyncio.Semaphore] = None     # created on the running loop
+        self._jobs: Dict[str, Job] = {}
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _evict(self):
+        cutoff = time.time() - self.ttl_s
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def submit(self, session_id: str, tool: str, args: Dict[str, Any],
+               call: Callable[[ProgressFn], Awaitable[Any]],
+               on_done: Optional[Callable[[Job], None]] = None) -> Job:
+        """Start `call(progress)` in the pool; raises RuntimeError when the queue is full."""
+        self._evict()
+        active = sum(1 for j in self._jobs.values() if not j.finished)
+        if active >= self.workers + self.max_pending:
+            raise RuntimeError(f"Too many background jobs ({active}), try again later")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        job = Job(session_id, tool, args)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, call, on_done))
+        return job
+
+    async def _run(self, job: Job, call: Callable[[ProgressFn], Awaitable[Any]],
+                   on_done: Optional[Callable[[Job], None]]):
+        async def progress(done: float, total: Optional[float], message: Optional[str]):
+            job.progress, job.total, job.message = done, total, message
+
+        async with self._slots:
+            job.status, job.started_at = "running", time.time()
+            try:
+                job.result = await call(progress)
+                job.status = "done"
+            except asyncio.CancelledError:
+                job.status, job.error = "error", "cancelled"
+                raise
+            except Exception as e:
+                job.status, job.error, job.exception = "error", str(e), e
+                logger.error(f"[JOBS] {job.tool} job {job.id} failed: {e}")
+            finally:
+                job.finished_at = time.time()
+
+        if job.detached:
+            logger.info(f"[JOBS] {job.tool} job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+            if on_done is not None:
+                try:
+                    on_done(job)
+                except Exception as e:
+                    logger.error(f"[JOBS] on_done for job {job.id} failed: {e}", exc_info=True)
+
+    async def run(self, session_id: str, tool: str, args: Dict[str, Any],
+                  call: Callable[[ProgressFn], Awaitable[Any]],
+                  on_done: Optional[Callable[[Job], None]] = None) -> Tuple[Optional[Job], Any]:
+        """
+        Run `call` in the pool and wait up to inline_wait_s.
+        Returns (None, result) when it finished in time (errors re-raised), else (job, None).
+        """
+        job = self.submit(session_id, tool, args, call, on_done)
+        await asyncio.wait({job.task}, timeout=self.inline_wait_s)
+        if not job.finished:
+            job.detached = True
+            logger.info(f"[JOBS] {tool} still running after {self.inline_wait_s}s → job {job.id}")
+            return job, None
+        del self._jobs[job.id]
+        if job.exception is not None:
+            raise job.exception
+        return None, job.result
+
+    async def shutdown(self):
+        tasks = [j.task for j in self._jobs.values() if j.task is not None and not j.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+job_manager = JobManager()
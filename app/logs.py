@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import zlib
+import logging
+import datetime
+import functools
+import logging.handlers
+from typing import Any, Optional
+
+import structlog
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, stdlib json otherwise
+    orjson = None
+
+from app.metrics import metrics
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "console")            # console | json
+# Log fields (strings, or containers rendered as JSON) are cut to this many characters
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "500"))
+# Share of DEBUG events kept (1.0 = all); INFO and above are never sampled
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+# Records waiting for the writer thread; when full, new records are dropped rather than block a request
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+
+def _cut(data: bytes) -> str:
+    if len(data) <= LOG_MAX_FIELD_CHARS:
+        return data.decode("utf-8", "replace")
+    head = data[:LOG_MAX_FIELD_CHARS].decode("utf-8", "ignore")
+    return f"{head}…[+{len(data) - LOG_MAX_FIELD_CHARS} bytes, crc32={zlib.crc32(data):08x}]"
+
+
+def clip(value: Any) -> Any:
+    """
+    Bounded stand-in for a log field: strings and containers (as compact JSON) longer
+    than LOG_MAX_FIELD_CHARS keep their head plus the cut length and a checksum of the
+    whole payload, so repeated payloads can still be matched across log lines.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= LOG_MAX_FIELD_CHARS else _cut(value.encode("utf-8", "replace"))
+    if isinstance(value, (dict, list, tuple, set, frozenset)):
+        if orjson is not None:
+            try:
+                return _cut(orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS))
+            except TypeError:
+                pass    # e.g. integers beyond 64 bits: let json handle it
+        return _cut(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    return clip(str(value))
+
+
+def _keep_debug() -> bool:
+    return LOG_DEBUG_SAMPLE_RATE >= 1.0 or random.random() < LOG_DEBUG_SAMPLE_RATE
+
+
+def _sample_debug(_, method_name: str, event_dict):
+    if method_name == "debug" and not _keep_debug():
+        raise structlog.DropEvent
+    return event_dict
+
+
+_UNCLIPPED = ("exc_info", "exception", "stack")
+
+
+def _clip_fields(_, __, event_dict):
+    """Runs on the calling thread: payloads are snapshotted small before they are queued."""
+    return {k: (v if k.startswith("_") or k in _UNCLIPPED else clip(v)) for k, v in event_dict.items()}
+
+
+def _timestamp(_, __, event_dict):
+    record = event_dict.get("_record")
+    created = record.created if record is not None else datetime.datetime.now().timestamp()
+    event_dict["timestamp"] = datetime.datetime.fromtimestamp(created).isoformat(timespec="milliseconds")
+    return event_dict
+
+
+class _SampleForeignDebug(logging.Filter):
+    """Samples DEBUG records from plain `logging` loggers (structlog events were sampled already)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or isinstance(record.msg, dict) or _keep_debug()
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queues the record as is: formatting and I/O happen on the writer thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc("log_dropped_total")
+
+
+structlog.configure(
+    processors=[
+        structlog.stdlib.filter_by_level,
+        _sample_debug,
+        structlog.contextvars.merge_contextvars,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.format_exc_info,     # the traceback only exists on this thread
+        _clip_fields,
+        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+    ],
+    logger_factory=structlog.stdlib.LoggerFactory(),
+    wrapper_class=structlog.stdlib.BoundLogger,
+    cache_logger_on_first_use=True,
+)
+
+
+def get_logger(name: str) -> structlog.stdlib.BoundLogger:
+    """
+    Structured logger backed by `logging.getLogger(name)`. Pass payloads as keyword
+    arguments (`logger.info("[TAG] Done", results=results)`): they are only rendered
+    when the level is enabled, clipped on the calling thread and written by the
+    queue's writer thread once `configure_logging()` has run.
+    """
+    return structlog.stdlib.get_logger(name)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, stream=None):
+    """
+    Route every log record (structlog and plain `logging`) through a bounded queue to
+    one writer thread that renders console or JSON lines. Idempotent.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    if fmt == "json":
+        renderer = structlog.processors.JSONRenderer(serializer=functools.partial(json.dumps, ensure_ascii=False, default=str))
+    else:
+        renderer = structlog.dev.ConsoleRenderer(colors=False)
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[structlog.stdlib.ExtraAdder(), _clip_fields],
+        processors=[
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            _timestamp,
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            renderer,
+        ],
+    )
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(formatter)
+
+    handler = _NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    handler.addFilter(_SampleForeignDebug())
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(handler.queue, writer, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
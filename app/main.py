@@ -1,20 +1,56 @@
 import logging
+from typing import Optional
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from app.orchestrator.orchestrator import AgentOrchestrator
 from app.planner.orchestrator import AutonomousChatOrchestrator
+from app.graph.mcp_client import mcp_client
+from app.jobs import job_manager
+from app.logs import configure_logging
+from app.metrics import metrics
+from app.offload import loop_monitor, offloader
+from app.responses import CompressionMiddleware, FastJSONResponse, log_codecs
+from app.warmup import warm_up
 
-# Initialize logger
-logging.basicConfig(level=logging.INFO)
+# Initialize logger: queue-backed structured logging (LOG_LEVEL, LOG_FORMAT)
+configure_logging()
 logger = logging.getLogger("app.main")
 
-# Initialize FastAPI app
-app = FastAPI(title="HR-AI MCP Backend", version="1.0.0")
+# Agents are built and warmed in the lifespan phase, before the app reports ready
+agent: Optional[AgentOrchestrator] = None
+orchestrator: Optional[AutonomousChatOrchestrator] = None
+warmup_report: dict = {}
+ready = False
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    global agent, orchestrator, warmup_report, ready
+    log_codecs()
+    loop_monitor.start()
+    # Initialize Agent
+    agent = AgentOrchestrator()
+    #autonomous Agent
+    orchestrator = AutonomousChatOrchestrator()
 
-# Initialize Agent
-agent = AgentOrchestrator()
-#autonomous Agent
-orchestrator = AutonomousChatOrchestrator()
+    warmup_report = await warm_up(agent.detector.client)
+    ready = warmup_report.get("mcp", {}).get("ok", False)
+    if not ready:
+        logger.error("[WARMUP] MCP tools unavailable, /ready will report not ready.")
+    yield
+    ready = False
+    await job_manager.shutdown()
+    await mcp_client.stop()
+    await loop_monitor.stop()
+    offloader.shutdown()
+
+
+# Initialize FastAPI app
+app = FastAPI(title="HR-AI MCP Backend", version="1.0.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
+app.add_middleware(CompressionMiddleware)
 
 
 # ---- Request / Response Models ----
@@ -34,7 +70,8 @@ class ChatResponse(BaseModel):
 
 
 # ---- Routes ----
-@app.post("/chat", response_model=ChatResponse)
+# Documented, not enforced: the route returns the agent's state without re-validating it
+@app.post("/chat", responses={200: {"model": ChatResponse}})
 async def chat_endpoint(req: ChatRequest):
     """
     Main chat endpoint.
@@ -43,7 +80,8 @@ async def chat_endpoint(req: ChatRequest):
     """
     try:
         result = await agent.handle_message(req.session_id, req.message)
-        return ChatResponse(**result)
+        # Built by the agent itself: pick the response fields and skip re-validating them
+        return FastJSONResponse({field: result.get(field) for field in ChatResponse.model_fields})
     except Exception as e:
         logger.error(f"[CHAT-ERROR] {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -53,14 +91,37 @@ async def chat_endpoint(req: ChatRequest):
 async def chat_autonomous(payload: dict):
     """
     Endpoint for autonomous HR chat.
-    Accepts user message and returns full pipeline output.
+    Accepts user message (and optional session_id) and returns full pipeline output.
     """
     user_message = payload.get("message", "")
     if not user_message:
         return {"error": "Message is required"}
-    return await orchestrator.handle_message(user_message)
+    return FastJSONResponse(await orchestrator.handle_message(user_message, payload.get("session_id")))
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status, progress and (once finished) result of a background tool job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return FastJSONResponse(job.to_dict())
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """LLM routing latency/escalation counters (Prometheus text format)."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up (says nothing about dependencies)."""
     return {"status": "ok", "service": "HR-AI MCP Backend"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: warm-up finished and the MCP tools are reachable."""
+    body = {"status": "ready" if ready else "starting", "warmup": warmup_report}
+    return FastJSONResponse(body, status_code=200 if ready else 503)
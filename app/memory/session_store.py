@@ -2,6 +2,8 @@ import datetime
 import uuid
 from typing import Dict, Any, List
 
+from app.graph.result_summary import summarize_for_llm
+
 
 class SessionStore:
     def __init__(self):
@@ -16,6 +18,7 @@ class SessionStore:
                 "intents": [],
                 "tool_calls": [],
                 "clarifications": [],
+                "jobs": {},
                 "state": {
                     "active_intent": None,
                     "status": "idle",           # idle | awaiting_args | executing | completed
@@ -50,12 +53,13 @@ class SessionStore:
         })
 
     def add_tool_call(self, session_id: str, tool: str, args: Dict[str, Any], result: Any):
+        """Keeps only a preview of `result` (see summarize_for_llm): history is returned on every /chat turn."""
         self.get(session_id)["tool_calls"].append({
             "id": str(uuid.uuid4()),
             "time": datetime.datetime.utcnow().isoformat(),
             "tool": tool,
             "args": args,
-            "result": result,
+            "result": summarize_for_llm(result),
             "state": self.get(session_id)["state"].copy()
         })
 
@@ -68,6 +72,32 @@ class SessionStore:
             "state": self.get(session_id)["state"].copy()
         })
 
+    def add_job(self, session_id: str, job_id: str, tool: str, args: Dict[str, Any]):
+        self.get(session_id)["jobs"][job_id] = {
+            "time": datetime.datetime.utcnow().isoformat(),
+            "tool": tool,
+            "args": args,
+            "status": "running",
+        }
+
+    def finish_job(self, session_id: str, job_id: str, status: str, result: Any = None, error: str = None):
+        """Record a background job's outcome; a successful result also lands in tool_calls."""
+        job = self.get(session_id)["jobs"].setdefault(job_id, {})
+        job.update(status=status, finished=datetime.datetime.utcnow().isoformat(), error=error,
+                   result=summarize_for_llm(result), announced=False)
+        if status == "done":
+            self.add_tool_call(session_id, job.get("tool"), job.get("args", {}), result)
+
+    def take_finished_jobs(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """Background jobs finished since the last reply, as tool results keyed "job:<id>"; marks them announced."""
+        finished = {}
+        for job_id, job in self.get(session_id)["jobs"].items():
+            if job.get("announced") is False:
+                job["announced"] = True
+                finished[f"job:{job_id}"] = {"status": job["status"], "job_id": job_id, "tool": job.get("tool"),
+                                             "result": job.get("result"), "error": job.get("error")}
+        return finished
+
     # ---- NEW conversation state helpers ----
     def set_state(self, session_id: str,
                   active_intent: str = None,
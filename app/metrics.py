@@ -0,0 +1,97 @@
+import bisect
+import threading
+from typing import Any, Dict, List, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Latency histogram buckets, seconds
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt(name: str, key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in key] + ([extra] if extra else [])
+    return f"{name}{{{','.join(parts)}}}" if parts else name
+
+
+class Metrics:
+    """
+    In-process counters, gauges and latency histograms (thread-safe: LLM calls run in worker threads).
+    GET /metrics renders them in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}   # bucket counts…, +Inf, sum
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def buckets(self, name: str, bounds: Tuple[float, ...]):
+        """Use `bounds` instead of BUCKETS for histogram `name` (call before its first observation)."""
+        with self._lock:
+            self._buckets[name] = tuple(bounds)
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = _key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        key = _key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = _key(labels)
+        with self._lock:
+            bounds = self._buckets.get(name, BUCKETS)
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = [0.0] * (len(bounds) + 2)
+            hist[bisect.bisect_left(bounds, seconds)] += 1
+            hist[-1] += seconds
+
+    def value(self, name: str, **labels) -> float:
+        with self._lock:
+            series = self._counters.get(name) or self._gauges.get(name) or {}
+            return series.get(_key(labels), 0.0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters and gauges plus histogram count/sum, keyed by `name{labels}`."""
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for name, series in list(self._counters.items()) + list(self._gauges.items()):
+                out[name] = {_fmt(name, key): v for key, v in series.items()}
+            for name, series in self._histograms.items():
+                out[name] = {_fmt(name, key): {"count": sum(h[:-1]), "sum": round(h[-1], 6)} for key, h in series.items()}
+        return out
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{_fmt(name, key)} {v:g}" for key, v in series.items())
+            for name, series in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{_fmt(name, key)} {v:g}" for key, v in series.items())
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in series.items():
+                    cumulative = 0.0
+                    for bound, count in zip(self._buckets.get(name, BUCKETS) + ("+Inf",), hist[:-1]):
+                        cumulative += count
+                        le = f'le="{bound}"'
+                        lines.append(f"{_fmt(name + '_bucket', key, le)} {cumulative:g}")
+                    lines.append(f"{_fmt(name + '_sum', key)} {hist[-1]:.6f}")
+                    lines.append(f"{_fmt(name + '_count', key)} {cumulative:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
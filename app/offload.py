@@ -0,0 +1,113 @@
+import os
+import time
+import asyncio
+import logging
+import functools
+import contextvars
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.metrics import metrics
+
+logger = logging.getLogger("app.offload")
+
+T = TypeVar("T")
+
+# Work on inputs smaller than this (bytes/characters/items, as the caller measures) stays on the loop
+OFFLOAD_MIN_SIZE = int(os.getenv("OFFLOAD_MIN_SIZE", "32768"))
+OFFLOAD_THREADS = int(os.getenv("OFFLOAD_THREADS", str(min(16, (os.cpu_count() or 1) + 4))))
+# 0 = no process pool: CPU-bound work that asks for one runs in the thread pool instead
+OFFLOAD_PROCESSES = int(os.getenv("OFFLOAD_PROCESSES", "0"))
+
+LOOP_LAG_INTERVAL_S = float(os.getenv("LOOP_LAG_INTERVAL_S", "0.5"))
+LOOP_LAG_WARN_MS = float(os.getenv("LOOP_LAG_WARN_MS", "100"))
+
+
+class Offloader:
+    """
+    Managed executors for blocking or CPU-heavy work on the request path.
+
+    `await offloader.run(fn, *args, size=n)` runs `fn` inline when `n` is below
+    OFFLOAD_MIN_SIZE (a thread hop costs more than small work), otherwise in the
+    thread pool, in a copy of the caller's context (contextvars such as the LLM
+    session tag carry over). `process=True` uses the process pool for picklable,
+    GIL-bound work when OFFLOAD_PROCESSES > 0.
+    """
+
+    def __init__(self, threads: int = OFFLOAD_THREADS, processes: int = OFFLOAD_PROCESSES,
+                 min_size: int = OFFLOAD_MIN_SIZE):
+        self.threads, self.processes, self.min_size = threads, processes, min_size
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def _thread_pool(self) -> Executor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.threads, thread_name_prefix="offload")
+        return self._threads
+
+    def _process_pool(self) -> Optional[Executor]:
+        if self.processes <= 0:
+            return None
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(self.processes)
+        return self._processes
+
+    async def run(self, fn: Callable[..., T], *args, size: Optional[int] = None,
+                  process: bool = False, **kwargs) -> T:
+        if size is not None and size < self.min_size:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        pool = self._process_pool() if process else None
+        if pool is not None:
+            return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(self._thread_pool(), functools.partial(ctx.run, fn, *args, **kwargs))
+
+    def shutdown(self):
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+
+
+class LoopLagMonitor:
+    """
+    Measures how late a periodic timer fires on the event loop, i.e. how long the loop
+    was blocked. Lag goes to the `event_loop_lag_seconds` histogram and the
+    `event_loop_lag_max_seconds` gauge (worst since start); lag above LOOP_LAG_WARN_MS is logged.
+    """
+
+    def __init__(self, interval_s: float = LOOP_LAG_INTERVAL_S, warn_ms: float = LOOP_LAG_WARN_MS):
+        self.interval_s, self.warn_ms = interval_s, warn_ms
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        metrics.buckets("event_loop_lag_seconds", (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+
+    async def _watch(self):
+        while True:
+            expected = time.perf_counter() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            lag = max(0.0, time.perf_counter() - expected)
+            metrics.observe("event_loop_lag_seconds", lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+                metrics.set("event_loop_lag_max_seconds", lag)
+            if lag * 1000 >= self.warn_ms:
+                logger.warning(f"[LOOP-LAG] Event loop blocked for {lag * 1000:.0f} ms")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+offloader = Offloader()
+loop_monitor = LoopLagMonitor()
@@ -3,8 +3,10 @@ import uuid
 from typing import Dict, Any
 
 from app.intent.detector import IntentDetector
+from app.intent.llm_scheduler import llm_context
 from app.memory.session_store import SessionStore
 from app.graph.agent_graph import AgentGraphWorkflow, AgentState
+from app.replay.recorder import recorder
 
 logger = logging.getLogger("app.orchestrator.graph_orchestrator")
 
@@ -33,14 +35,18 @@ class AgentOrchestrator:
             "session_id": session_id,
             "user_message": user_message,
             "intents": [],
+            "validations": {},
             "clarifications": [],
             "results": {},
             "assistant_response": "",
             "history": {},
         }
 
-        # Run the LangGraph workflow
-        final_state = await self.workflow.graph.ainvoke(initial_state)
+        # Run the LangGraph workflow (captured for offline replay when recording is on)
+        with recorder.turn(session_id, trace_id, user_message) as capture, llm_context(session=session_id):
+            final_state = await self.workflow.graph.ainvoke(initial_state)
+            if capture is not None:
+                capture.response = final_state.get("assistant_response")
 
         # Always return enriched state (including full session history)
         final_state["history"] = self.memory.full_history(session_id)
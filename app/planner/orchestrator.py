@@ -1,12 +1,13 @@
-import logging
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.intent.llm_scheduler import llm_context
 from app.planner.plan_generator import PlanGenerator
 from app.planner.plan_executor import PlanExecutor
 from app.planner.reflection_engine import ReflectionEngine
 from app.planner.response_builder import ResponseBuilder
+from app.logs import get_logger
 
-logger = logging.getLogger("autonomous.orchestrator")
+logger = get_logger("autonomous.orchestrator")
 
 
 class AutonomousChatOrchestrator:
@@ -21,28 +22,32 @@ class AutonomousChatOrchestrator:
         self.reflection_engine = ReflectionEngine()
         self.response_builder = ResponseBuilder()
 
-    async def handle_message(self, user_message: str) -> Dict[str, Any]:
-        # Generate session ID
-        session_id = str(uuid.uuid4())
-        trace = lambda stage, msg: logger.info(f"[TRACE][{session_id}][{stage}] {msg}")
+    async def handle_message(self, user_message: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        # Without a caller session, each message gets its own run ID and no language pinning
+        run_id = session_id or str(uuid.uuid4())
+        with llm_context(session=run_id):
+            return await self._handle(run_id, user_message, pin_session=session_id)
 
-        trace("START", f"Received message: {user_message!r}")
+    async def _handle(self, session_id: str, user_message: str, pin_session: Optional[str] = None) -> Dict[str, Any]:
+        trace = lambda stage, msg, **fields: logger.info(f"[TRACE][{session_id}][{stage}] {msg}", **fields)
+
+        trace("START", "Received message", message=user_message)
 
         # Step 1: Planning
         plan = await self.plan_generator.generate_plan(user_message)
-        trace("PLAN", f"Generated plan: {plan}")
+        trace("PLAN", "Generated plan", plan=plan)
 
         # Step 2: Execution
         results = await self.plan_executor.execute(plan)
-        trace("EXEC", f"Execution results: {results}")
+        trace("EXEC", "Execution results", results=results)
 
         # Step 3: Reflection
-        reflection = self.reflection_engine.reflect(user_message, results)
-        trace("REFLECT", f"Reflection output: {reflection!r}")
+        reflection = await self.reflection_engine.reflect(user_message, results)
+        trace("REFLECT", "Reflection output", reflection=reflection)
 
         # Step 4: Response building
-        response = self.response_builder.build(user_message, results, reflection)
-        trace("RESP", f"Final response: {response!r}")
+        response = await self.response_builder.build(user_message, results, reflection, session_id=pin_session)
+        trace("RESP", "Final response", response=response)
 
         trace("END", "Pipeline completed.")
 
@@ -1,39 +1,46 @@
 from typing import List, Dict, Any
 from app.graph.mcp_client import mcp_client
-import logging
+from app.graph.bulk_calls import merge_bulk_calls, result_for
+from app.logs import get_logger
 
-logger = logging.getLogger("autonomous.plan_executor")
+logger = get_logger("autonomous.plan_executor")
 
 
 class PlanExecutor:
     """
     Executes a multi-step plan by calling MCP tools.
     If required args are missing, triggers clarification instead of execution.
+    Steps calling the same tool for different employees are merged into one bulk call.
     """
 
     async def execute(self, plan: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        results = []
+        results: List[Dict[str, Any]] = [None] * len(plan)
+        ready = []
 
         for idx, step in enumerate(plan):
             action = step.get("action")
             args = step.get("args", {})
 
-            logger.info(f"[EXEC] Step {idx+1}: validating '{action}' with args={args}")
+            logger.info(f"[EXEC] Step {idx+1}: validating '{action}'", args=args)
             missing = [k for k, v in args.items() if v is None]
             if missing:
                 logger.warning(f"[EXEC] Step {idx+1}: Missing args {missing}, clarification required.")
-                results.append({
+                results[idx] = {
                     "action": action,
                     "args": args,
                     "result": {
                         "clarification_required": True,
                         "missing_args": missing
                     }
-                })
+                }
                 continue
+            ready.append(idx)
 
-            logger.info(f"[EXEC] Step {idx+1}: executing tool '{action}'")
-            result = await mcp_client.call(action, args)
+        tool_names = [t.name.strip().lower() for t in await mcp_client.list_tools()] if len(ready) > 1 else []
+        for call in merge_bulk_calls([(plan[i].get("action"), plan[i].get("args", {})) for i in ready], tool_names):
+            steps = [ready[m] for m in call.members]
+            logger.info(f"[EXEC] Step(s) {[i + 1 for i in steps]}: executing tool '{call.tool}'")
+            result = await mcp_client.call(call.tool, call.args)
 
             # Normalize
             if isinstance(result, dict):
@@ -41,12 +48,14 @@ class PlanExecutor:
             else:
                 normalized = {"raw_text": str(result)}
 
-            results.append({
-                "action": action,
-                "args": args,
-                "result": normalized
-            })
-
-            logger.info(f"[EXEC] Step {idx+1}: result={normalized}")
+            for idx in steps:
+                step = plan[idx]
+                args = step.get("args", {})
+                results[idx] = {
+                    "action": step.get("action"),
+                    "args": args,
+                    "result": result_for(normalized, args["employee_id"]) if call.employee_ids else normalized
+                }
+                logger.info(f"[EXEC] Step {idx+1}: done", result=results[idx]["result"])
 
         return results
@@ -2,8 +2,10 @@ import json
 from typing import List, Dict, Any
 
 from app.intent.hf_client import HFModelClient
+from app.intent.structured_output import plan_schema
 from app.graph.mcp_client import mcp_client
 from app.graph.schema_utils import extract_schema
+from app.intent.tool_retriever import tool_retriever
 
 
 class PlanGenerator:
@@ -17,7 +19,8 @@ class PlanGenerator:
         self.hf_client = HFModelClient(use_autonomous=True)
 
     async def generate_plan(self, user_message: str) -> List[Dict[str, Any]]:
-        tools = await mcp_client.list_tools()
+        # Only the top-k tools relevant to the message go into the planning prompt
+        tools = tool_retriever.select(await mcp_client.list_tools(), user_message)
 
         tool_descriptions = []
         for t in tools:
@@ -82,6 +85,8 @@ class PlanGenerator:
 
         user_prompt = f"User query: \"{user_message}\"\nGenerate plan now."
 
-        result = self.hf_client.chat_json_reasoning(system_prompt, user_prompt)
+        result = await self.hf_client.achat_json(system_prompt, user_prompt, route="planner",
+                                                 validate=lambda r: isinstance(r.get("plan"), list),
+                                                 schema=plan_schema(tools))
 
         return result.get("plan", []) if isinstance(result, dict) else []
@@ -1,5 +1,7 @@
+import json
 from typing import List, Dict, Any
 from app.intent.hf_client import HFModelClient
+from app.graph.result_summary import summarize_for_llm
 
 
 class ReflectionEngine:
@@ -10,13 +12,14 @@ class ReflectionEngine:
     def __init__(self):
         self.hf_client = HFModelClient(use_autonomous=True)
 
-    def reflect(self, user_message: str, results: List[Dict[str, Any]]) -> str:
+    async def reflect(self, user_message: str, results: List[Dict[str, Any]]) -> str:
         system_prompt = (
             "You are a reflection module. "
             "Check if the tool execution results fully answer the user's question. "
             "If something is missing, suggest what else should be checked."
         )
-        user_prompt = f"User message: {user_message}\nExecution results: {results}"
+        results_json = json.dumps(summarize_for_llm(results), ensure_ascii=False, default=str)
+        user_prompt = f"User message: {user_message}\nExecution results: {results_json}"
 
         # ✅ Use reasoning-safe plain text
-        return self.hf_client.chat_text(system_prompt, user_prompt)
+        return await self.hf_client.achat_text(system_prompt, user_prompt, route="reflection")
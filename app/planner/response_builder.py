@@ -1,6 +1,8 @@
-from typing import List, Dict, Any
+import json
+from typing import List, Dict, Any, Optional
 from app.intent.hf_client import HFModelClient
-import langdetect
+from app.graph.result_summary import summarize_for_llm
+from app.intent.language import session_languages
 
 
 class ResponseBuilder:
@@ -13,15 +15,12 @@ class ResponseBuilder:
     def __init__(self):
         self.hf_client = HFModelClient(use_autonomous=False)
 
-    def detect_language(self, text: str) -> str:
-        try:
-            lang = langdetect.detect(text)
-            return "id" if lang == "id" else "en"
-        except Exception:
-            return "en"
+    def detect_language(self, text: str, session_id: Optional[str] = None) -> str:
+        return session_languages.language(session_id, text, default="en")
 
-    def build(self, user_message: str, results: List[Dict[str, Any]], reflection: str = "") -> str:
-        lang = self.detect_language(user_message)
+    async def build(self, user_message: str, results: List[Dict[str, Any]], reflection: str = "",
+                    session_id: Optional[str] = None) -> str:
+        lang = self.detect_language(user_message, session_id)
 
         for r in results:
             if r["result"].get("clarification_required"):
@@ -43,6 +42,7 @@ class ResponseBuilder:
                 "Use tool results and consider reflection if provided."
             )
 
-        user_prompt = f"User: {user_message}\nResults: {results}\nReflection: {reflection}"
+        results_json = json.dumps(summarize_for_llm(results), ensure_ascii=False, default=str)
+        user_prompt = f"User: {user_message}\nResults: {results_json}\nReflection: {reflection}"
 
-        return self.hf_client.chat_text(system_prompt, user_prompt)
+        return await self.hf_client.achat_text(system_prompt, user_prompt, route="response")
@@ -1,12 +1,8 @@
-from app.graph.mcp_client import mcp_client
 from app.graph.schema_utils import extract_schema
 
-async def build_dynamic_intent_prompt() -> str:
-    """
-    Build system prompt dynamically from MCP tools.
-    """
-    tools = await mcp_client.list_tools()
 
+def render_intent_prompt(tools) -> str:
+    """Intent-detection system prompt listing the given tools."""
     prompt_lines = [
         "You are an intent detection module for an AI HR assistant.",
         "Your job is to map a user query into one or more intents, along with structured arguments.",
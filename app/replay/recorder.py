@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+
+logger = logging.getLogger("app.replay.recorder")
+
+
+def _prompt_hash(system: str, user: str) -> str:
+    """Short fingerprint of an LLM prompt (used to spot prompt drift on replay)."""
+    return hashlib.sha1(f"{system}\x00{user}".encode("utf-8")).hexdigest()[:12]
+
+
+class TurnCapture:
+    """
+    Everything observed while one user turn was being handled.
+    Filled by the HF / MCP client hooks, written as one JSONL line when the turn ends.
+    """
+
+    def __init__(self, session_id: str, trace_id: str, user_message: str):
+        self.session_id = session_id
+        self.trace_id = trace_id
+        self.user_message = user_message
+        self.started = time.time()
+        self.llm: List[Dict[str, Any]] = []
+        self.tools: List[Dict[str, Any]] = []
+        self.response: Optional[str] = None
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "kind": "turn",
+            "ts": round(self.started, 3),
+            "sid": self.session_id,
+            "trace": self.trace_id,
+            "msg": self.user_message,
+            "llm": self.llm,
+            "tools": self.tools,
+            "resp": self.response,
+            "ms": round((time.time() - self.started) * 1000, 1),
+        }
+
+
+class Cassette:
+    """
+    Recorded responses for one turn, consumed in order during replay.
+    If the code under test makes different calls than were recorded,
+    the mismatch is counted as a divergence instead of failing the run.
+    """
+
+    def __init__(self, turn: Dict[str, Any], catalog: Optional[List[Any]] = None, live_tools: bool = False):
+        self.turn = turn
+        self.catalog = catalog
+        self.live_tools = live_tools
+        self._llm = list(turn.get("llm", []))
+        self._tools = list(turn.get("tools", []))
+        self.divergences: List[str] = []
+
+    def next_llm(self, model: str, system: str, user: str) -> str:
+        if not self._llm:
+            self.divergences.append(f"extra llm call model={model}")
+            return ""
+        rec = self._llm.pop(0)
+        if rec.get("h") != _prompt_hash(system, user):
+            self.divergences.append(f"llm prompt drift model={model}")
+        return rec.get("out", "")
+
+    def next_tool(self, tool: str, args: Dict[str, Any]) -> Any:
+        for idx, rec in enumerate(self._tools):
+            if rec.get("tool") == tool:
+                if idx:
+                    self.divergences.append(f"tool call out of order tool={tool}")
+                if rec.get("args") != args:
+                    self.divergences.append(f"tool args drift tool={tool}")
+                return self._tools.pop(idx).get("out")
+        self.divergences.append(f"extra tool call tool={tool}")
+        raise LookupError(f"No recorded result for tool '{tool}'")
+
+    @property
+    def unused(self) -> int:
+        return len(self._llm) + len(self._tools)
+
+
+_current_turn: contextvars.ContextVar[Optional[TurnCapture]] = contextvars.ContextVar("replay_turn", default=None)
+_current_cassette: contextvars.ContextVar[Optional[Cassette]] = contextvars.ContextVar("replay_cassette", default=None)
+
+
+def active_cassette() -> Optional[Cassette]:
+    """Cassette of the turn being replayed in the current context, if any."""
+    return _current_cassette.get()
+
+
+@contextmanager
+def use_cassette(cassette: Cassette) -> Iterator[Cassette]:
+    token = _current_cassette.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _current_cassette.reset(token)
+
+
+class ConversationRecorder:
+    """
+    Opt-in recorder of production conversations.
+    Enabled by setting AGENT_RECORD_PATH; writes one compact JSON line per turn
+    (user input, LLM outputs, tool results) plus the tool catalog once per process.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else os.getenv("AGENT_RECORD_PATH", "")
+        self.enabled = bool(self.path)
+        self._lock = threading.Lock()
+        self._fh = None
+        self._catalog_written = False
+
+    def _write(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._fh is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._fh = open(self.path, "a", encoding="utf-8", buffering=1)
+                logger.info(f"[REPLAY] Recording conversations to {self.path}")
+            self._fh.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+
+    @contextmanager
+    def turn(self, session_id: str, trace_id: str, user_message: str) -> Iterator[Optional[TurnCapture]]:
+        """Capture one turn. No-op when recording is off or a replay is running."""
+        if not self.enabled or active_cassette() is not None:
+            yield None
+            return
+
+        capture = TurnCapture(session_id, trace_id, user_message)
+        token = _current_turn.set(capture)
+        try:
+            yield capture
+        finally:
+            _current_turn.reset(token)
+            try:
+                self._write(capture.to_record())
+            except Exception as e:
+                logger.warning(f"[REPLAY] Failed to write turn {trace_id}: {e}")
+
+    def record_llm(self, model: str, system: str, user: str, output: str, elapsed: float):
+        capture = _current_turn.get()
+        if capture is None:
+            return
+        capture.llm.append({
+            "model": model,
+            "h": _prompt_hash(system, user),
+            "out": output,
+            "ms": round(elapsed * 1000, 1),
+        })
+
+    def record_tool(self, tool: str, args: Dict[str, Any], output: Any, elapsed: float):
+        capture = _current_turn.get()
+        if capture is None:
+            return
+        capture.tools.append({
+            "tool": tool,
+            "args": args,
+            "out": output,
+            "ms": round(elapsed * 1000, 1),
+        })
+
+    def record_catalog(self, tools: List[Any]):
+        """Store the MCP tool catalog once so replays do not need a tool server."""
+        if not self.enabled or self._catalog_written:
+            return
+        self._catalog_written = True
+        try:
+            self._write({
+                "kind": "catalog",
+                "ts": round(time.time(), 3),
+                "tools": [t.model_dump(mode="json", exclude_none=True) for t in tools],
+            })
+        except Exception as e:
+            logger.warning(f"[REPLAY] Failed to write tool catalog: {e}")
+
+
+recorder = ConversationRecorder()
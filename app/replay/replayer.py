@@ -0,0 +1,161 @@
+"""
+Replay recorded conversations against the current code.
+
+    python -m app.replay.replayer recordings/turns.jsonl --speed 0 --concurrency 8
+
+LLM responses (and, unless --live-tools is given, tool results) come from the
+recording, so a replay is deterministic and needs neither HF credentials nor
+a tool server. Use it to load-test or profile changes on real traffic mixes.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import statistics
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Callable
+
+from app.replay.recorder import Cassette, use_cassette
+
+logger = logging.getLogger("app.replay.replayer")
+
+
+def load_recording(path: str):
+    """Parse a recording into (tool catalog, turns grouped per session in time order)."""
+    import mcp.types as types
+
+    catalog: Optional[List[Any]] = None
+    sessions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    with open(path, encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"[REPLAY] Skipping malformed line {lineno}: {e}")
+                continue
+            if rec.get("kind") == "catalog":
+                catalog = [types.Tool.model_validate(t) for t in rec.get("tools", [])]
+            elif rec.get("kind") == "turn":
+                sessions[rec["sid"]].append(rec)
+
+    for turns in sessions.values():
+        turns.sort(key=lambda r: r["ts"])
+    return catalog, dict(sessions)
+
+
+class ConversationReplayer:
+    """
+    Re-runs recorded sessions through an AgentOrchestrator.
+    - speed: 0 replays as fast as possible, 1 keeps the recorded pacing, 2 runs twice as fast, ...
+    - concurrency: how many turns (from different sessions) are in flight at the same time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        speed: float = 0.0,
+        concurrency: int = 1,
+        live_tools: bool = False,
+        orchestrator_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.path = path
+        self.speed = speed
+        self.concurrency = max(1, concurrency)
+        self.live_tools = live_tools
+        self.orchestrator_factory = orchestrator_factory
+        self.latencies: List[float] = []
+        self.divergent_turns = 0
+        self.response_mismatches = 0
+        self.errors = 0
+
+    def _make_orchestrator(self):
+        if self.orchestrator_factory:
+            return self.orchestrator_factory()
+        # Replays never hit the HF API, but the client still insists on a token.
+        os.environ.setdefault("HF_TOKEN", "replay")
+        from app.orchestrator.orchestrator import AgentOrchestrator
+        return AgentOrchestrator()
+
+    async def _replay_session(self, agent, session_id: str, turns: List[Dict[str, Any]],
+                              catalog, t0: float, wall0: float, sem: asyncio.Semaphore):
+        for turn in turns:
+            if self.speed > 0:
+                due = wall0 + (turn["ts"] - t0) / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            cassette = Cassette(turn, catalog=catalog, live_tools=self.live_tools)
+            # A slot per turn, taken after the pacing sleep: idle sessions don't hold one
+            async with sem:
+                started = time.perf_counter()
+                try:
+                    with use_cassette(cassette):
+                        result = await agent.handle_message(session_id, turn["msg"])
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"[REPLAY] Turn {turn.get('trace')} failed: {e}")
+                    continue
+                self.latencies.append(time.perf_counter() - started)
+
+            if cassette.divergences or cassette.unused:
+                self.divergent_turns += 1
+                logger.info(f"[REPLAY] Turn {turn.get('trace')} diverged: "
+                            f"{cassette.divergences} unused={cassette.unused}")
+            if turn.get("resp") is not None and result.get("assistant_response") != turn["resp"]:
+                self.response_mismatches += 1
+
+    async def run(self) -> Dict[str, Any]:
+        catalog, sessions = load_recording(self.path)
+        agent = self._make_orchestrator()
+        all_turns = [t for turns in sessions.values() for t in turns]
+        if not all_turns:
+            return {"sessions": 0, "turns": 0}
+
+        t0 = min(t["ts"] for t in all_turns)
+        sem = asyncio.Semaphore(self.concurrency)
+        wall0 = time.perf_counter()
+        await asyncio.gather(*(
+            self._replay_session(agent, sid, turns, catalog, t0, wall0, sem)
+            for sid, turns in sessions.items()
+        ))
+        elapsed = time.perf_counter() - wall0
+
+        lat = sorted(self.latencies)
+        return {
+            "sessions": len(sessions),
+            "turns": len(all_turns),
+            "errors": self.errors,
+            "divergent_turns": self.divergent_turns,
+            "response_mismatches": self.response_mismatches,
+            "elapsed_s": round(elapsed, 3),
+            "turns_per_s": round(len(lat) / elapsed, 2) if elapsed else None,
+            "latency_ms_p50": round(statistics.median(lat) * 1000, 2) if lat else None,
+            "latency_ms_p95": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000, 2) if lat else None,
+        }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay recorded HR agent conversations.")
+    parser.add_argument("path", help="JSONL file written with AGENT_RECORD_PATH")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = as fast as possible, 1 = recorded pacing")
+    parser.add_argument("--concurrency", type=int, default=1, help="turns in flight at once")
+    parser.add_argument("--live-tools", action="store_true", help="call the real MCP tools instead of recorded results")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    replayer = ConversationReplayer(args.path, args.speed, args.concurrency, args.live_tools)
+    report = asyncio.run(replayer.run())
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import time
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+
+from app.graph.mcp_client import mcp_client
+from app.intent.hf_client import HFModelClient
+from app.intent.language import language_id
+
+logger = logging.getLogger("app.warmup")
+
+
+async def _timed(name: str, coro, report: Dict[str, Any]):
+    started = time.perf_counter()
+    try:
+        await coro
+        report[name] = {"ok": True, "ms": round((time.perf_counter() - started) * 1000, 1)}
+    except Exception as e:
+        report[name] = {"ok": False, "ms": round((time.perf_counter() - started) * 1000, 1), "error": str(e)}
+        logger.warning(f"[WARMUP] {name} failed: {e}")
+
+
+async def _warm_mcp():
+    await mcp_client.start()
+    await mcp_client.list_tools()
+
+
+async def warm_up(hf_client: Optional[HFModelClient] = None) -> Dict[str, Any]:
+    """
+    Pay every first-request cost up front, in parallel:
+    MCP transport + initialize + tool listing, language n-gram profiles, TLS to the HF router.
+    Returns a per-component report ({"ok", "ms", "error"?}).
+    """
+    report: Dict[str, Any] = {}
+    steps = [
+        _timed("mcp", _warm_mcp(), report),
+        _timed("language", asyncio.to_thread(language_id.warm), report),
+    ]
+    if hf_client is not None:
+        steps.append(_timed("hf_tls", asyncio.to_thread(hf_client.warm), report))
+
+    started = time.perf_counter()
+    await asyncio.gather(*steps)
+    report["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"[WARMUP] Completed: {report}")
+    return report
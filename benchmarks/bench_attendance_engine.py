@@ -0,0 +1,103 @@
+"""
+Attendance engine throughput on a month of raw clock events.
+
+Generates clock-in/out events for N employees over one month (2 per working day,
+~3% absences, ~7% late arrivals), streams them into AttendanceEngine in batches,
+evaluates the month and times per-employee queries. A per-event Python dict
+baseline runs on the same events for comparison.
+
+    python -m benchmarks.bench_attendance_engine --employees 50000 --batch 500000
+"""
+import time
+import argparse
+import datetime
+import statistics
+
+import numpy as np
+
+from mcp_server.engines.attendance import AttendanceEngine, DEFAULT_SHIFT
+
+
+def synthetic_events(employees: int, period: str, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    month = np.datetime64(period, "M")
+    days = np.arange(month.astype("datetime64[D]"), (month + 1).astype("datetime64[D]"))
+    days = days[np.is_busday(days)]
+
+    emp = np.repeat(np.arange(employees), len(days))
+    day = np.tile(days, employees)
+    present = rng.random(emp.size) >= 0.03
+    late = rng.random(emp.size) < 0.07
+    clock_in = np.where(late, rng.integers(9 * 60 + 16, 12 * 60, emp.size), rng.integers(8 * 60, 9 * 60 + 10, emp.size))
+    clock_out = rng.integers(17 * 60 + 30, 20 * 60, emp.size)
+
+    emp, day, clock_in, clock_out = emp[present], day[present], clock_in[present], clock_out[present]
+    ids = np.char.add("E-", np.char.zfill(emp.astype(str), 6))
+    ts = np.concatenate([day + clock_in.astype("timedelta64[m]"), day + clock_out.astype("timedelta64[m]")])
+    kinds = np.concatenate([np.full(emp.size, "in"), np.full(emp.size, "out")])
+    ids = np.concatenate([ids, ids])
+    order = np.argsort(ts, kind="stable")                  # logs arrive in time order
+    return ids[order], ts[order], kinds[order]
+
+
+def python_baseline(ids, ts, kinds):
+    """Per-event dict fold + per-day classification, the straightforward way."""
+    first_in, last_out = {}, {}
+    for eid, t, kind in zip(ids.tolist(), ts.tolist(), kinds.tolist()):
+        key = (eid, t.date())
+        minute = t.hour * 60 + t.minute
+        if kind == "in":
+            if minute < first_in.get(key, 10 ** 9):
+                first_in[key] = minute
+        elif minute > last_out.get(key, -1):
+            last_out[key] = minute
+    limit = DEFAULT_SHIFT.start_minute + DEFAULT_SHIFT.grace_minutes
+    return {key: ("late" if minute > limit else "present") for key, minute in first_in.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--period", default="2025-08")
+    parser.add_argument("--batch", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--baseline-employees", type=int, default=5_000)
+    args = parser.parse_args()
+
+    ids, ts, kinds = synthetic_events(args.employees, args.period)
+    print(f"{ts.size:,} events for {args.employees:,} employees in {args.period}")
+
+    engine = AttendanceEngine()
+    started = time.perf_counter()
+    for i in range(0, ts.size, args.batch):
+        engine.ingest(ids[i:i + args.batch], ts[i:i + args.batch], kinds[i:i + args.batch])
+    ingest_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    engine.evaluate(args.period, as_of=datetime.date(2100, 1, 1))
+    evaluate_s = time.perf_counter() - started
+
+    rng = np.random.default_rng(5)
+    sample = rng.choice(np.unique(ids), args.queries).tolist()
+    timings = []
+    for eid in sample:
+        t0 = time.perf_counter()
+        engine.anomalies(eid, args.period)
+        engine.counts(eid, args.period)
+        timings.append(time.perf_counter() - t0)
+
+    print(f"engine  ingest {ingest_s:6.2f}s ({ts.size / ingest_s:,.0f} events/s)   evaluate {evaluate_s * 1000:6.0f} ms   "
+          f"check+summary p50 {statistics.median(timings) * 1e6:5.1f} µs")
+
+    n = min(args.baseline_employees, args.employees)
+    subset = np.isin(ids, np.unique(ids)[:n])
+    started = time.perf_counter()
+    python_baseline(ids[subset], ts[subset].astype("datetime64[m]").astype(datetime.datetime), kinds[subset])
+    baseline_s = time.perf_counter() - started
+    rate = subset.sum() / baseline_s
+    print(f"python  per-event loop on {n:,} employees: {rate:,.0f} events/s "
+          f"(≈{ts.size / rate:.1f}s for the full month)")
+
+
+if __name__ == "__main__":
+    main()
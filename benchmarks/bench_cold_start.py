@@ -0,0 +1,78 @@
+"""
+Cold-start cost of the API process, each sample measured in a fresh interpreter:
+  - import_ms:   `import app.main`
+  - warmup_*:    lifespan warm-up (total + per component: MCP, language profiles, HF TLS)
+  - first_*_ms:  first list_tools() + first language detection, with and without warm-up
+
+    python -m benchmarks.bench_cold_start --runs 3
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+
+def child(warm: bool):
+    import asyncio
+
+    started = time.perf_counter()
+    import app.main as main
+    out = {"import_ms": (time.perf_counter() - started) * 1000}
+
+    async def run():
+        async with main.app.router.lifespan_context(main.app) if warm else _nullcontext():
+            if warm:
+                for name, rec in main.warmup_report.items():
+                    out[f"warmup_{name}"] = rec if name == "total_ms" else rec["ms"]
+            t = time.perf_counter()
+            await main.mcp_client.list_tools()
+            out["first_list_tools_ms"] = (time.perf_counter() - t) * 1000
+
+            from app.intent.language import language_id
+            t = time.perf_counter()
+            language_id.detect("cek sisa cuti saya dong")
+            out["first_language_ms"] = (time.perf_counter() - t) * 1000
+            if not warm:
+                await main.mcp_client.stop()
+
+    asyncio.run(run())
+    print(json.dumps(out))
+
+
+class _nullcontext:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", choices=["warm", "cold"])
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child == "warm")
+        return
+
+    env = {**os.environ, "HF_TOKEN": os.getenv("HF_TOKEN", "bench")}
+    for mode in ("cold", "warm"):
+        samples = []
+        for _ in range(args.runs):
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_cold_start", "--child", mode],
+                env=env, capture_output=True, text=True, check=True,
+            )
+            samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        print(f"--- {mode} start (median of {args.runs}) ---")
+        for key in samples[0]:
+            print(f"  {key:<22} {statistics.median(s[key] for s in samples):>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
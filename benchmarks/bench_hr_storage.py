@@ -0,0 +1,104 @@
+"""
+Tool latency over the SQLite HR store at organisation scale.
+
+Generates a synthetic dataset (default 50k employees, 12 payroll months, 1 month
+of daily attendance) into a temporary database, then times every read tool for
+random employees: the handler alone and end to end through hr_tools.call_tool
+(validation + worker thread + result building), plus concurrent throughput.
+
+    python -m benchmarks.bench_hr_storage --employees 50000 --calls 2000
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+from mcp_server import hr_tools
+from mcp_server.storage.seed import employee_id, generate_dataset
+from mcp_server.storage.sqlite_repository import SQLiteRepository
+
+READ_TOOLS = {
+    "employee_profile": lambda eid: {"employee_id": eid},
+    "leave_balance": lambda eid: {"employee_id": eid},
+    "leave_status": lambda eid: {"employee_id": eid},
+    "payroll_lookup": lambda eid: {"employee_id": eid, "period": "2025-08"},
+    "payroll_history": lambda eid: {"employee_id": eid, "start_period": "2024-09", "end_period": "2025-08"},
+    "deduction_reason": lambda eid: {"employee_id": eid, "period": "2025-06"},
+    "attendance_check": lambda eid: {"employee_id": eid, "period": "2025-08"},
+    "attendance_summary": lambda eid: {"employee_id": eid, "start_period": "2025-08"},
+    "benefit_summary": lambda eid: {"employee_id": eid},
+}
+
+
+def pct(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6
+
+
+async def bench(employees: int, calls: int, concurrency: int):
+    rng = random.Random(1)
+    ids = [employee_id(rng.randint(1, employees)) for _ in range(calls)]
+
+    print(f"{'tool':>20} {'handler p50':>12} {'p99':>8} {'call_tool p50':>14} {'p99':>8}  (µs)")
+    for name, make_args in READ_TOOLS.items():
+        entry = hr_tools.DISPATCH[name]
+        direct, end_to_end = [], []
+        for eid in ids:
+            args = make_args(eid)
+            inp = entry.adapter.validate_python(args)
+            started = time.perf_counter()
+            entry.handler(inp)
+            direct.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await hr_tools.call_tool(name, args)
+            end_to_end.append(time.perf_counter() - started)
+        print(f"{name:>20} {pct(direct, .5):>12.0f} {pct(direct, .99):>8.0f} "
+              f"{pct(end_to_end, .5):>14.0f} {pct(end_to_end, .99):>8.0f}")
+
+    names = list(READ_TOOLS)
+    done = 0
+
+    async def worker(offset: int):
+        nonlocal done
+        for i in range(offset, calls, concurrency):
+            name = names[i % len(names)]
+            await hr_tools.call_tool(name, READ_TOOLS[name](ids[i]))
+            done += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    print(f"\nmixed tools, concurrency={concurrency}: {done / elapsed:,.0f} calls/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--payroll-months", type=int, default=12)
+    parser.add_argument("--attendance-months", type=int, default=1)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = SQLiteRepository(path=os.path.join(tmp, "hr.sqlite"))
+        started = time.perf_counter()
+        counts = generate_dataset(repo, args.employees, args.payroll_months, args.attendance_months)
+        elapsed = time.perf_counter() - started
+        rows = sum(counts.values())
+        print(f"generated {rows:,} rows for {args.employees:,} employees in {elapsed:.1f}s "
+              f"({rows / elapsed:,.0f} rows/s)\n")
+
+        hr_tools.services._repo = repo
+        try:
+            asyncio.run(bench(args.employees, args.calls, args.concurrency))
+        finally:
+            repo.close()
+
+
+if __name__ == "__main__":
+    main()
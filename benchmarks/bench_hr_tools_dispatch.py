@@ -0,0 +1,74 @@
+"""
+Server-side dispatch microbenchmark: calls/s of hr_tools.call_tool and list_tools,
+against the previous per-call path (hasattr lookup, input_cls(**args),
+json.dumps(model_dump()), model_json_schema() on every tools/list).
+Both run against an in-memory demo store, with handlers on a worker thread.
+The new path returns structuredContent only (MCP_TEXT_FALLBACK off), so part of
+the gap is the JSON text copy it no longer builds, not faster serialisation.
+
+    python -m benchmarks.bench_hr_tools_dispatch --calls 20000
+"""
+import json
+import time
+import asyncio
+import logging
+import argparse
+
+import anyio
+import mcp.types as types
+
+from mcp_server import hr_tools
+from mcp_server.storage.repository import open_repository
+
+CALLS = [
+    ("leave_balance", {"employee_id": "E-001"}),
+    ("payroll_lookup", {"employee_id": "E-001", "period": "2025-07"}),
+    ("deduction_reason", {"employee_id": "E-001", "period": "2025-07"}),
+]
+
+
+async def legacy_call_tool(name, arguments):
+    if not hasattr(hr_tools.services, name):
+        raise ValueError(f"Unknown tool: {name}")
+    inp = hr_tools.MODEL_MAP[name](**arguments)
+    result = await anyio.to_thread.run_sync(getattr(hr_tools.services, name), inp)
+    payload = result.model_dump(mode="json") if hasattr(result, "model_dump") else result
+    return [types.TextContent(type="text", text=json.dumps(payload))]
+
+
+async def legacy_list_tools():
+    return [
+        types.Tool(name=name, title=name.replace("_", " ").title(),
+                   description=f"{name.replace('_', ' ').capitalize()} tool",
+                   inputSchema=cls.model_json_schema())
+        for name, cls in hr_tools.MODEL_MAP.items()
+    ]
+
+
+async def rate(fn, n: int, *args) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        await fn(*args)
+    return n / (time.perf_counter() - started)
+
+
+async def main(n: int):
+    print(f"{'operation':<28} {'legacy/s':>10} {'dispatch/s':>11} {'speed-up':>9}")
+    for name, args in CALLS:
+        old = await rate(legacy_call_tool, n, name, args)
+        new = await rate(hr_tools.call_tool, n, name, args)
+        print(f"{'call_tool ' + name:<28} {old:>10.0f} {new:>11.0f} {new / old:>8.1f}x")
+    old = await rate(legacy_list_tools, max(1, n // 20))
+    new = await rate(hr_tools.list_tools, max(1, n // 20))
+    print(f"{'list_tools':<28} {old:>10.0f} {new:>11.0f} {new / old:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Tool handlers log every call at INFO; keep the measurement about dispatch.
+    logging.basicConfig(level=logging.WARNING)
+    hr_tools.services._repo = open_repository(path=":memory:")
+    asyncio.run(main(args.calls))
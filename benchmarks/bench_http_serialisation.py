@@ -0,0 +1,105 @@
+"""
+/chat response serialisation CPU at realistic session history sizes.
+
+Builds a /chat result whose `history` holds N turns (messages, intents, tool calls
+with payroll/leave results, each with its state snapshot), then times per response:
+
+  - response_model path: ChatResponse(**result), re-validation and dump, JSONResponse
+  - FastJSONResponse(result) as /chat now returns it
+  - gzip / brotli (when installed) of the rendered body
+
+    python -m benchmarks.bench_http_serialisation --turns 10 50 200
+"""
+import time
+import uuid
+import argparse
+import datetime
+import statistics
+
+from fastapi.responses import JSONResponse
+
+from app.main import ChatResponse
+from app.responses import FastJSONResponse, brotli, compress, orjson
+
+
+def state_snapshot(i: int):
+    return {
+        "active_intent": "payroll_lookup", "status": "completed", "last_completed": True,
+        "pending_args": [], "provided_args": {"employee_id": "E-001", "period": f"2025-{i % 12 + 1:02d}"},
+        "context_stack": [], "last_intent_type": "tool", "last_user_action": "ask",
+        "timestamp": datetime.datetime(2025, 9, 1, 8, i % 60).isoformat(),
+    }
+
+
+def tool_result(i: int):
+    return {
+        "employee_id": "E-001", "period": f"2025-{i % 12 + 1:02d}", "net_pay": 21_500_000.0 + i,
+        "items": [{"code": c, "label": c.replace("_", " ").title(), "amount": 1_000_000.0 * (k + 1)}
+                  for k, c in enumerate(("base_salary", "allowance", "overtime", "bpjs", "income_tax", "unpaid_leave"))],
+    }
+
+
+def build_result(turns: int):
+    history = {"session_id": "bench", "created_at": "2025-09-01T08:00:00", "messages": [], "intents": [],
+               "tool_calls": [], "clarifications": [], "jobs": {}, "state": state_snapshot(0)}
+    now = "2025-09-01T08:00:00"
+    for i in range(turns):
+        for role, content in (("user", f"berapa gaji saya bulan {i % 12 + 1}?"),
+                              ("assistant", "Gaji bersih Anda bulan ini adalah Rp21.500.000, dengan rincian tunjangan dan potongan. " * 2)):
+            history["messages"].append({"id": str(uuid.uuid4()), "time": now, "role": role, "content": content,
+                                        "state": state_snapshot(i)})
+        history["intents"].append({"id": str(uuid.uuid4()), "time": now, "state": state_snapshot(i),
+                                   "intents": [{"tool": "payroll_lookup", "args": {"employee_id": "E-001"}, "confidence": 0.93}]})
+        history["tool_calls"].append({"id": str(uuid.uuid4()), "time": now, "tool": "payroll_lookup",
+                                      "args": {"employee_id": "E-001"}, "result": tool_result(i), "state": state_snapshot(i)})
+    last = history["tool_calls"][-1]
+    return {
+        "trace_id": str(uuid.uuid4()), "session_id": "bench", "user_message": "berapa gaji saya?",
+        "intents": [{"tool": "payroll_lookup", "args": {"employee_id": "E-001"}}], "validations": {},
+        "results": {"payroll_lookup": last["result"]}, "clarifications": [],
+        "assistant_response": history["messages"][-1]["content"], "history": history,
+    }
+
+
+def validated(result):
+    # What FastAPI does for `return ChatResponse(**result)` under response_model=ChatResponse
+    model = ChatResponse.model_validate(ChatResponse(**result).model_dump())
+    return JSONResponse(model.model_dump(mode="json")).body
+
+
+def fast(result):
+    return FastJSONResponse({field: result.get(field) for field in ChatResponse.model_fields}).body
+
+
+def timed(fn, arg, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson else 'json'}, brotli: {'yes' if brotli else 'not installed'}")
+    for turns in args.turns:
+        result = build_result(turns)
+        body = fast(result)
+        line = (f"{turns:>4} turns  {len(body) / 1024:7.1f} KiB  "
+                f"response_model {timed(validated, result, args.repeat):7.2f} ms  "
+                f"FastJSONResponse {timed(fast, result, args.repeat):6.2f} ms  "
+                f"gzip {timed(lambda b: compress(b, 'gzip'), body, args.repeat):6.2f} ms "
+                f"({len(compress(body, 'gzip')) / len(body):.0%})")
+        if brotli is not None:
+            line += (f"  br {timed(lambda b: compress(b, 'br'), body, args.repeat):6.2f} ms "
+                     f"({len(compress(body, 'br')) / len(body):.0%})")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
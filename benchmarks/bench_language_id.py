@@ -0,0 +1,106 @@
+"""
+Accuracy and throughput of language identification on labelled HR chat messages
+(Indonesian incl. slang, English), for app.intent.language and, when installed, langdetect.
+
+  - accuracy:  share of messages identified correctly (langdetect: anything but "id" counts as "en")
+  - first_ms:  first call in this process (profile loading)
+  - µs/msg:    median per message afterwards
+
+    python -m benchmarks.bench_language_id --repeat 200
+"""
+import time
+import argparse
+import statistics
+
+from app.intent.language import LanguageIdentifier
+
+try:
+    import langdetect
+except ImportError:  # optional baseline
+    langdetect = None
+
+SAMPLES = [
+    ("ajuin cuti donk", "id"),
+    ("cek gaji saya donk, terus sisa jumlah cuti saya berapa ya", "id"),
+    ("sisa cuti gw brp", "id"),
+    ("gaji bulan lalu udah masuk belum sih", "id"),
+    ("mau cuti sakit besok", "id"),
+    ("tolong batalin cuti yg kemarin", "id"),
+    ("ajukan cuti tahunan untuk minggu depan", "id"),
+    ("ajuin cuti E-002 tanggal 2025-09-01 sampai 2025-09-03", "id"),
+    ("slip gaji september dong", "id"),
+    ("berapa jam lembur saya bulan ini", "id"),
+    ("status pengajuan cuti saya gimana", "id"),
+    ("absen saya minggu ini ada telat ga", "id"),
+    ("halo selamat siang", "id"),
+    ("makasih ya", "id"),
+    ("tanggal 10 sampai 12", "id"),
+    ("aturan cuti melahirkan apa aja", "id"),
+    ("riwayat payroll 3 bulan terakhir", "id"),
+    ("karyawan E-001 kehadirannya gimana", "id"),
+    ("saya mau tanya soal tunjangan transport", "id"),
+    ("bisa tolong cek saldo cuti tim saya", "id"),
+    ("check my salary please", "en"),
+    ("how many leave days do i have", "en"),
+    ("request annual leave from 1 to 3 september", "en"),
+    ("what's my payslip for last month", "en"),
+    ("cancel my leave request", "en"),
+    ("i need sick leave tomorrow", "en"),
+    ("show attendance for E-002 this week", "en"),
+    ("hello, good afternoon", "en"),
+    ("thanks a lot", "en"),
+    ("what is the maternity leave policy", "en"),
+    ("how much overtime did i work in august", "en"),
+    ("payroll history for the last 3 months", "en"),
+    ("is my leave approved yet?", "en"),
+    ("pls check remaining leave balance", "en"),
+    ("submit unpaid leave for next friday", "en"),
+    ("when do we get paid this month", "en"),
+    ("could you summarise my team's attendance", "en"),
+    ("any late check-ins for me last week?", "en"),
+    ("leave status", "en"),
+    ("my net salary in july", "en"),
+]
+
+
+def run(name, detect, repeat):
+    started = time.perf_counter()
+    detect(SAMPLES[0][0])
+    first_ms = (time.perf_counter() - started) * 1000
+
+    correct = sum(detect(text) == lang for text, lang in SAMPLES)
+    misses = [text for text, lang in SAMPLES if detect(text) != lang]
+
+    timings = []
+    for _ in range(repeat):
+        for text, _ in SAMPLES:
+            t = time.perf_counter()
+            detect(text)
+            timings.append(time.perf_counter() - t)
+    print(f"{name:>12} {correct / len(SAMPLES):>9.2f} {first_ms:>9.1f} {statistics.median(timings) * 1e6:>8.1f}")
+    for text in misses:
+        print(f"{'':>12}   miss: {text!r}")
+
+
+def _langdetect(text):
+    try:
+        return "id" if langdetect.detect(text) == "id" else "en"
+    except Exception:
+        return "en"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'detector':>12} {'accuracy':>9} {'first_ms':>9} {'µs/msg':>8}   ({len(SAMPLES)} messages)")
+    run("ngram", LanguageIdentifier().detect, args.repeat)
+    if langdetect is not None:
+        run("langdetect", _langdetect, max(1, args.repeat // 20))
+    else:
+        print(f"{'langdetect':>12}   not installed")
+
+
+if __name__ == "__main__":
+    main()
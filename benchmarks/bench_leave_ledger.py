@@ -0,0 +1,95 @@
+"""
+Leave overlap checks and balances: interval-indexed LeaveLedger vs. SQL.
+
+Generates N requests per employee (non-overlapping, spread over a few years), then
+times random overlap probes + balance reads against the ledger and against the
+equivalent indexed SQL queries, and checks both agree on overlaps.
+
+    python -m benchmarks.bench_leave_ledger --employees 50000 --requests 12
+"""
+import os
+import time
+import random
+import argparse
+import datetime
+import tempfile
+import statistics
+
+from mcp_server.engines.leave_ledger import LeaveLedger
+from mcp_server.storage.seed import HOLIDAYS_2025, employee_id
+from mcp_server.storage.sqlite_repository import SQLiteRepository
+
+OVERLAP_SQL = ("SELECT request_id FROM leave_requests WHERE employee_id = ? AND status NOT IN ('cancelled', 'rejected') "
+               "AND start_date <= ? AND end_date >= ? LIMIT 1")
+BALANCE_SQL = ("SELECT leave_type, SUM(julianday(end_date) - julianday(start_date) + 1) FROM leave_requests "
+               "WHERE employee_id = ? AND status NOT IN ('cancelled', 'rejected') GROUP BY leave_type")
+
+
+def median_us(samples):
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=12, help="leave requests per employee")
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    first = datetime.date(2022, 1, 3)
+    requests, entitlements = [], []
+    for e in range(1, args.employees + 1):
+        eid, day = employee_id(e), first
+        entitlements += [(eid, "annual", 10_000), (eid, "sick", 10_000)]
+        for r in range(args.requests):
+            day += datetime.timedelta(days=rng.randint(3, 40))
+            end = day + datetime.timedelta(days=rng.randint(0, 4))
+            requests.append((f"{eid}-{r}", eid, day.isoformat(), end.isoformat(),
+                             rng.choice(("annual", "sick")), "approved", None))
+            day = end + datetime.timedelta(days=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = SQLiteRepository(path=os.path.join(tmp, "hr.sqlite"))
+        repo.bulk_insert("leave_requests", requests)
+        repo.bulk_insert("leave_entitlements", entitlements)
+        repo.bulk_insert("holidays", HOLIDAYS_2025)
+
+        started = time.perf_counter()
+        ledger = LeaveLedger.from_repo(repo)
+        load_s = time.perf_counter() - started
+
+        conn = repo._open(repo._read_uri)
+        sql_t, ledger_t = [], []
+        for _ in range(args.queries):
+            eid = employee_id(rng.randint(1, args.employees))
+            start = first + datetime.timedelta(days=rng.randint(0, 365 * 4))
+            end = start + datetime.timedelta(days=rng.randint(0, 5))
+            t0 = time.perf_counter()
+            hit = conn.execute(OVERLAP_SQL, (eid, end.isoformat(), start.isoformat())).fetchone()
+            conn.execute(BALANCE_SQL, (eid,)).fetchall()
+            t1 = time.perf_counter()
+            conflict = ledger.overlapping(eid, start, end)
+            ledger.remaining(eid)
+            t2 = time.perf_counter()
+            assert (hit is None) == (conflict is None)
+            sql_t.append(t1 - t0)
+            ledger_t.append(t2 - t1)
+        conn.close()
+
+        submit_t = []
+        for i in range(args.queries):
+            eid = employee_id(rng.randint(1, args.employees))
+            start = datetime.date(2030, 1, 1) + datetime.timedelta(days=i % 300)
+            t0 = time.perf_counter()
+            ledger.submit(f"bench-{i}", eid, start, start + datetime.timedelta(days=2), "annual")
+            submit_t.append(time.perf_counter() - t0)
+        repo.close()
+
+    print(f"{len(requests):,} requests for {args.employees:,} employees: ledger loaded in {load_s:.2f}s")
+    print(f"overlap check + balance  SQL {median_us(sql_t):6.1f} µs   ledger {median_us(ledger_t):5.1f} µs")
+    print(f"submit (check + working days + insert, no store write): {median_us(submit_t):.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
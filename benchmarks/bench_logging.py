@@ -0,0 +1,115 @@
+"""
+Time the request path spends logging, per request, for the hot-path log calls of one
+chat turn (composed prompt, detected intents, tool args, execution results, reply):
+
+  - eager:      plain `logging` with f-strings and a synchronous file handler (before)
+  - pipeline:   app.logs structured logger: lazy fields, clipped payloads, queue + writer thread
+
+each at INFO (what production runs) and WARNING (logging mostly off). Only time on the
+calling thread is counted; the pipeline's writer thread is flushed outside the timings.
+Requests run back to back, so the pipeline's p95 includes GIL hand-offs to a writer
+thread that is never idle; real traffic leaves it gaps.
+
+    python -m benchmarks.bench_logging --requests 500 --history 24 --records 200
+"""
+import os
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+
+from app.logs import configure_logging, get_logger, shutdown_logging
+
+
+def payloads(history: int, records: int):
+    prompt = "Tools:\n" + "\n".join(f"- tool_{i}: look up HR data for an employee and period {i}" for i in range(120))
+    results = {
+        "payroll_history": {"result": {
+            "employee_id": "E-001",
+            "history": [{"period": f"20{24 + m // 12}-{m % 12 + 1:02d}", "gross_pay": 25000000.0, "net_pay": 23000000.0,
+                         "tax": 1500000.0, "bpjs": 500000.0, "allowances": {"transport": 750000, "meal": 500000}}
+                        for m in range(history)],
+            "total_count": history, "next_cursor": None}},
+        "leave_status": {"result": {
+            "employee_id": "E-001",
+            "records": [{"request_id": f"0000000{i:04d}-aaaa-bbbb-cccc-dddddddddddd", "type": "annual",
+                         "start": "2025-09-01", "end": "2025-09-03", "status": "approved"} for i in range(records)],
+            "total_count": records, "next_cursor": None}},
+    }
+    intents = [{"name": "payroll_history", "confidence": 0.93, "args": {"employee_id": "E-001"}},
+               {"name": "leave_status", "confidence": 0.88, "args": {"employee_id": "E-001"}}]
+    return prompt, results, intents, "Gaji bersih Anda 23.000.000 per bulan. " * 5
+
+
+def eager_request(log, trace_id, prompt, results, intents, reply):
+    log.debug(f"[HF-DETECTOR] Final composed prompt=\n{prompt}")
+    log.info(f"[HF-DETECTOR] detected intents={intents}")
+    log.info(f"[TRACE:{trace_id}] Detected intents={intents}, prev_state={{'status': 'idle'}}")
+    for intent in intents:
+        log.info(f"[MCP-CLIENT] Calling tool '{intent['name']}' with args={intent['args']} via inprocess")
+    log.info(f"[TRACE:{trace_id}] Execution results={results}")
+    log.info(f"[TRACE:{trace_id}] Assistant response={reply}")
+
+
+def pipeline_request(log, trace_id, prompt, results, intents, reply):
+    log.debug("[HF-DETECTOR] Final composed prompt", prompt=prompt)
+    log.info("[HF-DETECTOR] Detected intents", intents=intents)
+    log.info(f"[TRACE:{trace_id}] Detected intents", intents=intents, prev_state={"status": "idle"})
+    for intent in intents:
+        log.info(f"[MCP-CLIENT] Calling tool '{intent['name']}' via inprocess", args=intent["args"])
+    log.info(f"[TRACE:{trace_id}] Execution results", results=results)
+    log.info(f"[TRACE:{trace_id}] Assistant response", response=reply)
+
+
+def measure(fn, log, n, data):
+    timings = []
+    for i in range(n):
+        started = time.perf_counter()
+        fn(log, f"trace-{i}", *data)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return statistics.median(timings) * 1e6, timings[int(len(timings) * 0.95)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--history", type=int, default=24, help="payroll periods in the logged result")
+    parser.add_argument("--records", type=int, default=200, help="leave records in the logged result")
+    args = parser.parse_args()
+    data = payloads(args.history, args.records)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        eager_out = open(os.path.join(tmp, "eager.log"), "w")
+        pipeline_out = open(os.path.join(tmp, "pipeline.log"), "w")
+
+        eager = logging.getLogger("bench.eager")
+        eager.propagate = False
+        handler = logging.StreamHandler(eager_out)
+        handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s"))
+        eager.addHandler(handler)
+
+        configure_logging(stream=pipeline_out)
+        pipeline = get_logger("bench.pipeline")
+
+        print(f"{'mode':>9} {'level':>8} {'median µs':>10} {'p95 µs':>9}")
+        for level in (logging.INFO, logging.WARNING):
+            eager.setLevel(level)
+            logging.getLogger().setLevel(level)
+            for name, fn, log in (("eager", eager_request, eager), ("pipeline", pipeline_request, pipeline)):
+                measure(fn, log, 20, data)     # warm up
+                median, p95 = measure(fn, log, args.requests, data)
+                print(f"{name:>9} {logging.getLevelName(level):>8} {median:>10.1f} {p95:>9.1f}")
+
+        shutdown_logging()
+        eager_out.flush()
+        pipeline_out.flush()
+        print(f"log volume: eager {os.path.getsize(eager_out.name) / 1e6:.1f} MB, "
+              f"pipeline {os.path.getsize(pipeline_out.name) / 1e6:.1f} MB")
+        eager_out.close()
+        pipeline_out.close()
+
+
+if __name__ == "__main__":
+    main()
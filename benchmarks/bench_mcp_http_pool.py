@@ -0,0 +1,90 @@
+"""
+Throughput of MCPToolClient against a pool of local streamable-HTTP tool servers.
+
+Spawns `python -m mcp_server.server http` on consecutive ports, then drives
+concurrent tool calls through one client for each pool size 1..N.
+
+    python -m benchmarks.bench_mcp_http_pool --servers 4 --concurrency 32 --seconds 5
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import logging
+import argparse
+import subprocess
+
+from app.graph.mcp_client import MCPToolClient
+
+CALL = ("leave_balance", {"employee_id": "E-001"})
+
+
+def spawn_servers(n: int, base_port: int):
+    procs = []
+    for i in range(n):
+        env = {**os.environ, "MCP_PORT": str(base_port + i), "MCP_HOST": "127.0.0.1"}
+        procs.append(subprocess.Popen(
+            [sys.executable, "-m", "mcp_server.server", "http"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        ))
+    for i in range(n):
+        deadline = time.time() + 15
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", base_port + i), timeout=0.2).close()
+                break
+            except OSError:
+                if time.time() > deadline:
+                    raise RuntimeError(f"tool server on port {base_port + i} did not start")
+                time.sleep(0.1)
+    return procs
+
+
+async def drive(endpoints, concurrency: int, seconds: float) -> float:
+    client = MCPToolClient(mode="http", endpoints=endpoints)
+    await client.start()
+    for _ in range(10):
+        await client.call(*CALL)
+
+    done = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            await client.call(*CALL)
+            done += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await client.stop()
+    return done / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--servers", type=int, default=4)
+    parser.add_argument("--base-port", type=int, default=8301)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    procs = spawn_servers(args.servers, args.base_port)
+    try:
+        print(f"{'servers':>7} {'calls/s':>9}")
+        for n in range(1, args.servers + 1):
+            endpoints = [f"http://127.0.0.1:{args.base_port + i}/mcp" for i in range(n)]
+            rate = asyncio.run(drive(endpoints, args.concurrency, args.seconds))
+            print(f"{n:>7} {rate:>9.0f}")
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Per-call overhead of MCPToolClient transports (stdio subprocess vs in-process).
+
+    python -m benchmarks.bench_mcp_transport --calls 2000
+"""
+import time
+import asyncio
+import logging
+import argparse
+import statistics
+
+from app.graph.mcp_client import MCPToolClient
+
+CALL = ("leave_balance", {"employee_id": "E-001"})
+
+
+async def bench_mode(mode: str, calls: int, warmup: int):
+    client = MCPToolClient(mode=mode)
+
+    started = time.perf_counter()
+    await client.start()
+    startup = time.perf_counter() - started
+
+    for _ in range(warmup):
+        await client.call(*CALL)
+
+    samples = []
+    for _ in range(calls):
+        t = time.perf_counter()
+        await client.call(*CALL)
+        samples.append(time.perf_counter() - t)
+
+    await client.stop()
+    samples.sort()
+    return {
+        "mode": mode,
+        "startup_ms": startup * 1000,
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+        "calls_per_s": len(samples) / sum(samples),
+    }
+
+
+async def main(modes, calls: int, warmup: int):
+    rows = [await bench_mode(m, calls, warmup) for m in modes]
+    print(f"{'mode':<10} {'startup ms':>11} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'calls/s':>9}")
+    for r in rows:
+        print(f"{r['mode']:<10} {r['startup_ms']:>11.1f} {r['mean_us']:>9.1f} {r['p50_us']:>9.1f} "
+              f"{r['p99_us']:>9.1f} {r['calls_per_s']:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", default=list(MCPToolClient.MODES))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(args.modes, args.calls, args.warmup))
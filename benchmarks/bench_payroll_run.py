@@ -0,0 +1,95 @@
+"""
+Whole-organisation payroll run: vectorised PayrollEngine vs. a per-employee loop.
+
+Generates N employees with compensation and ~8% unpaid leave in the period,
+then runs payroll for the period (compute + itemised payslip write) and a
+straightforward per-employee Python computation of the same figures.
+
+    python -m benchmarks.bench_payroll_run --employees 50000 --period 2025-08
+"""
+import os
+import time
+import argparse
+import datetime
+import tempfile
+from collections import defaultdict
+
+import numpy as np
+
+from mcp_server.engines.payroll import PayrollEngine, compute_payroll
+from mcp_server.storage.seed import HOLIDAYS_2025, generate_dataset
+from mcp_server.storage.sqlite_repository import SQLiteRepository
+
+
+def python_baseline(repo, period: str):
+    """Per-employee loop: walk each leave day by day, then compute the payslip."""
+    holidays = {datetime.date.fromisoformat(d) for d in repo.holidays()}
+    year, month = map(int, period.split("-"))
+    first = datetime.date(year, month, 1)
+    end = datetime.date(year + month // 12, month % 12 + 1, 1)
+
+    def working(day):
+        return day.weekday() < 5 and day not in holidays
+
+    working_days = sum(working(first + datetime.timedelta(days=i)) for i in range((end - first).days))
+    unpaid = defaultdict(int)
+    for eid, start, stop in repo.leave_overlapping(str(first), str(end - datetime.timedelta(days=1)), "unpaid"):
+        day = max(datetime.date.fromisoformat(start), first)
+        last = min(datetime.date.fromisoformat(stop), end - datetime.timedelta(days=1))
+        while day <= last:
+            unpaid[eid] += working(day)
+            day += datetime.timedelta(days=1)
+
+    payslips = {}
+    for eid, basic, allowance in repo.compensation():
+        deduction = round(basic / working_days * min(unpaid[eid], working_days), 2)
+        payslips[eid] = basic + allowance - deduction
+    return payslips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--period", default="2025-08")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = SQLiteRepository(path=os.path.join(tmp, "hr.sqlite"))
+        generate_dataset(repo, args.employees, payroll_months=0, attendance_months=0, last_period=args.period)
+        repo.bulk_insert("holidays", HOLIDAYS_2025)
+        engine = PayrollEngine(repo)
+
+        started = time.perf_counter()
+        result = engine.compute(args.period)
+        compute_s = time.perf_counter() - started
+
+        comp = repo.compensation()
+        leaves = repo.leave_overlapping(f"{args.period}-01", f"{args.period}-31", "unpaid")
+        holidays = repo.holidays()
+        started = time.perf_counter()
+        compute_payroll(args.period, *zip(*comp), *zip(*leaves), holidays)
+        kernel_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        engine.run(args.period)
+        run_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        baseline = python_baseline(repo, args.period)
+        baseline_s = time.perf_counter() - started
+
+        expected = np.array([baseline[eid] for eid in result.employee_ids.tolist()])
+        assert np.allclose(expected, result.net), "engine and baseline disagree"
+        repo.close()
+
+    n = len(result.employee_ids)
+    print(f"{n:,} employees, {int((result.unpaid_days > 0).sum()):,} with unpaid leave, "
+          f"{result.working_days} working days in {args.period}")
+    print(f"vectorised kernel   {kernel_s * 1000:7.0f} ms")
+    print(f"vectorised compute  {compute_s * 1000:7.0f} ms   (incl. store reads)")
+    print(f"full run + store    {run_s * 1000:7.0f} ms   ({n / run_s:,.0f} payslips/s)")
+    print(f"python loop compute {baseline_s * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Multi-year range queries: prefix-sum PeriodIndex vs. an indexed SQL range scan.
+
+Builds monthly net pay for N employees over M months, then times random
+[start, end] range totals + series both ways, and the cost of closing one more
+period for every employee (incremental prefix-sum update).
+
+    python -m benchmarks.bench_period_index --employees 50000 --months 60
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+from mcp_server.engines.period_index import PeriodIndex, ordinal_period, period_ordinal
+from mcp_server.storage.seed import employee_id
+from mcp_server.storage.sqlite_repository import SQLiteRepository
+
+RANGE_SQL = ("SELECT period, net_pay FROM payslips WHERE employee_id = ? AND period BETWEEN ? AND ? "
+             "ORDER BY period")
+
+
+def median_us(samples):
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    last = period_ordinal("2025-08")
+    periods = [ordinal_period(last - args.months + 1 + i) for i in range(args.months)]
+    rows = [(employee_id(e), p, rng.uniform(5e6, 40e6)) for e in range(1, args.employees + 1) for p in periods]
+
+    started = time.perf_counter()
+    index = PeriodIndex(("net",))
+    index.upsert(rows)
+    build_s = time.perf_counter() - started
+
+    queries = []
+    for _ in range(args.queries):
+        i, j = sorted(rng.sample(range(args.months), 2))
+        queries.append((employee_id(rng.randint(1, args.employees)), periods[i], periods[j]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = SQLiteRepository(path=os.path.join(tmp, "hr.sqlite"))
+        repo.bulk_insert("payslips", ((e, p, v, None) for e, p, v in rows))
+        conn = repo._open(repo._read_uri)
+
+        sql_t, index_t = [], []
+        for eid, start, end in queries:
+            t0 = time.perf_counter()
+            series = conn.execute(RANGE_SQL, (eid, start, end)).fetchall()
+            total = sum(v for _, v in series)
+            avg = total / len(series)
+            t1 = time.perf_counter()
+            r = index.range(eid, start, end)
+            total_ix, avg_ix, view = r.total("net"), r.average("net"), r.series
+            t2 = time.perf_counter()
+            assert abs(total - total_ix) < 1e-3 * len(series) and len(view) == len(series)
+            sql_t.append(t1 - t0)
+            index_t.append(t2 - t1)
+        conn.close()
+        repo.close()
+
+    next_period = ordinal_period(last + 1)
+    close_rows = [(employee_id(e), next_period, rng.uniform(5e6, 40e6)) for e in range(1, args.employees + 1)]
+    started = time.perf_counter()
+    index.upsert(close_rows)
+    close_s = time.perf_counter() - started
+
+    print(f"{args.employees:,} employees × {args.months} months: index built in {build_s:.2f}s")
+    print(f"range total + avg + series  SQL scan {median_us(sql_t):7.1f} µs   prefix index {median_us(index_t):6.1f} µs")
+    print(f"close period {next_period} for all employees: {close_s * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Prompt size, selection latency and recall of top-k tool retrieval as the catalog grows.
+
+The 12 real HR tools (with config/tools_config.json metadata) are padded with
+synthetic HR tools (overtime, reimbursements, training, ...) up to each size.
+Queries are the configured examples, labelled with their tool.
+
+    python -m benchmarks.bench_tool_retrieval --sizes 12 50 200 500 1000
+"""
+import time
+import argparse
+import itertools
+import statistics
+
+import mcp.types as types
+
+from app.prompts import render_intent_prompt
+from app.intent.tool_retriever import ToolRetriever, load_tool_metadata
+from mcp_server.hr_tools import TOOLS
+
+DOMAINS = [
+    ("overtime", "lembur"), ("reimbursement", "klaim reimburse"), ("training", "pelatihan"),
+    ("shift", "jadwal shift"), ("loan", "pinjaman karyawan"), ("travel", "perjalanan dinas"),
+    ("asset", "aset kantor laptop"), ("performance", "penilaian kinerja"), ("recruitment", "rekrutmen"),
+    ("expense", "pengeluaran"), ("insurance_claim", "klaim asuransi"), ("bonus", "bonus tahunan"),
+    ("tax", "pajak pph21"), ("pension", "dana pensiun"), ("onboarding", "karyawan baru"),
+    ("offboarding", "resign"), ("parking", "parkir"), ("meal", "uang makan"),
+    ("uniform", "seragam"), ("referral", "referensi kandidat"),
+]
+ACTIONS = [
+    ("submit", "ajukan"), ("status", "status pengajuan"), ("history", "riwayat"),
+    ("cancel", "batalkan"), ("approve", "setujui"), ("summary", "ringkasan"),
+    ("export", "unduh laporan"), ("policy", "aturan"), ("balance", "sisa kuota"), ("update", "ubah"),
+]
+SCOPES = [("", ""), ("team", "tim saya"), ("department", "departemen"), ("company", "seluruh perusahaan"),
+          ("branch", "cabang"), ("contract", "karyawan kontrak")]
+
+
+def synthetic_catalog(size: int):
+    tools = list(TOOLS)
+    metadata = load_tool_metadata()
+    for (d_en, d_id), (a_en, a_id), (s_en, s_id) in itertools.product(DOMAINS, ACTIONS, SCOPES):
+        if len(tools) >= size:
+            break
+        name = "_".join(p for p in (d_en, a_en, s_en) if p)
+        tools.append(types.Tool(
+            name=name,
+            description=f"{a_en.capitalize()} {d_en.replace('_', ' ')} {s_en}".strip(),
+            inputSchema={"type": "object", "properties": {"employee_id": {"type": "string"}},
+                         "required": ["employee_id"]},
+        ))
+        metadata[name] = {
+            "examples": [f"{a_id} {d_id} {s_id}".strip()],
+            "keywords": [d_id, a_id] + ([s_id] if s_id else []),
+        }
+    return tools, metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[12, 50, 200, 500, 1000])
+    parser.add_argument("--top-k", type=int, default=6)
+    args = parser.parse_args()
+
+    labelled = [(ex, name) for name, meta in load_tool_metadata().items() for ex in meta.get("examples", [])]
+
+    print(f"{'tools':>6} {'full prompt':>12} {'top-k prompt':>13} {'select µs':>10} {'recall@k':>9} {'fallback':>9}")
+    for size in args.sizes:
+        tools, metadata = synthetic_catalog(size)
+        retriever = ToolRetriever(top_k=args.top_k, metadata=metadata)
+        retriever.rank(tools, "warm up index")
+
+        timings, prompt_sizes, hits, fallbacks = [], [], 0, 0
+        for query, expected in labelled:
+            started = time.perf_counter()
+            selected = retriever.select(tools, query)
+            timings.append(time.perf_counter() - started)
+            prompt_sizes.append(len(render_intent_prompt(selected)))
+            hits += any(t.name == expected for t in selected)
+            fallbacks += len(selected) == len(tools) and len(tools) > args.top_k
+
+        print(f"{len(tools):>6} {len(render_intent_prompt(tools)):>12} {statistics.median(prompt_sizes):>13.0f} "
+              f"{statistics.median(timings) * 1e6:>10.0f} {hits / len(labelled):>9.2f} {fallbacks:>9}")
+
+
+if __name__ == "__main__":
+    main()
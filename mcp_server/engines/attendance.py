@@ -0,0 +1,322 @@
+import os
+import time
+import logging
+import datetime
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("mcp.engines.attendance")
+
+PRESENT, LATE, ABSENT, OFF = 0, 1, 2, -1
+STATUS_NAMES = {PRESENT: "present", LATE: "late", ABSENT: "absent"}
+
+_NO_IN = np.iinfo(np.int32).max      # sentinel: no clock-in that day
+_NO_OUT = -1                         # sentinel: no clock-out that day
+
+
+class Shift(NamedTuple):
+    shift_id: str
+    start_minute: int
+    end_minute: int
+    grace_minutes: int = 0
+    weekmask: str = "1111100"
+
+
+DEFAULT_SHIFT = Shift("default", 9 * 60, 18 * 60, 15)
+
+
+def _minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def shift_from_row(row: Dict[str, Any]) -> Shift:
+    return Shift(
+        shift_id=row["shift_id"],
+        start_minute=_minutes(row["start_time"]),
+        end_minute=_minutes(row["end_time"]),
+        grace_minutes=int(row.get("grace_minutes") or 0),
+        weekmask=row.get("weekmask") or "1111100",
+    )
+
+
+class _PeriodClock:
+    """First clock-in / last clock-out minute per (employee row, day of month) for one month."""
+
+    def __init__(self, month: np.datetime64, rows: int):
+        self.month = month
+        self.days = int(((month + 1).astype("datetime64[D]") - month.astype("datetime64[D]")).astype(int))
+        self.first_in = np.full((rows, 31), _NO_IN, dtype=np.int32)
+        self.last_out = np.full((rows, 31), _NO_OUT, dtype=np.int32)
+        self.employees = np.zeros(rows, dtype=bool)     # rows with any event this month
+
+    def grow(self, rows: int):
+        if rows <= len(self.employees):
+            return
+        rows = max(rows, len(self.employees) * 2)
+        first_in = np.full((rows, 31), _NO_IN, dtype=np.int32)
+        last_out = np.full((rows, 31), _NO_OUT, dtype=np.int32)
+        employees = np.zeros(rows, dtype=bool)
+        n = len(self.employees)
+        first_in[:n], last_out[:n], employees[:n] = self.first_in, self.last_out, self.employees
+        self.first_in, self.last_out, self.employees = first_in, last_out, employees
+
+
+class _PeriodResult(NamedTuple):
+    status: np.ndarray      # rows × days int8 (PRESENT/LATE/ABSENT, OFF when not scheduled or in the future)
+    late: np.ndarray        # rows × days int16 minutes late
+    counts: np.ndarray      # rows × 3 (present, late, absent)
+    evaluated: np.ndarray   # rows evaluated (employees with events this month)
+    as_of: datetime.date
+
+
+class AttendanceEngine:
+    """
+    Columnar attendance engine over raw clock-in/out events.
+
+    Events are ingested in batches of NumPy arrays and folded into per-month
+    employees × days matrices of first clock-in / last clock-out (np.minimum.at /
+    np.maximum.at, so re-ingesting an event is harmless). Evaluating a month
+    classifies every scheduled day of every employee against their shift in one
+    vectorised pass and caches the result per (employee, period).
+
+    Only employees with at least one event in a month are evaluated for it; days
+    after `as_of` are not scheduled yet.
+    """
+
+    def __init__(self, shifts: Iterable[Shift] = (), assignments: Optional[Dict[str, str]] = None,
+                 holidays: Sequence[str] = ()):
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._shift_ids: Dict[str, int] = {}
+        self._shifts: List[Shift] = []
+        self._row_shift = np.zeros(0, dtype=np.int16)
+        self._assignments = dict(assignments or {})
+        self._clocks: Dict[str, _PeriodClock] = {}
+        self._results: Dict[str, _PeriodResult] = {}
+        self._dirty: set = set()
+        self._lock = threading.RLock()
+        self.set_calendar(shifts, self._assignments, holidays)
+
+    # ---- Calendar ----
+    def set_calendar(self, shifts: Iterable[Shift], assignments: Dict[str, str], holidays: Sequence[str]):
+        """Shift definitions, employee → shift assignments and public holidays (invalidates results)."""
+        with self._lock:
+            self._shifts = [DEFAULT_SHIFT] + [s for s in shifts if s.shift_id != DEFAULT_SHIFT.shift_id]
+            self._shift_ids = {s.shift_id: i for i, s in enumerate(self._shifts)}
+            self._assignments = dict(assignments)
+            self._holidays = np.array(sorted(holidays), dtype="datetime64[D]")
+            self._row_shift = np.array(
+                [self._shift_ids.get(self._assignments.get(eid, ""), 0) for eid in self._ids], dtype=np.int16
+            )
+            self._dirty.update(self._clocks)
+
+    @staticmethod
+    def _distinct(employee_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distinct ids + inverse mapping. Fixed-width unicode ids are hashed column-wise to
+        uint64 first (sorting integers is much cheaper than sorting strings); the result
+        is verified and falls back to a string sort on a hash collision.
+        """
+        if employee_ids.dtype.kind == "U" and employee_ids.dtype.itemsize:
+            chars = employee_ids.view(np.uint32).reshape(len(employee_ids), -1)
+            h = np.zeros(len(employee_ids), dtype=np.uint64)
+            for col in chars.T:
+                h = h * np.uint64(1_000_003) + col
+            _, first, inverse = np.unique(h, return_index=True, return_inverse=True)
+            uniq = employee_ids[first]
+            if np.array_equal(uniq[inverse], employee_ids):
+                return uniq, inverse
+        return np.unique(employee_ids, return_inverse=True)
+
+    def _row_ids(self, employee_ids: np.ndarray) -> np.ndarray:
+        """Vectorised employee_id → row mapping (the dict is only consulted per distinct id)."""
+        uniq, inverse = self._distinct(employee_ids)
+        rows = np.empty(len(uniq), dtype=np.intp)
+        new_shifts = []
+        for i, eid in enumerate(uniq.tolist()):
+            row = self._rows.get(eid)
+            if row is None:
+                row = self._rows[eid] = len(self._ids)
+                self._ids.append(eid)
+                new_shifts.append(self._shift_ids.get(self._assignments.get(eid, ""), 0))
+            rows[i] = row
+        if new_shifts:
+            self._row_shift = np.concatenate([self._row_shift, np.array(new_shifts, dtype=np.int16)])
+        return rows[inverse]
+
+    # ---- Ingestion ----
+    def ingest(self, employee_ids: Sequence[str], timestamps: Sequence, kinds: Sequence[str]) -> int:
+        """
+        Fold one batch of events into the per-month clock matrices.
+        `timestamps` may be datetime64 values or ISO strings; `kinds` are "in"/"out".
+        """
+        ts = np.asarray(timestamps).astype("datetime64[m]")
+        if ts.size == 0:
+            return 0
+        is_in = np.asarray(kinds) == "in"
+        emp = np.asarray(employee_ids)
+
+        with self._lock:
+            rows = self._row_ids(emp)
+            days = ts.astype("datetime64[D]")
+            months = days.astype("datetime64[M]")
+            minute = (ts - days).astype(np.int32)
+
+            for month in np.unique(months):
+                period = str(month)
+                clock = self._clocks.get(period)
+                if clock is None:
+                    clock = self._clocks[period] = _PeriodClock(month, len(self._ids))
+                clock.grow(len(self._ids))
+
+                sel = months == month
+                r, d, m, i = rows[sel], (days[sel] - month.astype("datetime64[D]")).astype(np.intp), minute[sel], is_in[sel]
+                np.minimum.at(clock.first_in, (r[i], d[i]), m[i])
+                np.maximum.at(clock.last_out, (r[~i], d[~i]), m[~i])
+                clock.employees[r] = True
+                self._dirty.add(period)
+        return int(ts.size)
+
+    # ---- Evaluation ----
+    def evaluate(self, period: str, as_of: Optional[datetime.date] = None) -> _PeriodResult:
+        """Classify every scheduled day of every employee with events in `period` (vectorised per shift)."""
+        as_of = as_of or datetime.date.today()
+        with self._lock:
+            clock = self._clocks[period]
+            n = len(self._ids)
+            clock.grow(n)
+            day_dates = clock.month.astype("datetime64[D]") + np.arange(clock.days)
+            not_future = day_dates <= np.datetime64(as_of, "D")
+
+            status = np.full((n, clock.days), OFF, dtype=np.int8)
+            late = np.zeros((n, clock.days), dtype=np.int16)
+            evaluated = clock.employees[:n].copy()
+
+            for shift_idx, shift in enumerate(self._shifts):
+                rows = np.flatnonzero(evaluated & (self._row_shift[:n] == shift_idx))
+                if rows.size == 0:
+                    continue
+                scheduled = np.is_busday(day_dates, weekmask=shift.weekmask, holidays=self._holidays) & not_future
+                cols = np.flatnonzero(scheduled)
+                first = clock.first_in[np.ix_(rows, cols)]
+                minutes_late = first - shift.start_minute
+                s = np.where(first == _NO_IN, ABSENT, np.where(minutes_late > shift.grace_minutes, LATE, PRESENT))
+                status[np.ix_(rows, cols)] = s
+                late[np.ix_(rows, cols)] = np.where(s == LATE, minutes_late, 0)
+
+            counts = np.stack([(status == k).sum(axis=1) for k in (PRESENT, LATE, ABSENT)], axis=1).astype(np.int32)
+            result = _PeriodResult(status, late, counts, evaluated, as_of)
+            self._results[period] = result
+            self._dirty.discard(period)
+            return result
+
+    def _result(self, period: str) -> Optional[_PeriodResult]:
+        if period not in self._clocks:
+            return None
+        result = self._results.get(period)
+        if period in self._dirty or result is None or (
+            result.as_of < datetime.date.today() and not self._closed(period, result.as_of)
+        ):
+            result = self.evaluate(period)
+        return result
+
+    @staticmethod
+    def _closed(period: str, as_of: datetime.date) -> bool:
+        """A month evaluated after its last day no longer changes with the calendar date."""
+        return str(np.datetime64(as_of, "M")) > period
+
+    # ---- Queries ----
+    def covers(self, employee_id: str, period: str) -> bool:
+        row = self._rows.get(employee_id)
+        clock = self._clocks.get(period)
+        return row is not None and clock is not None and row < len(clock.employees) and bool(clock.employees[row])
+
+    def anomalies(self, employee_id: str, period: str) -> Optional[List[Dict[str, Any]]]:
+        """Late/absent days of one employee in `period`, or None when the engine has no events for them."""
+        with self._lock:
+            if not self.covers(employee_id, period):
+                return None
+            result = self._result(period)
+            row = self._rows[employee_id]
+            status, late = result.status[row], result.late[row]
+            first_day = np.datetime64(period, "D")
+            out = []
+            for d in np.flatnonzero((status == LATE) | (status == ABSENT)):
+                code = int(status[d])
+                out.append({
+                    "day": str(first_day + int(d)),
+                    "status": STATUS_NAMES[code],
+                    "late_minutes": int(late[d]),
+                    "note": f"{int(late[d])} minutes late" if code == LATE else "No clock-in",
+                })
+            return out
+
+    def counts(self, employee_id: str, period: str) -> Optional[Dict[str, int]]:
+        with self._lock:
+            if not self.covers(employee_id, period):
+                return None
+            present, late, absent = self._result(period).counts[self._rows[employee_id]].tolist()
+            return {"present": present, "late": late, "absent": absent}
+
+    def monthly_counts(self, since_period: Optional[str] = None) -> List[Tuple[str, str, int, int, int]]:
+        """(employee_id, period, present, absent, late) for every evaluated employee-month >= since_period."""
+        rows = []
+        with self._lock:
+            for period in sorted(self._clocks):
+                if since_period and period < since_period:
+                    continue
+                result = self._result(period)
+                ids = np.flatnonzero(result.evaluated)
+                for row, (present, late, absent) in zip(ids.tolist(), result.counts[ids].tolist()):
+                    rows.append((self._ids[row], period, present, absent, late))
+        return rows
+
+    @property
+    def periods(self) -> List[str]:
+        return sorted(self._clocks)
+
+
+class StoreAttendanceEngine(AttendanceEngine):
+    """
+    AttendanceEngine fed from the HR store: calendars from shifts/shift_assignments/holidays,
+    events streamed from clock_events in batches. Refreshes read only events at or after
+    the newest timestamp already ingested (overlap is harmless).
+    """
+
+    def __init__(self, repo, batch_size: int = 100_000, refresh_s: Optional[float] = None):
+        self.repo = repo
+        self.batch_size = batch_size
+        self.refresh_s = refresh_s if refresh_s is not None else float(os.getenv("PERIOD_INDEX_REFRESH_S", "30"))
+        self._watermark: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        self._calendar = self._load_calendar()
+        super().__init__(*self._calendar)
+
+    def _load_calendar(self):
+        return [shift_from_row(r) for r in self.repo.shifts()], self.repo.shift_assignments(), self.repo.holidays()
+
+    def refresh(self):
+        started = time.perf_counter()
+        calendar = self._load_calendar()
+        if calendar != self._calendar:
+            self._calendar = calendar
+            self.set_calendar(*calendar)
+
+        events = 0
+        for batch in self.repo.clock_events(self._watermark, self.batch_size):
+            employee_ids, timestamps, kinds = zip(*batch)
+            events += self.ingest(np.array(employee_ids), np.array(timestamps, dtype="datetime64[m]"), np.array(kinds))
+            self._watermark = batch[-1][1]
+        self._loaded_at = time.monotonic()
+        if events:
+            logger.info(f"[ATTENDANCE] Ingested {events} clock events up to {self._watermark} "
+                        f"in {(time.perf_counter() - started) * 1000:.0f} ms; periods={self.periods}")
+
+    def maybe_refresh(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_s:
+            with self._lock:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_s:
+                    self.refresh()
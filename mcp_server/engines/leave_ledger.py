@@ -0,0 +1,283 @@
+import os
+import time
+import logging
+import datetime
+import threading
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("mcp.engines.leave_ledger")
+
+WEEKMASK = "1111100"
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()     # datetime64[D] 0 as a date ordinal
+# Statuses that hold days (and block overlapping requests)
+ACTIVE = ("submitted", "needs_approval", "approved")
+
+
+class LeaveEntry(NamedTuple):
+    request_id: str
+    employee_id: str
+    start: datetime.date
+    end: datetime.date
+    leave_type: str
+    status: str
+    days: int            # working days, net of public holidays
+
+
+class _EmployeeLeave:
+    """
+    Active leave of one employee as an augmented sorted interval list: entries ordered by
+    start, plus the running maximum of end dates. The first entry starting after a date is
+    found by bisection, and the running max tells whether anything before it reaches that
+    date, so overlap checks are O(log n) even when imported history overlaps itself.
+    `used` holds working days per (leave type, entitlement year); a request counts
+    towards the year it starts in.
+    """
+
+    __slots__ = ("starts", "max_end", "entries", "used")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.max_end: List[int] = []
+        self.entries: List[LeaveEntry] = []
+        self.used: Dict[Tuple[str, int], int] = {}
+
+    @classmethod
+    def build(cls, items: List[Tuple[int, int, LeaveEntry]]) -> "_EmployeeLeave":
+        """Bulk build from (start ordinal, end ordinal, entry): one sort and one running max."""
+        ledger = cls()
+        items.sort(key=lambda item: item[0])
+        ledger.starts = [start for start, _, _ in items]
+        ledger.max_end = list(accumulate((end for _, end, _ in items), max))
+        ledger.entries = [entry for _, _, entry in items]
+        for entry in ledger.entries:
+            ledger._count(entry, 1)
+        return ledger
+
+    def _count(self, entry: LeaveEntry, sign: int):
+        key = (entry.leave_type, entry.start.year)
+        self.used[key] = self.used.get(key, 0) + sign * entry.days
+
+    def overlapping(self, start: int, end: int) -> Optional[LeaveEntry]:
+        i = bisect_right(self.starts, end)          # entries[:i] start on or before `end`
+        if i == 0 or self.max_end[i - 1] < start:
+            return None
+        for j in range(i - 1, -1, -1):              # walk back to the entry that reaches `start`
+            if self.entries[j].end.toordinal() >= start:
+                return self.entries[j]
+            if self.max_end[j] < start:
+                break
+        return None
+
+    def _reindex_from(self, i: int):
+        running = self.max_end[i - 1] if i else -1
+        for j in range(i, len(self.entries)):
+            running = max(running, self.entries[j].end.toordinal())
+            self.max_end[j] = running
+
+    def add(self, entry: LeaveEntry):
+        start = entry.start.toordinal()
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.entries.insert(i, entry)
+        self.max_end.insert(i, 0)
+        self._reindex_from(i)
+        self._count(entry, 1)
+
+    def remove(self, request_id: str) -> Optional[LeaveEntry]:
+        for i, entry in enumerate(self.entries):
+            if entry.request_id == request_id:
+                del self.starts[i], self.entries[i], self.max_end[i]
+                self._reindex_from(i)
+                self._count(entry, -1)
+                return entry
+        return None
+
+
+class LeaveDecision(NamedTuple):
+    accepted: bool
+    entry: Optional[LeaveEntry] = None
+    conflict: Optional[LeaveEntry] = None
+    reason: Optional[str] = None
+
+
+class LeaveLedger:
+    """
+    In-memory leave ledger: per-employee interval index of active requests, working-day
+    counts (np.busday_count net of holidays) and days used per type and year, kept up to date
+    incrementally on submit/cancel. Writes go through `persist` so the store stays the
+    source of truth; the ledger only mirrors it. A ledger built with `from_repo` checks the
+    store's leave fingerprint at most every `refresh_s` seconds and reloads when rows were
+    written elsewhere (the bulk loader, another server process).
+    """
+
+    def __init__(self, holidays: Sequence[str] = (), weekmask: str = WEEKMASK, repo=None,
+                 refresh_s: Optional[float] = None):
+        self._holidays = np.array(sorted(holidays), dtype="datetime64[D]")
+        self._weekmask = weekmask
+        self._employees: Dict[str, _EmployeeLeave] = {}
+        self._entitlements: Dict[str, Dict[str, int]] = {}
+        self._history: Dict[str, List[LeaveEntry]] = {}      # every request, for leave_status
+        self._by_id: Dict[str, LeaveEntry] = {}
+        self._lock = threading.RLock()
+        self._repo = repo
+        self.refresh_s = refresh_s if refresh_s is not None else float(os.getenv("LEAVE_LEDGER_REFRESH_S", "30"))
+        self._fingerprint: Optional[tuple] = None
+        self._checked_at: Optional[float] = None
+
+    # ---- Loading ----
+    def working_days(self, start: datetime.date, end: datetime.date) -> int:
+        return int(np.busday_count(start, end + datetime.timedelta(days=1),
+                                   weekmask=self._weekmask, holidays=self._holidays))
+
+    def load(self, requests: Iterable[Sequence], entitlements: Iterable[Tuple[str, str, int]]):
+        """
+        Bulk load rows of (request_id, employee_id, start_date, end_date, leave_type, status)
+        and (employee_id, leave_type, days). Working days are computed in one vectorised call.
+        """
+        rows = list(requests)
+        with self._lock:
+            for eid, leave_type, days in entitlements:
+                self._entitlements.setdefault(eid, {})[leave_type] = int(days)
+            if not rows:
+                return
+            starts = np.array([r[2] for r in rows], dtype="datetime64[D]")
+            ends = np.array([r[3] for r in rows], dtype="datetime64[D]")
+            days = np.busday_count(starts, np.maximum(starts, ends + 1), weekmask=self._weekmask, holidays=self._holidays)
+            start_ords, end_ords = starts.astype(np.int64) + EPOCH_ORDINAL, ends.astype(np.int64) + EPOCH_ORDINAL
+            # Few distinct days: build each date object once and share it
+            day_ords, inverse = np.unique(np.concatenate([start_ords, end_ords]), return_inverse=True)
+            dates = [datetime.date.fromordinal(d) for d in day_ords.tolist()]
+            start_dates = [dates[i] for i in inverse[:len(rows)].tolist()]
+            end_dates = [dates[i] for i in inverse[len(rows):].tolist()]
+            rids, eids, _, _, types, statuses, *_ = zip(*rows)
+            entries = list(map(LeaveEntry._make, zip(rids, eids, start_dates, end_dates, types, statuses, days.tolist())))
+
+            self._by_id.update(zip(rids, entries))
+            active: Dict[str, List[Tuple[int, int, LeaveEntry]]] = {}
+            for entry, s, e in zip(entries, start_ords.tolist(), end_ords.tolist()):
+                history = self._history.get(entry.employee_id)
+                if history is None:
+                    history = self._history[entry.employee_id] = []
+                history.append(entry)
+                if entry.status in ACTIVE:
+                    items = active.get(entry.employee_id)
+                    if items is None:
+                        items = active[entry.employee_id] = []
+                    items.append((s, e, entry))
+            for eid, items in active.items():
+                if eid in self._employees:
+                    for _, _, entry in items:
+                        self._employees[eid].add(entry)
+                else:
+                    self._employees[eid] = _EmployeeLeave.build(items)
+            logger.info(f"[LEAVE-LEDGER] Loaded {len(rows)} requests for {len(self._history)} employees")
+
+    def reload(self):
+        """Rebuild from the store (requires `repo`)."""
+        with self._lock:
+            fingerprint = self._repo.leave_fingerprint()
+            self._employees, self._entitlements, self._history, self._by_id = {}, {}, {}, {}
+            self.load(self._repo.leave_requests_all(), self._repo.leave_entitlements_all())
+            self._fingerprint, self._checked_at = fingerprint, time.monotonic()
+
+    def _stale(self) -> bool:
+        return self._repo is not None and (self._checked_at is None or time.monotonic() - self._checked_at >= self.refresh_s)
+
+    def maybe_refresh(self):
+        if not self._stale():
+            return
+        with self._lock:
+            if not self._stale():
+                return
+            if self._repo.leave_fingerprint() != self._fingerprint:
+                logger.info("[LEAVE-LEDGER] Leave requests changed in the store, reloading")
+                self.reload()
+            else:
+                self._checked_at = time.monotonic()
+
+    def _track(self, entry: LeaveEntry):
+        self._by_id[entry.request_id] = entry
+        self._history.setdefault(entry.employee_id, []).append(entry)
+        if entry.status in ACTIVE:
+            ledger = self._employees.get(entry.employee_id)
+            if ledger is None:
+                ledger = self._employees[entry.employee_id] = _EmployeeLeave()
+            ledger.add(entry)
+
+    # ---- Writes ----
+    def submit(self, request_id: str, employee_id: str, start: datetime.date, end: datetime.date,
+               leave_type: str, status: str = "needs_approval",
+               persist: Optional[Callable[[LeaveEntry], None]] = None) -> LeaveDecision:
+        """Accept a request unless it overlaps active leave or exceeds the remaining entitlement of its start year."""
+        if end < start:
+            return LeaveDecision(False, reason=f"End date {end} is before start date {start}")
+        days = self.working_days(start, end)
+        entry = LeaveEntry(request_id, employee_id, start, end, leave_type, status, days)
+
+        self.maybe_refresh()
+        with self._lock:
+            ledger = self._employees.get(employee_id)
+            conflict = ledger.overlapping(start.toordinal(), end.toordinal()) if ledger else None
+            if conflict is not None:
+                return LeaveDecision(False, conflict=conflict,
+                                     reason=f"Overlaps {conflict.leave_type} leave {conflict.start} → {conflict.end}")
+            remaining = self.remaining(employee_id, start.year).get(leave_type)
+            if remaining is not None and days > remaining:
+                return LeaveDecision(False, reason=f"Only {remaining} {leave_type} leave days left, {days} requested")
+            if persist is not None:
+                persist(entry)
+            self._track(entry)
+            return LeaveDecision(True, entry=entry)
+
+    def cancel(self, employee_id: str, request_id: str,
+               persist: Optional[Callable[[LeaveEntry], bool]] = None) -> Optional[LeaveEntry]:
+        """Cancel an active request of `employee_id`; returns it, or None when there is none."""
+        self.maybe_refresh()
+        with self._lock:
+            entry = self._by_id.get(request_id)
+            if entry is None or entry.employee_id != employee_id or entry.status not in ACTIVE:
+                return None
+            if persist is not None and not persist(entry):
+                return None
+            self._employees[employee_id].remove(request_id)
+            cancelled = entry._replace(status="cancelled")
+            self._by_id[request_id] = cancelled
+            history = self._history[employee_id]
+            history[history.index(entry)] = cancelled
+            return cancelled
+
+    # ---- Reads ----
+    def remaining(self, employee_id: str, year: Optional[int] = None) -> Dict[str, int]:
+        """
+        Yearly entitlement minus working days held by active requests starting in `year`
+        (default: the current year), per leave type with an entitlement.
+        """
+        year = year or datetime.date.today().year
+        self.maybe_refresh()
+        with self._lock:
+            entitled = self._entitlements.get(employee_id, {})
+            ledger = self._employees.get(employee_id)
+            used = ledger.used if ledger else {}
+            return {leave_type: days - used.get((leave_type, year), 0) for leave_type, days in entitled.items()}
+
+    def records(self, employee_id: str, include_cancelled: bool = False) -> List[LeaveEntry]:
+        self.maybe_refresh()
+        with self._lock:
+            entries = self._history.get(employee_id, [])
+            return sorted((e for e in entries if include_cancelled or e.status != "cancelled"), key=lambda e: e.start)
+
+    def overlapping(self, employee_id: str, start: datetime.date, end: datetime.date) -> Optional[LeaveEntry]:
+        self.maybe_refresh()
+        with self._lock:
+            ledger = self._employees.get(employee_id)
+            return ledger.overlapping(start.toordinal(), end.toordinal()) if ledger else None
+
+    @classmethod
+    def from_repo(cls, repo, refresh_s: Optional[float] = None) -> "LeaveLedger":
+        ledger = cls(repo.holidays(), repo=repo, refresh_s=refresh_s)
+        ledger.reload()
+        return ledger
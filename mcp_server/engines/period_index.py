@@ -0,0 +1,237 @@
+import os
+import time
+import logging
+import threading
+import functools
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("mcp.engines.period_index")
+
+
+@functools.lru_cache(maxsize=4096)
+def period_ordinal(period: str) -> int:
+    """'YYYY-MM' → months since year 0 (consecutive periods are consecutive integers)."""
+    year, month = period.split("-")
+    month_num = int(month)
+    if not 1 <= month_num <= 12:
+        raise ValueError(f"Invalid period '{period}', expected YYYY-MM")
+    return int(year) * 12 + month_num - 1
+
+
+def ordinal_period(ordinal: int) -> str:
+    return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
+
+class PeriodRange:
+    """
+    Result of a range query. `series`/`observed` are views into the index (no copy);
+    totals come from the prefix sums.
+    """
+
+    __slots__ = ("first_ordinal", "series", "observed", "totals", "months", "_col")
+
+    def __init__(self, first_ordinal: int, series: np.ndarray, observed: np.ndarray,
+                 totals: np.ndarray, col: Dict[str, int]):
+        self.first_ordinal = first_ordinal
+        self.series = series
+        self.observed = observed
+        self.totals = totals
+        self.months = int(totals[-1])
+        self._col = col
+
+    def total(self, metric: str) -> float:
+        return self.totals[self._col[metric]].item()
+
+    def average(self, metric: str) -> Optional[float]:
+        return self.total(metric) / self.months if self.months else None
+
+    def items(self, metric: str) -> List[Tuple[str, float]]:
+        """(period, value) for months with data, oldest first."""
+        col = self.series[:, self._col[metric]]
+        return [(ordinal_period(self.first_ordinal + i), col[i].item()) for i in np.flatnonzero(self.observed)]
+
+
+class PeriodIndex:
+    """
+    Employees × months matrix of monthly aggregates with prefix sums along the month axis.
+
+    cum[e, m] = sum of values[e, :m], so any range total is cum[e, j + 1] - cum[e, i] (O(1))
+    and the monthly series is a slice of `values`. An extra trailing metric flags months
+    that have data, so averages only count observed months.
+
+    Appending a newly closed period only extends the prefix sums by one column; a
+    restated month recomputes prefix sums from that month on for the touched employees.
+    """
+
+    def __init__(self, metrics: Sequence[str], dtype=np.float64):
+        self.metrics = tuple(metrics)
+        self._col = {m: i for i, m in enumerate(self.metrics)}
+        self._width = len(self.metrics) + 1          # + observed flag
+        self._dtype = dtype
+        self._rows: Dict[str, int] = {}
+        self._base: Optional[int] = None             # ordinal of month column 0
+        self._months = 0
+        self._values = np.zeros((0, 0, self._width), dtype=dtype)
+        self._cum = np.zeros((0, 1, self._width), dtype=dtype)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def first_period(self) -> Optional[str]:
+        return ordinal_period(self._base) if self._base is not None and self._months else None
+
+    @property
+    def last_period(self) -> Optional[str]:
+        return ordinal_period(self._base + self._months - 1) if self._base is not None and self._months else None
+
+    # ---- Capacity ----
+    def _grow(self, rows: int, months: int):
+        """Reallocate to at least (rows, months), doubling capacity along the axis that overflowed."""
+        cap_rows, cap_months = self._values.shape[:2]
+        if rows <= cap_rows and months <= cap_months:
+            return
+        new_rows = max(rows, cap_rows * 2 if rows > cap_rows else cap_rows, 16)
+        new_months = max(months, cap_months * 2 if months > cap_months else cap_months, 12)
+        values = np.zeros((new_rows, new_months, self._width), dtype=self._dtype)
+        cum = np.zeros((new_rows, new_months + 1, self._width), dtype=self._dtype)
+        values[:cap_rows, :self._months] = self._values[:cap_rows, :self._months]
+        cum[:cap_rows, :self._months + 1] = self._cum[:cap_rows, :self._months + 1]
+        self._values, self._cum = values, cum
+
+    def _ensure_months(self, first: int, last: int):
+        if self._base is None:
+            self._base = first
+        if first < self._base:
+            # Older history arrived: shift everything right (rare, full prefix rebuild)
+            shift = self._base - first
+            self._grow(len(self._rows), self._months + shift)
+            self._values[:, shift:self._months + shift] = self._values[:, :self._months].copy()
+            self._values[:, :shift] = 0
+            self._base = first
+            self._months += shift
+            self._cum[:, 0] = 0
+            np.cumsum(self._values[:, :self._months], axis=1, out=self._cum[:, 1:self._months + 1])
+        needed = last - self._base + 1
+        if needed > self._months:
+            self._grow(len(self._rows), needed)
+            # New, still-empty months carry the running totals forward
+            self._cum[:, self._months + 1:needed + 1] = self._cum[:, self._months:self._months + 1]
+            self._months = needed
+
+    def _row_ids(self, employee_ids: Iterable[str]) -> np.ndarray:
+        rows = self._rows
+        idx = []
+        for eid in employee_ids:
+            row = rows.get(eid)
+            if row is None:
+                row = rows[eid] = len(rows)
+            idx.append(row)
+        self._grow(len(rows), self._months)
+        return np.asarray(idx, dtype=np.intp)
+
+    # ---- Writes ----
+    def upsert(self, rows: Iterable[Sequence]):
+        """Insert or replace monthly aggregates: rows of (employee_id, period, *metrics)."""
+        rows = list(rows)
+        if not rows:
+            return
+        employee_ids, periods, *columns = zip(*rows)
+        ordinals = np.fromiter((period_ordinal(p) for p in periods), dtype=np.int64, count=len(rows))
+        data = np.column_stack([np.asarray(c, dtype=self._dtype) for c in columns] + [np.ones(len(rows), self._dtype)])
+
+        with self._lock:
+            self._ensure_months(int(ordinals.min()), int(ordinals.max()))
+            e = self._row_ids(employee_ids)
+            m = ordinals - self._base
+            self._values[e, m] = data
+
+            # Recompute prefix sums only from the earliest touched month, only for touched rows
+            start = int(m.min())
+            touched = np.unique(e)
+            tail = np.cumsum(self._values[touched, start:self._months], axis=1)
+            self._cum[touched, start + 1:self._months + 1] = self._cum[touched, start:start + 1] + tail
+
+    # ---- Reads ----
+    def range(self, employee_id: str, start_period: Optional[str] = None,
+              end_period: Optional[str] = None) -> Optional[PeriodRange]:
+        """Aggregates of one employee over [start_period, end_period] (inclusive, clamped to the index)."""
+        with self._lock:
+            row = self._rows.get(employee_id)
+            if row is None or not self._months:
+                return None
+            i = period_ordinal(start_period) - self._base if start_period else 0
+            j = period_ordinal(end_period) - self._base if end_period else self._months - 1
+            i, j = max(i, 0), min(j, self._months - 1)
+            if i > j:
+                return None
+            values = self._values[row, i:j + 1]
+            totals = self._cum[row, j + 1] - self._cum[row, i]
+            return PeriodRange(self._base + i, values[:, :-1], values[:, -1], totals, self._col)
+
+    def totals(self, employee_ids: Sequence[str], start_period: Optional[str] = None,
+               end_period: Optional[str] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Range totals for many employees in one gather: (indexed employee_ids, totals of shape
+        (len(ids), len(metrics))). Employees missing from the index are left out.
+        """
+        with self._lock:
+            found = [eid for eid in employee_ids if eid in self._rows]
+            totals = np.zeros((len(found), len(self.metrics)), dtype=self._dtype)
+            if not found or not self._months:
+                return found, totals
+            i = period_ordinal(start_period) - self._base if start_period else 0
+            j = period_ordinal(end_period) - self._base if end_period else self._months - 1
+            i, j = max(i, 0), min(j, self._months - 1)
+            if i <= j:
+                rows = np.fromiter((self._rows[eid] for eid in found), dtype=np.intp, count=len(found))
+                totals = self._cum[rows, j + 1, :-1] - self._cum[rows, i, :-1]
+            return found, totals
+
+
+class LivePeriodIndex(PeriodIndex):
+    """
+    PeriodIndex kept in step with a store. `loader(since_period)` yields
+    (employee_id, period, *metrics) rows for periods >= since_period (all when None).
+    Refreshes re-read only from the latest indexed period on (the still-open month and
+    any newly closed ones), at most every `refresh_s` seconds.
+    """
+
+    def __init__(self, name: str, metrics: Sequence[str], loader: Callable[[Optional[str]], Iterable[Sequence]],
+                 dtype=np.float64, refresh_s: Optional[float] = None):
+        super().__init__(metrics, dtype)
+        self.name = name
+        self._loader = loader
+        self.refresh_s = refresh_s if refresh_s is not None else float(os.getenv("PERIOD_INDEX_REFRESH_S", "30"))
+        self._loaded_at: Optional[float] = None
+
+    def refresh(self):
+        started = time.perf_counter()
+        since = self.last_period
+        rows = list(self._loader(since))
+        self.upsert(rows)
+        self._loaded_at = time.monotonic()
+        logger.info(f"[PERIOD-INDEX] {self.name}: {len(rows)} rows since {since or 'start'} → "
+                    f"{len(self)} employees × {self._months} months in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_s
+
+    def maybe_refresh(self):
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    self.refresh()
+
+    def range(self, employee_id: str, start_period: Optional[str] = None,
+              end_period: Optional[str] = None) -> Optional[PeriodRange]:
+        self.maybe_refresh()
+        return super().range(employee_id, start_period, end_period)
+
+    def totals(self, employee_ids: Sequence[str], start_period: Optional[str] = None,
+               end_period: Optional[str] = None) -> Tuple[List[str], np.ndarray]:
+        self.maybe_refresh()
+        return super().totals(employee_ids, start_period, end_period)
@@ -0,0 +1,360 @@
+"""
+HR policy search: BM25 over policy passages, persisted as .npy arrays and memory-mapped.
+
+    python -m mcp_server.engines.policy_index            # index new/changed documents
+    python -m mcp_server.engines.policy_index --rebuild  # reindex everything
+    python -m mcp_server.engines.policy_index --query "aturan lembur"
+"""
+import os
+import re
+import json
+import math
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+import threading
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("mcp.engines.policy_index")
+
+_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+POLICY_DOCS_DIR = os.getenv("POLICY_DOCS_DIR", os.path.join(_ROOT, "config", "policies"))
+POLICY_INDEX_DIR = os.getenv("POLICY_INDEX_DIR", os.path.join(_ROOT, "data", "policy_index"))
+DOC_SUFFIXES = (".md", ".txt")
+INDEX_VERSION = 1
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_PREFIXES = ("peng", "pem", "pen", "per", "me", "di", "ber", "ter")
+_SUFFIXES = ("kan", "nya", "an", "in", "i")
+_STOPWORDS = {
+    "saya", "aku", "yang", "di", "ke", "dari", "untuk", "dan", "atau", "dengan", "pada", "dalam", "ini", "itu",
+    "apa", "apakah", "bagaimana", "berapa", "adalah", "akan", "tidak", "sebagai", "oleh", "per",
+    "the", "a", "an", "of", "to", "for", "is", "are", "and", "or", "in", "on", "my", "what", "how",
+}
+
+
+def _stem(token: str) -> str:
+    for p in _PREFIXES:
+        if token.startswith(p) and len(token) - len(p) >= 4:
+            token = token[len(p):]
+            break
+    for s in _SUFFIXES:
+        if token.endswith(s) and len(token) - len(s) >= 3:
+            return token[: -len(s)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word stems (Indonesian affixes stripped), stopwords removed."""
+    return [_stem(tok) for tok in _TOKEN.findall(text.lower()) if tok not in _STOPWORDS]
+
+
+class Passage(NamedTuple):
+    document: str
+    title: str
+    section: str
+    text: str
+
+
+class PolicyHit(NamedTuple):
+    passage: Passage
+    score: float
+
+
+def split_passages(document: str, text: str, max_words: int = 120) -> List[Passage]:
+    """Markdown sections, further split into paragraph chunks of at most `max_words` words."""
+    title, section, paragraphs, passages = os.path.splitext(os.path.basename(document))[0], "", [], []
+
+    def flush():
+        chunk: List[str] = []
+        for para in paragraphs:
+            words = para.split()
+            if chunk and len(chunk) + len(words) > max_words:
+                passages.append(Passage(document, title, section, " ".join(chunk)))
+                chunk = []
+            chunk.extend(words)
+            while len(chunk) > max_words:
+                passages.append(Passage(document, title, section, " ".join(chunk[:max_words])))
+                chunk = chunk[max_words:]
+        if chunk:
+            passages.append(Passage(document, title, section, " ".join(chunk)))
+        paragraphs.clear()
+
+    for block in re.split(r"\n\s*\n", text):
+        lines = block.strip().splitlines()
+        while lines:
+            heading = _HEADING.match(lines[0])
+            if not heading:
+                break
+            flush()
+            if len(heading.group(1)) == 1 and not passages and not section:
+                title = heading.group(2).strip()
+            else:
+                section = heading.group(2).strip()
+            lines = lines[1:]
+        if lines:
+            paragraphs.append(" ".join(line.strip() for line in lines))
+    flush()
+    return passages
+
+
+class _Snapshot(NamedTuple):
+    """One immutable index generation; queries read whichever snapshot is current."""
+    vocab: Dict[str, int]
+    offsets: np.ndarray      # term id → [offsets[t], offsets[t + 1]) in postings
+    postings: np.ndarray     # passage ids, grouped by term
+    tf: np.ndarray           # term frequency per posting
+    lengths: np.ndarray      # terms per passage
+    passages: List[Passage]
+    documents: Dict[str, dict]   # document → {"sha1", "mtime_ns", "size", "first", "count"}
+    avg_length: float
+
+
+class PolicyIndex:
+    """
+    BM25 over policy passages. Postings are stored CSR-style as .npy files in a
+    generation directory and opened with mmap_mode="r", so startup does not read the
+    index into memory and queries only touch the postings of their terms.
+
+    `sync()` re-tokenizes only new or changed documents: postings of unchanged
+    documents are carried over by remapping passage ids, then the merged postings are
+    written as a new generation and swapped in.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, docs_dir: Optional[str] = None, index_dir: Optional[str] = None,
+                 refresh_s: Optional[float] = None, max_words: Optional[int] = None):
+        self.docs_dir = docs_dir or POLICY_DOCS_DIR
+        self.index_dir = index_dir or POLICY_INDEX_DIR
+        self.refresh_s = refresh_s if refresh_s is not None else float(os.getenv("POLICY_INDEX_REFRESH_S", "60"))
+        self.max_words = max_words or int(os.getenv("POLICY_PASSAGE_WORDS", "120"))
+        self._snapshot: Optional[_Snapshot] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshot.passages) if self._snapshot else 0
+
+    # ---- Persistence ----
+    def _current_dir(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.index_dir, "CURRENT"), encoding="utf-8") as fh:
+                return os.path.join(self.index_dir, fh.read().strip())
+        except OSError:
+            return None
+
+    def open(self) -> bool:
+        """Memory-map the current generation from disk; False when there is none (or it is outdated)."""
+        path = self._current_dir()
+        if path is None:
+            return False
+        try:
+            with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+                meta = json.load(fh)
+            if meta.get("version") != INDEX_VERSION:
+                return False
+            arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                      for name in ("offsets", "postings", "tf", "lengths")}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[POLICY-INDEX] Cannot open {path}: {e}")
+            return False
+        self._snapshot = _Snapshot(
+            vocab={term: i for i, term in enumerate(meta["vocab"])},
+            passages=[Passage(*p) for p in meta["passages"]],
+            documents=meta["documents"],
+            avg_length=meta["avg_length"],
+            **arrays,
+        )
+        logger.info(f"[POLICY-INDEX] Opened {os.path.basename(path)}: {len(meta['documents'])} documents, "
+                    f"{len(self._snapshot.passages)} passages, {len(meta['vocab'])} terms")
+        return True
+
+    def _write(self, snap: _Snapshot) -> str:
+        previous = self._current_dir()
+        generation = f"gen-{time.time_ns()}"
+        path = os.path.join(self.index_dir, generation)
+        os.makedirs(path)
+        for name in ("offsets", "postings", "tf", "lengths"):
+            np.save(os.path.join(path, f"{name}.npy"), getattr(snap, name))
+        vocab = sorted(snap.vocab, key=snap.vocab.get)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump({"version": INDEX_VERSION, "vocab": vocab, "passages": [list(p) for p in snap.passages],
+                       "documents": snap.documents, "avg_length": snap.avg_length}, fh, ensure_ascii=False)
+        pointer = os.path.join(self.index_dir, "CURRENT.tmp")
+        with open(pointer, "w", encoding="utf-8") as fh:
+            fh.write(generation)
+        os.replace(pointer, os.path.join(self.index_dir, "CURRENT"))
+        # Open mmaps of the old generation stay valid after unlink
+        if previous and os.path.isdir(previous):
+            shutil.rmtree(previous, ignore_errors=True)
+        return path
+
+    # ---- Indexing ----
+    def _scan(self) -> Dict[str, Tuple[str, int, int]]:
+        """document (path relative to docs_dir) → (absolute path, mtime_ns, size)."""
+        found = {}
+        for root, _, files in os.walk(self.docs_dir):
+            for name in files:
+                if name.endswith(DOC_SUFFIXES):
+                    path = os.path.join(root, name)
+                    st = os.stat(path)
+                    found[os.path.relpath(path, self.docs_dir)] = (path, st.st_mtime_ns, st.st_size)
+        return found
+
+    def sync(self, rebuild: bool = False) -> bool:
+        """Bring the index in line with docs_dir; returns True when a new generation was written."""
+        with self._lock:
+            if self._snapshot is None and not rebuild:
+                self.open()
+            old = None if rebuild else self._snapshot
+            old_docs = old.documents if old else {}
+
+            found = self._scan()
+            changed: Dict[str, Tuple[str, int, int, str, str]] = {}
+            for doc, (path, mtime_ns, size) in found.items():
+                known = old_docs.get(doc)
+                if known and known["mtime_ns"] == mtime_ns and known["size"] == size:
+                    continue
+                with open(path, encoding="utf-8") as fh:
+                    text = fh.read()
+                sha1 = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                if known and known["sha1"] == sha1:
+                    known.update(mtime_ns=mtime_ns, size=size)     # touched, same content: skip from now on
+                    continue
+                changed[doc] = (path, mtime_ns, size, sha1, text)
+            removed = [doc for doc in old_docs if doc not in found]
+            if not changed and not removed and old is not None:
+                return False
+
+            started = time.perf_counter()
+            self._snapshot = self._merge(old, changed, set(removed) | set(changed))
+            path = self._write(self._snapshot)
+            logger.info(f"[POLICY-INDEX] {len(changed)} documents (re)indexed, {len(removed)} removed → "
+                        f"{len(self._snapshot.passages)} passages in {(time.perf_counter() - started) * 1000:.0f} ms "
+                        f"({os.path.basename(path)})")
+            return True
+
+    def _merge(self, old: Optional[_Snapshot], changed: Dict[str, Tuple], dropped: set) -> _Snapshot:
+        vocab = dict(old.vocab) if old else {}
+        documents: Dict[str, dict] = {}
+        passages: List[Passage] = []
+        terms, pids, tfs, lengths = [], [], [], []
+
+        if old is not None:
+            # Carry over postings of unchanged documents: keep their passages, remap ids
+            keep = np.ones(len(old.passages), dtype=bool)
+            for doc, info in old.documents.items():
+                if doc in dropped:
+                    keep[info["first"]:info["first"] + info["count"]] = False
+            remap = np.cumsum(keep) - 1
+            old_terms = np.repeat(np.arange(len(old.offsets) - 1, dtype=np.int32), np.diff(old.offsets))
+            mask = keep[old.postings]
+            terms.append(old_terms[mask])
+            pids.append(remap[old.postings[mask]].astype(np.int32))
+            tfs.append(np.asarray(old.tf)[mask])
+            lengths.append(np.asarray(old.lengths)[keep])
+            for doc, info in old.documents.items():
+                if doc not in dropped:
+                    documents[doc] = dict(info, first=int(remap[info["first"]]))
+            passages = [p for p, k in zip(old.passages, keep.tolist()) if k]
+
+        new_terms, new_pids, new_tfs, new_lengths = [], [], [], []
+        for doc, (_, mtime_ns, size, sha1, text) in sorted(changed.items()):
+            doc_passages = split_passages(doc, text, self.max_words)
+            documents[doc] = {"sha1": sha1, "mtime_ns": mtime_ns, "size": size,
+                              "first": len(passages), "count": len(doc_passages)}
+            for passage in doc_passages:
+                counts = Counter(tokenize(f"{passage.title} {passage.section} {passage.text}"))
+                for term, n in counts.items():
+                    tid = vocab.get(term)
+                    if tid is None:
+                        tid = vocab[term] = len(vocab)
+                    new_terms.append(tid)
+                    new_pids.append(len(passages))
+                    new_tfs.append(n)
+                new_lengths.append(sum(counts.values()))
+                passages.append(passage)
+        terms.append(np.asarray(new_terms, dtype=np.int32))
+        pids.append(np.asarray(new_pids, dtype=np.int32))
+        tfs.append(np.asarray(new_tfs, dtype=np.float32))
+        lengths.append(np.asarray(new_lengths, dtype=np.float32))
+
+        terms, pids, tfs = np.concatenate(terms), np.concatenate(pids), np.concatenate(tfs)
+        order = np.lexsort((pids, terms))
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocab)), out=offsets[1:])
+        lengths = np.concatenate(lengths)
+        return _Snapshot(vocab, offsets, pids[order], tfs[order], lengths, passages, documents,
+                         float(lengths.mean()) if len(lengths) else 0.0)
+
+    # ---- Queries ----
+    def _stale(self) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.refresh_s
+
+    def maybe_refresh(self):
+        """Open (or build) the index on first use, then pick up document changes every `refresh_s` seconds."""
+        if self._stale():
+            self._checked_at = time.monotonic()
+            self.sync()
+
+    def search(self, query: str, k: int = 3) -> List[PolicyHit]:
+        """Top-k passages for `query` by BM25."""
+        self.maybe_refresh()
+        snap = self._snapshot
+        if snap is None or not snap.passages:
+            return []
+        n = len(snap.passages)
+        ids, weights = [], []
+        for term in set(tokenize(query)):
+            tid = snap.vocab.get(term)
+            if tid is None:
+                continue
+            start, end = snap.offsets[tid], snap.offsets[tid + 1]
+            if start == end:
+                continue
+            p, tf = snap.postings[start:end], snap.tf[start:end]
+            idf = math.log(1 + (n - (end - start) + 0.5) / ((end - start) + 0.5))
+            norm = self.K1 * (1 - self.B + self.B * snap.lengths[p] / snap.avg_length)
+            ids.append(p)
+            weights.append(idf * tf * (self.K1 + 1) / (tf + norm))
+        if not ids:
+            return []
+        candidates, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(weights))
+        top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [PolicyHit(snap.passages[candidates[i]], round(float(scores[i]), 3)) for i in top.tolist()]
+
+    def titles(self) -> List[str]:
+        self.maybe_refresh()
+        snap = self._snapshot
+        if snap is None:
+            return []
+        return [snap.passages[info["first"]].title for _, info in sorted(snap.documents.items()) if info["count"]]
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="reindex every document")
+    parser.add_argument("--query", help="search after indexing")
+    parser.add_argument("-k", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    index = PolicyIndex()
+    index.sync(rebuild=args.rebuild)
+    if args.query:
+        for hit in index.search(args.query, args.k):
+            print(f"{hit.score:6.2f}  {hit.passage.title} › {hit.passage.section}\n        {hit.passage.text[:160]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,186 @@
+import os
 import uuid
 import logging
 import json
-from typing import Any
+import contextvars
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional
+import anyio
+import numpy as np
 import mcp.types as types
+from pydantic import BaseModel, TypeAdapter
 
 from . import models
+from .engines.attendance import StoreAttendanceEngine
+from .engines.leave_ledger import LeaveLedger
+from .engines.payroll import PayrollEngine, PayrollRun
+from .engines.period_index import LivePeriodIndex
+from .engines.policy_index import PolicyIndex
+from .pagination import paginate
+from .storage.repository import HRRepository, open_repository, period_days
 
 logger = logging.getLogger("mcp.hr_tools")
 
+POLICY_TOP_K = int(os.getenv("POLICY_TOP_K", "3"))
+# Upper bound on employees per bulk (*_many) call, and how many are read (and reported as progress) at a time
+BULK_MAX_EMPLOYEES = int(os.getenv("MCP_BULK_MAX_EMPLOYEES", "1000"))
+BULK_CHUNK = int(os.getenv("MCP_BULK_CHUNK", "250"))
+
+ProgressFn = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+# Set per call by call_tool; handlers run in worker threads and report through report_progress
+_progress: contextvars.ContextVar[Optional[ProgressFn]] = contextvars.ContextVar("mcp_progress", default=None)
+
+
+def report_progress(done: float, total: Optional[float] = None, message: Optional[str] = None):
+    """Send an MCP progress notification for the current tool call (no-op when the client asked for none)."""
+    send = _progress.get()
+    if send is None:
+        return
+    try:
+        anyio.from_thread.run(send, done, total, message)
+    except Exception as e:
+        logger.debug(f"[MCP-TOOLS] Progress notification dropped: {e}")
+
 
 class HRServices:
+    """Tool handlers over the HR store (see mcp_server/storage). Synchronous: call_tool runs them in worker threads."""
+
+    def __init__(self, repo: Optional[HRRepository] = None):
+        self._repo = repo
+        self._payroll_index: Optional[LivePeriodIndex] = None
+        self._attendance_index: Optional[LivePeriodIndex] = None
+        self._attendance_engine: Optional[StoreAttendanceEngine] = None
+        self._leave_ledger: Optional[LeaveLedger] = None
+        self._policy_index: Optional[PolicyIndex] = None
+
+    @property
+    def repo(self) -> HRRepository:
+        if self._repo is None:
+            self._repo = open_repository()
+        return self._repo
+
+    @property
+    def payroll_index(self) -> LivePeriodIndex:
+        """Monthly net pay per employee, with prefix sums for range totals."""
+        if self._payroll_index is None:
+            self._payroll_index = LivePeriodIndex("payroll", ("net",), lambda since: self.repo.payroll_monthly(since))
+        return self._payroll_index
+
+    @property
+    def leave_ledger(self) -> LeaveLedger:
+        """Per-employee interval index of leave requests with working-day balances."""
+        if self._leave_ledger is None:
+            self._leave_ledger = LeaveLedger.from_repo(self.repo)
+        return self._leave_ledger
+
+    @property
+    def policy_index(self) -> PolicyIndex:
+        """BM25 index over the policy documents (config/policies), memory-mapped from disk."""
+        if self._policy_index is None:
+            self._policy_index = PolicyIndex()
+        return self._policy_index
+
+    @property
+    def attendance_engine(self) -> StoreAttendanceEngine:
+        """Daily statuses computed from raw clock events, cached per (employee, period)."""
+        if self._attendance_engine is None:
+            self._attendance_engine = StoreAttendanceEngine(self.repo)
+        return self._attendance_engine
+
+    @property
+    def attendance_index(self) -> LivePeriodIndex:
+        """Monthly present/absent/late day counts per employee, with prefix sums."""
+        if self._attendance_index is None:
+            self._attendance_index = LivePeriodIndex(
+                "attendance", ("present", "absent", "late"), self._attendance_monthly, dtype=np.int32,
+            )
+        return self._attendance_index
+
+    def _attendance_monthly(self, since: Optional[str]):
+        """Imported daily statuses, overridden by the engine wherever clock events exist."""
+        engine = self.attendance_engine
+        engine.maybe_refresh()
+        computed = engine.monthly_counts(since)
+        covered = {(eid, period) for eid, period, *_ in computed}
+        imported = [row for row in self.repo.attendance_monthly(since) if (row[0], row[1]) not in covered]
+        return imported + computed
+
+    def _latest_attendance_period(self, employee_id: str) -> Optional[str]:
+        periods = [p for p in self.attendance_engine.periods if self.attendance_engine.covers(employee_id, p)]
+        periods.append(self.repo.latest_attendance_period(employee_id) or "")
+        return max(periods) or None
+
+    def run_payroll(self, period: str) -> PayrollRun:
+        """Close a payroll period: compute every employee in one pass, store payslips, extend the index."""
+        result = PayrollEngine(self.repo).run(period)
+        self.payroll_index.upsert(zip(result.employee_ids.tolist(), [period] * len(result.net), result.net.tolist()))
+        return result
+
+    def warm(self):
+        """Open the store and policy index, load the leave ledger, ingest clock events and build the period indexes before the first call."""
+        self.payroll_index.refresh()
+        self._leave_ledger = LeaveLedger.from_repo(self.repo)
+        self.policy_index.maybe_refresh()
+        self.attendance_engine.refresh()
+        self.attendance_index.refresh()
+
+    def _employee(self, employee_id: str) -> Dict[str, Any]:
+        emp = self.repo.employee(employee_id)
+        if emp is None:
+            raise ValueError(f"Unknown employee: {employee_id}")
+        return emp
+
+    def employee_profile(self, inp: models.EmployeeProfileInput) -> models.EmployeeProfileOutput:
+        emp = self._employee(inp.employee_id)
+        return models.EmployeeProfileOutput(
+            employee_id=emp["employee_id"],
+            name=emp["name"],
+            department=emp["department"] or "",
+            manager=emp["manager"] or "",
+            join_date=emp["join_date"],
+        )
+
     def submit_leave(self, inp: models.LeaveRequestInput) -> models.LeaveRequestOutput:
+        self._employee(inp.employee_id)
         rid = str(uuid.uuid4())
         logger.info(f"[MCP-TOOLS] Submit leave employee={inp.employee_id}, {inp.start}→{inp.end}")
+
+        def persist(entry):
+            self.repo.add_leave({
+                "request_id": entry.request_id,
+                "employee_id": entry.employee_id,
+                "start_date": entry.start.isoformat(),
+                "end_date": entry.end.isoformat(),
+                "leave_type": entry.leave_type,
+                "status": entry.status,
+                "reason": inp.reason,
+            })
+
+        decision = self.leave_ledger.submit(rid, inp.employee_id, inp.start, inp.end, inp.leave_type, persist=persist)
+        if not decision.accepted:
+            logger.info(f"[MCP-TOOLS] Leave rejected employee={inp.employee_id}: {decision.reason}")
+            return models.LeaveRequestOutput(request_id=rid, status="rejected", message=decision.reason)
         return models.LeaveRequestOutput(
             request_id=rid,
-            status="needs_approval",
-            message=f"Leave request {inp.start} → {inp.end} submitted for {inp.employee_id}",
+            status=decision.entry.status,
+            message=f"Leave request {inp.start} → {inp.end} ({decision.entry.days} working days) submitted for {inp.employee_id}",
+        )
+
+    def leave_cancel(self, inp: models.LeaveCancelInput) -> models.LeaveCancelOutput:
+        cancelled = self.leave_ledger.cancel(
+            inp.employee_id, inp.request_id, persist=lambda entry: self.repo.cancel_leave(entry.employee_id, entry.request_id)
+        )
+        logger.info(f"[MCP-TOOLS] Cancel leave employee={inp.employee_id}, request={inp.request_id}, ok={cancelled is not None}")
+        return models.LeaveCancelOutput(
+            employee_id=inp.employee_id,
+            request_id=inp.request_id,
+            status="cancelled" if cancelled else "not_found",
         )
 
     def leave_balance(self, inp: models.LeaveBalanceInput) -> models.LeaveBalanceOutput:
         balances = [
-            models.LeaveBalanceItem(type="annual", remaining_days=8),
-            models.LeaveBalanceItem(type="sick", remaining_days=4),
-            models.LeaveBalanceItem(type="maternity", remaining_days=90),
+            models.LeaveBalanceItem(type=leave_type, remaining_days=days)
+            for leave_type, days in self.leave_ledger.remaining(inp.employee_id).items()
         ]
         return models.LeaveBalanceOutput(
             employee_id=inp.employee_id,
@@ -31,65 +188,187 @@ class HRServices:
         )
 
     def payroll_lookup(self, inp: models.PayrollLookupInput) -> models.PayrollLookupOutput:
-        period = inp.period or "2025-08"
-        items = [
-            models.PayrollItem(code="BASIC", label="Basic Salary", amount=20_000_000.0),
-            models.PayrollItem(code="ALLOW", label="Allowance", amount=3_000_000.0),
-            models.PayrollItem(code="DEDUCT", label="Deduction (Unpaid leave)", amount=-1_000_000.0),
-        ]
-        net = sum(i.amount for i in items)
-        logger.info(f"[MCP-TOOLS] Payroll lookup employee={inp.employee_id}, period={period}, net={net}")
-        return models.PayrollLookupOutput(employee_id=inp.employee_id, period=period, net_pay=net, items=items)
+        period = inp.period if inp.period and inp.period != "latest" else self.repo.latest_payroll_period(inp.employee_id)
+        slip = self.repo.payslip(inp.employee_id, period) if period else None
+        if slip is None:
+            raise ValueError(f"No payslip for {inp.employee_id} in {inp.period or 'any period'}")
+        items = [models.PayrollItem(**item) for item in self.repo.payslip_items(inp.employee_id, period)]
+        logger.info(f"[MCP-TOOLS] Payroll lookup employee={inp.employee_id}, period={period}, net={slip['net_pay']}")
+        return models.PayrollLookupOutput(employee_id=inp.employee_id, period=period, net_pay=slip["net_pay"], items=items)
 
-    def deduction_reason(self, inp: models.DeductionReasonInput):
+    def payroll_history(self, inp: models.PayrollHistoryInput) -> models.PayrollHistoryOutput:
+        rng = self.payroll_index.range(inp.employee_id, inp.start_period, inp.end_period)
+        items = list(rng.items("net")) if rng else []
+        page, next_cursor = paginate(items, lambda item: item[0], inp.cursor, inp.limit)
+        logger.info(f"[MCP-TOOLS] Payroll history employee={inp.employee_id}, "
+                    f"{inp.start_period or 'start'}..{inp.end_period or 'latest'}, periods={len(page)}/{len(items)}")
+        # Totals always cover the whole range, not just the page
+        return models.PayrollHistoryOutput(
+            employee_id=inp.employee_id,
+            history=[models.PayrollHistoryItem(period=p, net=net) for p, net in page],
+            next_cursor=next_cursor,
+            total_count=len(items),
+            total_net=round(rng.total("net"), 2) if rng else 0.0,
+            average_net=round(rng.average("net"), 2) if rng else None,
+        )
+
+    def deduction_reason(self, inp: models.DeductionReasonInput) -> models.DeductionReasonOutput:
         logger.info(f"[MCP-TOOLS] Deduction reason for {inp.employee_id} period={inp.period}")
-        return {
-            "employee_id": inp.employee_id,
-            "period": inp.period,
-            "reason": "Unpaid leave for 3 days in this period"
-        }
+        slip = self.repo.payslip(inp.employee_id, inp.period)
+        if slip is None:
+            raise ValueError(f"No payslip for {inp.employee_id} in {inp.period}")
+        return models.DeductionReasonOutput(
+            employee_id=inp.employee_id,
+            period=inp.period,
+            reason=slip["deduction_reason"] or "No deductions in this period",
+        )
 
     def leave_status(self, inp: models.LeaveStatusInput) -> models.LeaveStatusOutput:
-        balances = [
-            models.LeaveBalanceItem(type="annual", remaining_days=10),
-            models.LeaveBalanceItem(type="sick", remaining_days=5),
+        def key(e):
+            return e.start.isoformat(), e.request_id
+        entries = sorted((e for e in self.leave_ledger.records(inp.employee_id) if e.status != "rejected"), key=key)
+        page, next_cursor = paginate(entries, key, inp.cursor, inp.limit)
+        records = [
+            models.LeaveRecord(start=e.start, end=e.end, type=e.leave_type, approved=e.status == "approved",
+                               request_id=e.request_id, working_days=e.days)
+            for e in page
         ]
-        logger.info(f"[MCP-TOOLS] Leave status lookup employee={inp.employee_id}")
-        return models.LeaveStatusOutput(employee_id=inp.employee_id, balances=balances)
-
-    def attendance_check(self, inp: models.AttendanceCheckInput):
-        logger.info(f"[MCP-TOOLS] Attendance check employee={inp.employee_id}, period={inp.period}")
-        return {
-            "employee_id": inp.employee_id,
-            "period": inp.period,
-            "late_days": [
-                {"date": "2025-08-18", "minutes_late": 120}
-            ]
-        }
-
-    def attendance_summary(self, inp: models.AttendanceSummaryInput):
-        logger.info(f"[MCP-TOOLS] Attendance summary employee={inp.employee_id}, period={inp.period}")
-        return {
-            "employee_id": inp.employee_id,
-            "period": inp.period,
-            "summary": {
-                "present": 18,
-                "absent": 2,
-                "late": 1
-            }
-        }
-
-    def benefit_summary(self, inp: models.BenefitSummaryInput):
+        logger.info(f"[MCP-TOOLS] Leave status lookup employee={inp.employee_id}, records={len(records)}/{len(entries)}")
+        return models.LeaveStatusOutput(employee_id=inp.employee_id, records=records,
+                                        next_cursor=next_cursor, total_count=len(entries))
+
+    def hr_policy(self, inp: models.HRPolicyInput) -> models.HRPolicyOutput:
+        if not inp.topic:
+            titles = self.policy_index.titles()
+            return models.HRPolicyOutput(topic="overview", policy="Available policies: " + "; ".join(titles))
+        hits = self.policy_index.search(inp.topic, k=POLICY_TOP_K)
+        logger.info(f"[MCP-TOOLS] Policy search topic={inp.topic!r}, hits={len(hits)}")
+        if not hits:
+            return models.HRPolicyOutput(topic=inp.topic, policy=f"No policy found for '{inp.topic}'")
+        passages = [models.PolicyPassage(score=h.score, **h.passage._asdict()) for h in hits]
+        return models.HRPolicyOutput(
+            topic=inp.topic,
+            policy="\n\n".join(f"{p.title} — {p.section}: {p.text}" if p.section else f"{p.title}: {p.text}" for p in passages),
+            passages=passages,
+        )
+
+    def attendance_check(self, inp: models.AttendanceCheckInput) -> models.AttendanceCheckOutput:
+        engine = self.attendance_engine
+        engine.maybe_refresh()
+        period = inp.period or self._latest_attendance_period(inp.employee_id) or date.today().strftime("%Y-%m")
+        logger.info(f"[MCP-TOOLS] Attendance check employee={inp.employee_id}, period={period}")
+        rows = engine.anomalies(inp.employee_id, period)
+        if rows is None:
+            # No clock events for this employee/month: fall back to imported daily statuses
+            rows = self.repo.attendance_anomalies(inp.employee_id, *period_days(period))
+        page, next_cursor = paginate(rows, lambda r: str(r["day"]), inp.cursor, inp.limit)
+        return models.AttendanceCheckOutput(
+            employee_id=inp.employee_id,
+            period=period,
+            anomalies=[
+                models.AttendanceAnomaly(date=r["day"], status=r["status"], note=r["note"]) for r in page
+            ],
+            next_cursor=next_cursor,
+            total_count=len(rows),
+        )
+
+    def attendance_summary(self, inp: models.AttendanceSummaryInput) -> models.AttendanceSummaryOutput:
+        index = self.attendance_index
+        index.maybe_refresh()
+        start = inp.start_period or inp.end_period or index.last_period or date.today().strftime("%Y-%m")
+        end = inp.end_period or start
+        rng = index.range(inp.employee_id, start, end)
+        period_range = f"{start}..{end}"
+        logger.info(f"[MCP-TOOLS] Attendance summary employee={inp.employee_id}, range={period_range}")
+        return models.AttendanceSummaryOutput(
+            employee_id=inp.employee_id,
+            period_range=period_range,
+            present=int(rng.total("present")) if rng else 0,
+            absent=int(rng.total("absent")) if rng else 0,
+            late=int(rng.total("late")) if rng else 0,
+        )
+
+    def benefit_summary(self, inp: models.BenefitSummaryInput) -> models.BenefitSummaryOutput:
         logger.info(f"[MCP-TOOLS] Benefit summary for {inp.employee_id}")
-        return {
-            "employee_id": inp.employee_id,
-            "benefits": [
-                {"code": "HLTH", "label": "Health Insurance", "value": "Active"},
-                {"code": "MEAL", "label": "Meal Allowance", "value": "Rp 500,000"}
-            ]
-        }
+        return models.BenefitSummaryOutput(
+            employee_id=inp.employee_id,
+            benefits=[models.BenefitItem(**b) for b in self.repo.benefits(inp.employee_id)],
+        )
+
+    # ---- Bulk variants: one batched backend read per chunk of employees ----
+    def _bulk_ids(self, inp: models.BulkEmployeesInput) -> List[str]:
+        ids = dict.fromkeys(inp.employee_ids)
+        if inp.manager_id:
+            ids.update(dict.fromkeys(self.repo.direct_reports(inp.manager_id)))
+        if not ids:
+            raise ValueError("Provide employee_ids or a manager_id with direct reports")
+        if len(ids) > BULK_MAX_EMPLOYEES:
+            raise ValueError(f"Too many employees in one call ({len(ids)} > {BULK_MAX_EMPLOYEES})")
+        return list(ids)
+
+    @staticmethod
+    def _chunked(ids: List[str], label: str) -> Iterator[List[str]]:
+        """Slices of BULK_CHUNK employees; progress is reported once the caller is done with each."""
+        for i in range(0, len(ids), BULK_CHUNK):
+            yield ids[i:i + BULK_CHUNK]
+            done = min(i + BULK_CHUNK, len(ids))
+            report_progress(done, len(ids), f"{label}: {done}/{len(ids)} employees")
 
+    def leave_balance_many(self, inp: models.LeaveBalanceManyInput) -> models.LeaveBalanceManyOutput:
+        ids = self._bulk_ids(inp)
+        ledger = self.leave_ledger
+        results, not_found = [], []
+        for chunk in self._chunked(ids, "leave_balance_many"):
+            known = set(self.repo.existing_employees(chunk))
+            for eid in chunk:
+                if eid not in known:
+                    not_found.append(eid)
+                    continue
+                balances = [models.LeaveBalanceItem(type=t, remaining_days=d) for t, d in ledger.remaining(eid).items()]
+                results.append(models.LeaveBalanceOutput(employee_id=eid, balances=balances))
+        logger.info(f"[MCP-TOOLS] Leave balance for {len(results)}/{len(ids)} employees")
+        return models.LeaveBalanceManyOutput(results=results, not_found=not_found)
 
+    def payroll_lookup_many(self, inp: models.PayrollLookupManyInput) -> models.PayrollLookupManyOutput:
+        ids = self._bulk_ids(inp)
+        period = inp.period
+        if not period or period == "latest":
+            self.payroll_index.maybe_refresh()
+            period = self.payroll_index.last_period
+        results, not_found = [], []
+        for chunk in self._chunked(ids, "payroll_lookup_many"):
+            slips = self.repo.payslips_many(chunk, period) if period else {}
+            items = self.repo.payslip_items_many(list(slips), period) if slips else {}
+            for eid in chunk:
+                if eid not in slips:
+                    not_found.append(eid)
+                    continue
+                results.append(models.PayrollLookupOutput(
+                    employee_id=eid, period=period, net_pay=slips[eid]["net_pay"],
+                    items=[models.PayrollItem(**item) for item in items.get(eid, [])],
+                ))
+        logger.info(f"[MCP-TOOLS] Payroll lookup for {len(results)}/{len(ids)} employees, period={period}")
+        return models.PayrollLookupManyOutput(period=period, results=results, not_found=not_found)
+
+    def attendance_summary_many(self, inp: models.AttendanceSummaryManyInput) -> models.AttendanceSummaryManyOutput:
+        ids = self._bulk_ids(inp)
+        index = self.attendance_index
+        index.maybe_refresh()
+        start = inp.start_period or inp.end_period or index.last_period or date.today().strftime("%Y-%m")
+        end = inp.end_period or start
+        period_range = f"{start}..{end}"
+        results, not_found = [], []
+        for chunk in self._chunked(ids, "attendance_summary_many"):
+            found, totals = index.totals(chunk, start, end)
+            results += [
+                models.AttendanceSummaryOutput(employee_id=eid, period_range=period_range,
+                                               present=present, absent=absent, late=late)
+                for eid, (present, absent, late) in zip(found, totals.astype(int).tolist())
+            ]
+            indexed = set(found)
+            not_found += [eid for eid in chunk if eid not in indexed]
+        logger.info(f"[MCP-TOOLS] Attendance summary for {len(results)}/{len(ids)} employees, range={period_range}")
+        return models.AttendanceSummaryManyOutput(period_range=period_range, results=results, not_found=not_found)
 
 services = HRServices()
 
@@ -107,43 +386,113 @@ MODEL_MAP = {
     "benefit_summary": models.BenefitSummaryInput,
     "hr_policy": models.HRPolicyInput,
     "employee_profile": models.EmployeeProfileInput,
+    "leave_balance_many": models.LeaveBalanceManyInput,
+    "payroll_lookup_many": models.PayrollLookupManyInput,
+    "attendance_summary_many": models.AttendanceSummaryManyInput,
 }
 
+# Tool name → output model (advertised as the tool's outputSchema)
+OUTPUT_MAP = {
+    "leave_request": models.LeaveRequestOutput,
+    "leave_status": models.LeaveStatusOutput,
+    "payroll_lookup": models.PayrollLookupOutput,
+    "payroll_history": models.PayrollHistoryOutput,
+    "deduction_reason": models.DeductionReasonOutput,
+    "attendance_check": models.AttendanceCheckOutput,
+    "attendance_summary": models.AttendanceSummaryOutput,
+    "leave_balance": models.LeaveBalanceOutput,
+    "leave_cancel": models.LeaveCancelOutput,
+    "benefit_summary": models.BenefitSummaryOutput,
+    "hr_policy": models.HRPolicyOutput,
+    "employee_profile": models.EmployeeProfileOutput,
+    "leave_balance_many": models.LeaveBalanceManyOutput,
+    "payroll_lookup_many": models.PayrollLookupManyOutput,
+    "attendance_summary_many": models.AttendanceSummaryManyOutput,
+}
 
-# ---- Dispatcher ----
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[types.ContentBlock]:
-    if not hasattr(services, name):
-        raise ValueError(f"Unknown tool: {name}")
+# Tools that can run long (ranges over years, many employees): advertised in the tool's _meta
+# so clients can run them as background jobs, and they report MCP progress where they can
+LONG_RUNNING_TOOLS = {
+    t.strip() for t in os.getenv(
+        "MCP_LONG_RUNNING_TOOLS",
+        "payroll_history,attendance_summary,leave_balance_many,payroll_lookup_many,attendance_summary_many",
+    ).split(",") if t.strip()
+}
+LONG_RUNNING_META = "hr-ai/long_running"
 
-    input_cls = MODEL_MAP.get(name)
-    if input_cls:
-        inp = input_cls(**arguments)  # ✅ Always validated Pydantic model
-    else:
-        inp = arguments
+# Also send results as a JSON TextContent for clients that predate structuredContent.
+# Off by default: it doubles every payload, and our client reads structuredContent.
+TEXT_FALLBACK = os.getenv("MCP_TEXT_FALLBACK", "false").lower() == "true"
 
-    result = getattr(services, name)(inp)
 
-    # ✅ Normalize output to dict
-    if hasattr(result, "model_dump"):  # Pydantic v2
-        payload = result.model_dump()
-    elif hasattr(result, "dict"):  # Pydantic v1 fallback
-        payload = result.dict()
-    else:
-        payload = result
+# Tools whose HRServices method is named differently from the tool
+HANDLER_ALIASES = {
+    "leave_request": "submit_leave",
+}
 
-    return [types.TextContent(type="text", text=json.dumps(payload))]
 
-# ---- Tool Registry ----
-async def list_tools() -> list[types.Tool]:
-    tools = []
+# ---- Dispatch table (built once at import) ----
+class ToolEntry(NamedTuple):
+    handler: Optional[Callable[[Any], Any]]
+    adapter: TypeAdapter
+    schema: Dict[str, Any]
+    output_schema: Optional[Dict[str, Any]]
+    tool: types.Tool
+
+
+def _build_dispatch() -> Dict[str, ToolEntry]:
+    table = {}
     for name, input_cls in MODEL_MAP.items():
-        tools.append(
-            types.Tool(
+        schema = input_cls.model_json_schema()
+        output_cls = OUTPUT_MAP.get(name)
+        output_schema = output_cls.model_json_schema(mode="serialization") if output_cls else None
+        table[name] = ToolEntry(
+            handler=getattr(services, HANDLER_ALIASES.get(name, name), None),
+            adapter=TypeAdapter(input_cls),
+            schema=schema,
+            output_schema=output_schema,
+            tool=types.Tool(
                 name=name,
                 title=name.replace("_", " ").title(),
                 description=f"{name.replace('_', ' ').capitalize()} tool",
-                inputSchema=input_cls.model_json_schema()
-            )
+                inputSchema=schema,
+                outputSchema=output_schema,
+                _meta={LONG_RUNNING_META: True} if name in LONG_RUNNING_TOOLS else None,
+            ),
         )
-    return tools
+    return table
+
+
+DISPATCH = _build_dispatch()
+TOOLS = [entry.tool for entry in DISPATCH.values()]
+
 
+def _run_handler(handler: Callable[[BaseModel], Any], inp: BaseModel):
+    """Handler call plus model_dump, both in the worker thread (bulk results are large)."""
+    result = handler(inp)
+    # Results are built from the *Output models, so they already match outputSchema;
+    # returning a CallToolResult skips the SDK's per-call jsonschema output validation.
+    structured = result.model_dump(mode="json") if isinstance(result, BaseModel) else result
+    content = [types.TextContent(type="text", text=json.dumps(structured))] if TEXT_FALLBACK else []
+    return structured, content
+
+
+# ---- Dispatcher ----
+async def call_tool(name: str, arguments: dict[str, Any], progress: Optional[ProgressFn] = None) -> types.CallToolResult:
+    entry = DISPATCH.get(name)
+    if entry is None or entry.handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+
+    inp = entry.adapter.validate_python(arguments or {})  # ✅ Always validated Pydantic model
+    # Handlers hit the HR store; keep that blocking I/O off the MCP event loop.
+    # The worker thread runs in a copy of this context, so it sees `progress`.
+    token = _progress.set(progress)
+    try:
+        structured, content = await anyio.to_thread.run_sync(_run_handler, entry.handler, inp)
+    finally:
+        _progress.reset(token)
+    return types.CallToolResult(content=content, structuredContent=structured, isError=False)
+
+# ---- Tool Registry ----
+async def list_tools() -> list[types.Tool]:
+    return TOOLS
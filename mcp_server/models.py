@@ -2,6 +2,11 @@ from typing import Optional, Literal, List
 from pydantic import BaseModel, Field
 from datetime import date
 
+# Pagination of list-shaped outputs (see mcp_server/pagination.py)
+CURSOR_FIELD = Field(None, description="next_cursor from the previous page; omit for the first page")
+LIMIT_FIELD = Field(None, ge=1, description="Maximum items per page")
+NEXT_CURSOR_FIELD = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
 # ============================================================
 # Employee Profile
 # ============================================================
@@ -48,16 +53,22 @@ class LeaveBalanceOutput(BaseModel):
 
 class LeaveStatusInput(BaseModel):
     employee_id: str
+    cursor: Optional[str] = CURSOR_FIELD
+    limit: Optional[int] = LIMIT_FIELD
 
 class LeaveRecord(BaseModel):
     start: date
     end: date
     type: LeaveType
     approved: bool
+    request_id: Optional[str] = None
+    working_days: Optional[int] = Field(None, description="Working days, net of weekends and public holidays")
 
 class LeaveStatusOutput(BaseModel):
     employee_id: str
     records: List[LeaveRecord]
+    total_count: Optional[int] = None
+    next_cursor: Optional[str] = NEXT_CURSOR_FIELD
 
 class LeaveCancelInput(BaseModel):
     employee_id: str
@@ -92,6 +103,8 @@ class PayrollHistoryInput(BaseModel):
     employee_id: str
     start_period: Optional[str] = None
     end_period: Optional[str] = None
+    cursor: Optional[str] = CURSOR_FIELD
+    limit: Optional[int] = LIMIT_FIELD
 
 class PayrollHistoryItem(BaseModel):
     period: str
@@ -100,6 +113,10 @@ class PayrollHistoryItem(BaseModel):
 class PayrollHistoryOutput(BaseModel):
     employee_id: str
     history: List[PayrollHistoryItem]
+    total_net: float = 0.0
+    average_net: Optional[float] = None
+    total_count: Optional[int] = None
+    next_cursor: Optional[str] = NEXT_CURSOR_FIELD
 
 class DeductionReasonInput(BaseModel):
     employee_id: str
@@ -118,6 +135,8 @@ class DeductionReasonOutput(BaseModel):
 class AttendanceCheckInput(BaseModel):
     employee_id: str
     period: Optional[str] = None
+    cursor: Optional[str] = CURSOR_FIELD
+    limit: Optional[int] = LIMIT_FIELD
 
 class AttendanceAnomaly(BaseModel):
     date: date
@@ -128,6 +147,8 @@ class AttendanceCheckOutput(BaseModel):
     employee_id: str
     period: str
     anomalies: List[AttendanceAnomaly]
+    total_count: Optional[int] = None
+    next_cursor: Optional[str] = NEXT_CURSOR_FIELD
 
 class AttendanceSummaryInput(BaseModel):
     employee_id: str
@@ -149,9 +170,14 @@ class AttendanceSummaryOutput(BaseModel):
 class BenefitSummaryInput(BaseModel):
     employee_id: str
 
+class BenefitItem(BaseModel):
+    code: str
+    label: str
+    value: str
+
 class BenefitSummaryOutput(BaseModel):
     employee_id: str
-    benefits: dict
+    benefits: List[BenefitItem]
 
 
 # ============================================================
@@ -161,7 +187,48 @@ class BenefitSummaryOutput(BaseModel):
 class HRPolicyInput(BaseModel):
     topic: Optional[str] = None
 
+class PolicyPassage(BaseModel):
+    document: str
+    title: str
+    section: str
+    text: str
+    score: float
+
 class HRPolicyOutput(BaseModel):
     topic: str
     policy: str
+    passages: List[PolicyPassage] = []
+
+
+
+# ============================================================
+# Bulk variants (managers / HR admins): many employees per call
+# ============================================================
+
+class BulkEmployeesInput(BaseModel):
+    employee_ids: List[str] = Field(default_factory=list, description="Employee unique IDs (e.g., [\"E-001\", \"E-002\"])")
+    manager_id: Optional[str] = Field(None, description="Employee ID of a manager: include all of their direct reports")
 
+class LeaveBalanceManyInput(BulkEmployeesInput):
+    pass
+
+class LeaveBalanceManyOutput(BaseModel):
+    results: List[LeaveBalanceOutput]
+    not_found: List[str] = []
+
+class PayrollLookupManyInput(BulkEmployeesInput):
+    period: Optional[str] = Field(None, description="Payroll period (YYYY-MM or 'latest')")
+
+class PayrollLookupManyOutput(BaseModel):
+    period: Optional[str] = None
+    results: List[PayrollLookupOutput]
+    not_found: List[str] = []
+
+class AttendanceSummaryManyInput(BulkEmployeesInput):
+    start_period: Optional[str] = None
+    end_period: Optional[str] = None
+
+class AttendanceSummaryManyOutput(BaseModel):
+    period_range: str
+    results: List[AttendanceSummaryOutput]
+    not_found: List[str] = []
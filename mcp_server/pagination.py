@@ -0,0 +1,43 @@
+"""Keyset cursor pagination for list-shaped tool outputs."""
+import os
+import json
+import base64
+import binascii
+from bisect import bisect_right
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+PAGE_SIZE = int(os.getenv("MCP_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MCP_MAX_PAGE_SIZE", "1000"))
+
+
+def encode_cursor(key: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Any:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return tuple(key) if isinstance(key, list) else key
+
+
+def paginate(items: Sequence[T], key: Callable[[T], Any], cursor: Optional[str] = None,
+             limit: Optional[int] = None) -> Tuple[List[T], Optional[str]]:
+    """
+    One page of `items` (sorted by `key`): the entries after the cursor's key, at most
+    `limit` of them. The cursor is the last key served, so pages stay stable when
+    entries are added before it. next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit or PAGE_SIZE, MAX_PAGE_SIZE))
+    start = 0
+    if cursor:
+        try:
+            start = bisect_right([key(item) for item in items], decode_cursor(cursor))
+        except TypeError:   # cursor issued by a different tool
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+    page = list(items[start:start + limit])
+    next_cursor = encode_cursor(key(page[-1])) if page and start + limit < len(items) else None
+    return page, next_cursor
@@ -1,23 +1,33 @@
+import os
 import sys
 import anyio
 import logging
+from contextlib import asynccontextmanager
 from mcp.server.lowlevel import Server
 from . import hr_tools
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
 logger = logging.getLogger("mcp_server")
 
 
-def main(transport: str = "stdio"):
+def build_server() -> Server:
+    """Create the HR MCP server with all tool handlers registered (transport-agnostic).
+
+    Callers warm `hr_tools.services` first; it does blocking SQLite work, so not here.
+    """
     app = Server("hr-ai-mcp")
 
-    @app.call_tool()
+    # Arguments are validated by the precompiled adapters in hr_tools.DISPATCH,
+    # so skip the SDK's per-call jsonschema pass.
+    @app.call_tool(validate_input=False)
     async def _call_tool(name: str, arguments: dict):
-        return await hr_tools.call_tool(name, arguments)
+        ctx = app.request_context
+        token = ctx.meta.progressToken if ctx.meta else None
+        progress = None
+        if token is not None:
+            async def progress(done, total, message):
+                await ctx.session.send_progress_notification(token, done, total, message,
+                                                             related_request_id=str(ctx.request_id))
+        return await hr_tools.call_tool(name, arguments, progress)
 
     @app.list_tools()
     async def _list_tools():
@@ -25,6 +35,60 @@ def main(transport: str = "stdio"):
         logger.info(f"[MCP-SERVER] Registered tools: {[t.name for t in tools]}")
         return tools
 
+    return app
+
+
+def build_http_app(app: Server):
+    """Starlette app serving streamable HTTP on /mcp."""
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+    manager = StreamableHTTPSessionManager(
+        app=app,
+        json_response=os.getenv("MCP_HTTP_JSON_RESPONSE", "false").lower() == "true",
+    )
+
+    async def handle_mcp(scope, receive, send):
+        await manager.handle_request(scope, receive, send)
+
+    @asynccontextmanager
+    async def lifespan(_):
+        async with manager.run():
+            yield
+
+    return Starlette(routes=[Mount("/mcp", app=handle_mcp)], lifespan=lifespan)
+
+
+def build_sse_app(app: Server):
+    """Starlette app serving legacy HTTP+SSE: GET /sse, POST /messages/."""
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+    from mcp.server.sse import SseServerTransport
+
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(request):
+        async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
+            await app.run(streams[0], streams[1], app.create_initialization_options())
+        return Response()
+
+    return Starlette(routes=[
+        Route("/sse", endpoint=handle_sse, methods=["GET"]),
+        Mount("/messages/", app=sse.handle_post_message),
+    ])
+
+
+def main(transport: str = "stdio"):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    hr_tools.services.warm()  # open (and seed, if empty) the HR store and build indexes before serving
+    app = build_server()
+
     if transport == "stdio":
         from mcp.server.stdio import stdio_server
 
@@ -33,8 +97,16 @@ def main(transport: str = "stdio"):
                 await app.run(streams[0], streams[1], app.create_initialization_options())
 
         anyio.run(arun)
+    elif transport in ("http", "streamable-http", "sse"):
+        import uvicorn
+
+        host = os.getenv("MCP_HOST", "0.0.0.0")
+        port = int(os.getenv("MCP_PORT", 8001))
+        http_app = build_sse_app(app) if transport == "sse" else build_http_app(app)
+        logger.info(f"[MCP-SERVER] Serving {transport} on {host}:{port}")
+        uvicorn.run(http_app, host=host, port=port, log_level="warning")
     else:
-        raise ValueError("Only stdio transport is supported right now.")
+        raise ValueError(f"Unsupported transport '{transport}', expected stdio, http or sse.")
 
 
 if __name__ == "__main__":
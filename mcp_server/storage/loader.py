@@ -0,0 +1,96 @@
+"""
+Bulk loader for HRIS exports (CSV or Parquet) into the HR store.
+
+Columns are matched by name against the table definition in `repository.TABLES`;
+extra columns are ignored and missing ones load as NULL.
+
+    python -m mcp_server.storage.loader payslips exports/payslips_2025-08.parquet
+    python -m mcp_server.storage.loader attendance exports/attendance.csv --db data/hr.sqlite
+"""
+import os
+import csv
+import time
+import logging
+import argparse
+from typing import Iterator, List, Sequence, Tuple
+
+from .repository import HRRepository, TABLES, open_repository
+
+logger = logging.getLogger("mcp.storage.loader")
+
+BATCH_SIZE = 50_000
+
+
+def _csv_batches(path: str, columns: Sequence[str], batch_size: int) -> Iterator[List[Tuple]]:
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        header = [h.strip() for h in next(reader)]
+        picks = [header.index(c) if c in header else None for c in columns]
+        batch = []
+        for row in reader:
+            batch.append(tuple((row[i] or None) if i is not None else None for i in picks))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _parquet_batches(path: str, columns: Sequence[str], batch_size: int) -> Iterator[List[Tuple]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet loading needs pyarrow (pip install pyarrow)") from e
+
+    pf = pq.ParquetFile(path)
+    present = [c for c in columns if c in pf.schema_arrow.names]
+    for record_batch in pf.iter_batches(batch_size=batch_size, columns=present):
+        cols = {name: record_batch.column(name).to_pylist() for name in present}
+        n = record_batch.num_rows
+        yield list(zip(*(cols.get(c, [None] * n) for c in columns)))
+
+
+def load_file(repo: HRRepository, table: str, path: str, batch_size: int = BATCH_SIZE) -> int:
+    """Stream `path` into `table` in batches (one transaction per batch). Returns rows loaded."""
+    if table not in TABLES:
+        raise ValueError(f"Unknown table '{table}', expected one of {tuple(TABLES)}")
+    columns = TABLES[table]
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        batches = _parquet_batches(path, columns, batch_size)
+    elif ext in (".csv", ".txt"):
+        batches = _csv_batches(path, columns, batch_size)
+    else:
+        raise ValueError(f"Unsupported export format '{ext}' (expected .csv or .parquet)")
+
+    started = time.perf_counter()
+    total = 0
+    for batch in batches:
+        total += repo.bulk_insert(table, batch)
+    repo.analyze()
+    elapsed = time.perf_counter() - started
+    logger.info(f"[STORAGE] Loaded {total} rows into {table} from {path} in {elapsed:.1f}s "
+                f"({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("table", choices=sorted(TABLES))
+    parser.add_argument("path", nargs="+", help="CSV or Parquet file(s)")
+    parser.add_argument("--db", help="SQLite path (default: HR_DB_PATH)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    os.environ.setdefault("HR_DB_SEED", "false")
+    repo = open_repository(**({"path": args.db} if args.db else {}))
+    try:
+        for path in args.path:
+            load_file(repo, args.table, path, args.batch_size)
+    finally:
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import os
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("mcp.storage")
+
+# Table → columns, in insert order. Shared by every backend and the bulk loader
+# (CSV headers / Parquet columns are matched against these names).
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "employees": ("employee_id", "name", "department", "manager", "join_date"),
+    "payslips": ("employee_id", "period", "net_pay", "deduction_reason"),
+    "payslip_items": ("employee_id", "period", "code", "label", "amount"),
+    "leave_requests": ("request_id", "employee_id", "start_date", "end_date", "leave_type", "status", "reason"),
+    "leave_entitlements": ("employee_id", "leave_type", "days"),
+    "attendance": ("employee_id", "day", "status", "late_minutes", "note"),
+    "benefits": ("employee_id", "code", "label", "value"),
+    "clock_events": ("employee_id", "ts", "kind"),
+    "shifts": ("shift_id", "start_time", "end_time", "grace_minutes", "weekmask"),
+    "shift_assignments": ("employee_id", "shift_id"),
+    "holidays": ("day", "name"),
+    "compensation": ("employee_id", "basic", "allowance"),
+}
+
+
+def period_days(start_period: str, end_period: Optional[str] = None) -> Tuple[str, str]:
+    """ISO day bounds covering YYYY-MM periods (string comparison on ISO dates is safe)."""
+    return f"{start_period}-01", f"{end_period or start_period}-31"
+
+
+class HRRepository:
+    """
+    Storage interface behind HRServices.
+    Methods are synchronous and thread-safe; the MCP dispatcher runs them off the event loop.
+    """
+
+    def employee(self, employee_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def existing_employees(self, employee_ids: Sequence[str]) -> List[str]:
+        """The subset of `employee_ids` that exist (one batched lookup)."""
+        raise NotImplementedError
+
+    def direct_reports(self, manager_id: str) -> List[str]:
+        """Employee IDs whose manager is `manager_id` (stored as the manager's ID or name)."""
+        raise NotImplementedError
+
+    def latest_payroll_period(self, employee_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def payslip(self, employee_id: str, period: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def payslip_items(self, employee_id: str, period: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def payslips_many(self, employee_ids: Sequence[str], period: str) -> Dict[str, Dict[str, Any]]:
+        """employee_id → payslip for `period`, for every listed employee that has one (one batched lookup)."""
+        raise NotImplementedError
+
+    def payslip_items_many(self, employee_ids: Sequence[str], period: str) -> Dict[str, List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+    def payroll_history(self, employee_id: str, start_period: str, end_period: str) -> List[Tuple[str, float]]:
+        raise NotImplementedError
+
+    def payroll_monthly(self, since_period: Optional[str] = None) -> Iterable[Tuple[str, str, float]]:
+        """(employee_id, period, net_pay) for all employees, periods >= since_period."""
+        raise NotImplementedError
+
+    def compensation(self) -> List[Tuple[str, float, float]]:
+        """(employee_id, monthly basic, monthly allowance) for every employee on payroll."""
+        raise NotImplementedError
+
+    def replace_payroll(self, period: str, payslips: Iterable[Sequence[Any]], items: Iterable[Sequence[Any]]) -> int:
+        """Atomically replace all payslips and payslip items of `period` (a payroll run)."""
+        raise NotImplementedError
+
+    def leave_overlapping(self, first_day: str, last_day: str, leave_type: str,
+                          status: str = "approved") -> List[Tuple[str, str, str]]:
+        """(employee_id, start_date, end_date) of leave of `leave_type` overlapping [first_day, last_day]."""
+        raise NotImplementedError
+
+    def leave_requests_all(self) -> List[Tuple[str, str, str, str, str, str]]:
+        """(request_id, employee_id, start_date, end_date, leave_type, status) of every request (loads the leave ledger)."""
+        raise NotImplementedError
+
+    def leave_entitlements_all(self) -> List[Tuple[str, str, int]]:
+        """(employee_id, leave_type, days) for every employee."""
+        raise NotImplementedError
+
+    def leave_fingerprint(self) -> tuple:
+        """Cheap summary of leave requests and entitlements that changes with any insert, status change or entitlement edit."""
+        raise NotImplementedError
+
+    def add_leave(self, record: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def cancel_leave(self, employee_id: str, request_id: str) -> bool:
+        raise NotImplementedError
+
+    def latest_attendance_period(self, employee_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def attendance_anomalies(self, employee_id: str, first_day: str, last_day: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def attendance_counts(self, employee_id: str, first_day: str, last_day: str) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def attendance_monthly(self, since_period: Optional[str] = None) -> Iterable[Tuple[str, str, int, int, int]]:
+        """(employee_id, period, present, absent, late) day counts for all employees, periods >= since_period."""
+        raise NotImplementedError
+
+    def clock_events(self, since_ts: Optional[str] = None, batch_size: int = 100_000) -> Iterator[List[Tuple[str, str, str]]]:
+        """Raw (employee_id, ts, kind) clock-in/out events with ts >= since_ts, in batches, ordered by ts."""
+        raise NotImplementedError
+
+    def shifts(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def shift_assignments(self) -> Dict[str, str]:
+        """employee_id → shift_id (employees without one use the default shift)."""
+        raise NotImplementedError
+
+    def holidays(self) -> List[str]:
+        raise NotImplementedError
+
+    def benefits(self, employee_id: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def bulk_insert(self, table: str, rows: Iterable[Sequence[Any]], columns: Optional[Sequence[str]] = None) -> int:
+        """Insert (or replace) many rows in one transaction; returns the row count."""
+        raise NotImplementedError
+
+    def is_empty(self) -> bool:
+        raise NotImplementedError
+
+    def analyze(self) -> None:
+        """Refresh query-planner statistics after large loads (optional)."""
+
+    def close(self) -> None:
+        pass
+
+
+def _sqlite_backend(**kwargs) -> HRRepository:
+    from .sqlite_repository import SQLiteRepository
+    return SQLiteRepository(**kwargs)
+
+
+# HR_STORAGE → factory; other backends (e.g. a read replica of the HRIS) plug in here
+BACKENDS = {
+    "sqlite": _sqlite_backend,
+}
+
+
+def open_repository(backend: Optional[str] = None, **kwargs) -> HRRepository:
+    """Open the configured backend (HR_STORAGE, default sqlite); seeds demo data into an empty store."""
+    backend = (backend or os.getenv("HR_STORAGE", "sqlite")).strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported HR_STORAGE '{backend}', expected one of {tuple(BACKENDS)}")
+    repo = BACKENDS[backend](**kwargs)
+
+    if repo.is_empty() and os.getenv("HR_DB_SEED", "true").lower() == "true":
+        from .seed import seed_demo
+        seed_demo(repo)
+        logger.info("[STORAGE] Empty HR store seeded with demo data")
+    return repo
@@ -0,0 +1,203 @@
+import uuid
+import random
+import logging
+import datetime
+from typing import Iterator, List, Tuple
+
+from .repository import HRRepository
+
+logger = logging.getLogger("mcp.storage.seed")
+
+DEPARTMENTS = ["Engineering", "Finance", "People", "Sales", "Operations", "Legal", "Marketing", "Support"]
+FIRST_NAMES = ["Andi", "Budi", "Citra", "Dewi", "Eka", "Fajar", "Gita", "Hadi", "Intan", "Joko", "Kartika", "Lina"]
+LAST_NAMES = ["Pratama", "Santoso", "Wijaya", "Lestari", "Saputra", "Hidayat", "Kusuma", "Nugroho", "Siregar"]
+ENTITLEMENTS = {"annual": 12, "sick": 6, "maternity": 90}
+BENEFITS = [
+    ("HLTH", "Health Insurance", "Active"),
+    ("MEAL", "Meal Allowance", "Rp 500,000"),
+]
+
+HOLIDAYS_2025 = [
+    ("2025-01-01", "Tahun Baru"), ("2025-03-31", "Idul Fitri"), ("2025-04-01", "Idul Fitri"),
+    ("2025-04-18", "Wafat Yesus Kristus"), ("2025-05-01", "Hari Buruh"), ("2025-05-29", "Kenaikan Yesus Kristus"),
+    ("2025-06-06", "Idul Adha"), ("2025-08-17", "Hari Kemerdekaan"), ("2025-12-25", "Natal"),
+]
+
+BASIC = 20_000_000.0
+ALLOWANCE = 3_000_000.0
+
+
+def employee_id(n: int) -> str:
+    return f"E-{n:03d}"
+
+
+def months_back(last_period: str, count: int) -> List[str]:
+    """`count` YYYY-MM periods ending at `last_period`, oldest first."""
+    year, month = map(int, last_period.split("-"))
+    periods = []
+    for _ in range(count):
+        periods.append(f"{year}-{month:02d}")
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return periods[::-1]
+
+
+def workdays(period: str) -> List[datetime.date]:
+    year, month = map(int, period.split("-"))
+    day = datetime.date(year, month, 1)
+    days = []
+    while day.month == month:
+        if day.weekday() < 5:
+            days.append(day)
+        day += datetime.timedelta(days=1)
+    return days
+
+
+def seed_demo(repo: HRRepository):
+    """Small demo dataset (E-001..E-005) matching the examples in the README."""
+    repo.bulk_insert("employees", [
+        ("E-001", "Andi Pratama", "Engineering", "Dewi Lestari", "2021-03-15"),
+        ("E-002", "Budi Santoso", "Finance", "Dewi Lestari", "2019-07-01"),
+        ("E-003", "Citra Wijaya", "People", "Hadi Kusuma", "2022-01-10"),
+        ("E-004", "Dewi Lestari", "Engineering", "Hadi Kusuma", "2016-05-23"),
+        ("E-005", "Eka Saputra", "Sales", "Dewi Lestari", "2023-09-04"),
+    ])
+    ids = [employee_id(n) for n in range(1, 6)]
+
+    repo.bulk_insert("compensation", [(eid, BASIC, ALLOWANCE) for eid in ids])
+    repo.bulk_insert("holidays", HOLIDAYS_2025)
+
+    repo.bulk_insert("leave_entitlements", [(eid, t, d) for eid in ids for t, d in ENTITLEMENTS.items()])
+    repo.bulk_insert("leave_requests", [
+        (str(uuid.uuid5(uuid.NAMESPACE_OID, f"{eid}-1")), eid, "2025-07-07", "2025-07-09", "annual", "approved", None)
+        for eid in ids
+    ] + [
+        (str(uuid.uuid5(uuid.NAMESPACE_OID, f"{eid}-2")), eid, "2025-08-21", "2025-08-21", "sick", "needs_approval", None)
+        for eid in ids
+    ] + [
+        (str(uuid.uuid5(uuid.NAMESPACE_OID, f"{eid}-3")), eid, "2025-08-11", "2025-08-13", "unpaid", "approved", None)
+        for eid in ids
+    ])
+
+    # Payslips come from payroll runs over the compensation and leave data above
+    from mcp_server.engines.payroll import PayrollEngine
+    engine = PayrollEngine(repo)
+    for period in months_back("2025-08", 6):
+        engine.run(period)
+
+    # Raw clock events for August; the attendance engine derives daily statuses from them
+    repo.bulk_insert("shifts", [("office", "09:00", "18:00", 15, "1111100")])
+    repo.bulk_insert("shift_assignments", [(eid, "office") for eid in ids])
+    events = []
+    for eid in ids:
+        for day in workdays("2025-08"):
+            if day.day in (11, 12, 13):
+                continue                                        # on unpaid leave: no clock-in
+            clock_in = "11:00" if day.day == 18 else "08:5" + str(day.day % 10)
+            events.append((eid, f"{day.isoformat()} {clock_in}:00", "in"))
+            events.append((eid, f"{day.isoformat()} 18:0{day.day % 10}:00", "out"))
+    repo.bulk_insert("clock_events", events)
+
+    repo.bulk_insert("benefits", [(eid, *b) for eid in ids for b in BENEFITS])
+
+
+def _batched(rows: Iterator[Tuple], size: int) -> Iterator[List[Tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_dataset(
+    repo: HRRepository,
+    employees: int = 50_000,
+    payroll_months: int = 12,
+    attendance_months: int = 1,
+    last_period: str = "2025-08",
+    seed: int = 7,
+    batch_size: int = 50_000,
+) -> dict:
+    """Synthetic organisation of `employees` people for load/latency benchmarks. Returns row counts."""
+    rng = random.Random(seed)
+    ids = [employee_id(n) for n in range(1, employees + 1)]
+    payroll_periods = months_back(last_period, payroll_months)
+    attendance_periods = months_back(last_period, attendance_months)
+
+    def employee_rows():
+        for n, eid in enumerate(ids):
+            manager = ids[(n // 8) * 8]
+            join = datetime.date(2010, 1, 1) + datetime.timedelta(days=rng.randrange(5000))
+            yield (eid, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                   DEPARTMENTS[n % len(DEPARTMENTS)], manager, join.isoformat())
+
+    basics = [round(rng.uniform(6, 40)) * 1_000_000.0 for _ in ids]
+
+    def payslip_rows(items: list):
+        for eid, basic in zip(ids, basics):
+            allowance = basic * 0.15
+            for period in payroll_periods:
+                unpaid = rng.choice((0, 0, 0, 0, 0, 0, 1, 2))
+                deduction = -round(unpaid * basic / 21, 2)
+                items.append((eid, period, "BASIC", "Basic Salary", basic))
+                items.append((eid, period, "ALLOW", "Allowance", allowance))
+                if unpaid:
+                    items.append((eid, period, "DEDUCT", "Deduction (Unpaid leave)", deduction))
+                yield (eid, period, basic + allowance + deduction,
+                       f"Unpaid leave for {unpaid} days in this period" if unpaid else None)
+
+    def attendance_rows():
+        days = [d.isoformat() for p in attendance_periods for d in workdays(p)]
+        for eid in ids:
+            for day in days:
+                r = rng.random()
+                if r < 0.03:
+                    yield (eid, day, "absent", 0, "No clock-in")
+                elif r < 0.10:
+                    late = rng.randrange(5, 180)
+                    yield (eid, day, "late", late, f"{late} minutes late")
+                else:
+                    yield (eid, day, "present", 0, None)
+
+    counts = {"employees": 0, "payslips": 0, "payslip_items": 0, "attendance": 0, "compensation": 0,
+              "leave_requests": 0, "leave_entitlements": 0, "benefits": 0}
+    for batch in _batched(employee_rows(), batch_size):
+        counts["employees"] += repo.bulk_insert("employees", batch)
+
+    items: list = []
+    for batch in _batched(payslip_rows(items), batch_size):
+        counts["payslips"] += repo.bulk_insert("payslips", batch)
+        counts["payslip_items"] += repo.bulk_insert("payslip_items", items)
+        items.clear()
+
+    for batch in _batched(attendance_rows(), batch_size):
+        counts["attendance"] += repo.bulk_insert("attendance", batch)
+
+    compensation = ((eid, basic, basic * 0.15) for eid, basic in zip(ids, basics))
+    for batch in _batched(compensation, batch_size):
+        counts["compensation"] += repo.bulk_insert("compensation", batch)
+
+    # Unpaid leave for ~8% of employees in the last period (input to payroll runs)
+    first_day = datetime.date.fromisoformat(f"{last_period}-01")
+    leave = (
+        (str(uuid.UUID(int=rng.getrandbits(128))), eid,
+         (first_day + datetime.timedelta(days=start)).isoformat(),
+         (first_day + datetime.timedelta(days=start + rng.randrange(1, 5))).isoformat(),
+         "unpaid", "approved", None)
+        for eid in ids if rng.random() < 0.08
+        for start in (rng.randrange(0, 24),)
+    )
+    for batch in _batched(leave, batch_size):
+        counts["leave_requests"] += repo.bulk_insert("leave_requests", batch)
+
+    entitlements = ((eid, t, d) for eid in ids for t, d in ENTITLEMENTS.items())
+    for batch in _batched(entitlements, batch_size):
+        counts["leave_entitlements"] += repo.bulk_insert("leave_entitlements", batch)
+    for batch in _batched(((eid, *b) for eid in ids for b in BENEFITS), batch_size):
+        counts["benefits"] += repo.bulk_insert("benefits", batch)
+
+    repo.analyze()
+    logger.info(f"[STORAGE] Generated dataset: {counts}")
+    return counts
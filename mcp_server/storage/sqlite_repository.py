@@ -0,0 +1,410 @@
+import os
+import json
+import queue
+import sqlite3
+import logging
+import threading
+import itertools
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .repository import HRRepository, TABLES
+
+logger = logging.getLogger("mcp.storage.sqlite")
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "hr.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    employee_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    department TEXT,
+    manager TEXT,
+    join_date TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_employees_manager ON employees (manager);
+
+CREATE TABLE IF NOT EXISTS payslips (
+    employee_id TEXT NOT NULL,
+    period TEXT NOT NULL,
+    net_pay REAL NOT NULL,
+    deduction_reason TEXT,
+    PRIMARY KEY (employee_id, period)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_payslips_period ON payslips (period);
+
+CREATE TABLE IF NOT EXISTS payslip_items (
+    employee_id TEXT NOT NULL,
+    period TEXT NOT NULL,
+    code TEXT NOT NULL,
+    label TEXT,
+    amount REAL NOT NULL,
+    PRIMARY KEY (employee_id, period, code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_payslip_items_period ON payslip_items (period);
+
+CREATE TABLE IF NOT EXISTS leave_requests (
+    request_id TEXT PRIMARY KEY,
+    employee_id TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    leave_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_leave_employee_start ON leave_requests (employee_id, start_date);
+CREATE INDEX IF NOT EXISTS ix_leave_type_start ON leave_requests (leave_type, start_date);
+
+CREATE TABLE IF NOT EXISTS compensation (
+    employee_id TEXT PRIMARY KEY,
+    basic REAL NOT NULL,
+    allowance REAL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS leave_entitlements (
+    employee_id TEXT NOT NULL,
+    leave_type TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    PRIMARY KEY (employee_id, leave_type)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS attendance (
+    employee_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    status TEXT NOT NULL,
+    late_minutes INTEGER DEFAULT 0,
+    note TEXT,
+    PRIMARY KEY (employee_id, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_attendance_day ON attendance (day);
+
+CREATE TABLE IF NOT EXISTS clock_events (
+    employee_id TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('in', 'out')),
+    PRIMARY KEY (employee_id, ts, kind)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_clock_events_ts ON clock_events (ts);
+
+CREATE TABLE IF NOT EXISTS shifts (
+    shift_id TEXT PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    grace_minutes INTEGER DEFAULT 0,
+    weekmask TEXT DEFAULT '1111100'
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS shift_assignments (
+    employee_id TEXT PRIMARY KEY,
+    shift_id TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS holidays (
+    day TEXT PRIMARY KEY,
+    name TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS benefits (
+    employee_id TEXT NOT NULL,
+    code TEXT NOT NULL,
+    label TEXT,
+    value TEXT,
+    PRIMARY KEY (employee_id, code)
+) WITHOUT ROWID;
+"""
+
+# Fixed SQL text: sqlite3 keeps a per-connection cache of compiled statements keyed
+# by the string, so every call after the first reuses the prepared statement.
+SQL = {
+    "employee": "SELECT employee_id, name, department, manager, join_date FROM employees WHERE employee_id = ?",
+    # Batched lookups take the IDs as one JSON array parameter, so the SQL text stays fixed
+    "existing_employees": "SELECT employee_id FROM employees WHERE employee_id IN (SELECT value FROM json_each(?))",
+    "direct_reports": (
+        "SELECT employee_id FROM employees "
+        "WHERE manager IN (SELECT ? UNION ALL SELECT name FROM employees WHERE employee_id = ?) ORDER BY employee_id"
+    ),
+    "latest_payroll_period": "SELECT MAX(period) FROM payslips WHERE employee_id = ?",
+    "payslip": "SELECT period, net_pay, deduction_reason FROM payslips WHERE employee_id = ? AND period = ?",
+    "payslip_items": "SELECT code, label, amount FROM payslip_items WHERE employee_id = ? AND period = ? ORDER BY code",
+    "payslips_many": (
+        "SELECT employee_id, net_pay, deduction_reason FROM payslips "
+        "WHERE period = ? AND employee_id IN (SELECT value FROM json_each(?))"
+    ),
+    "payslip_items_many": (
+        "SELECT employee_id, code, label, amount FROM payslip_items "
+        "WHERE period = ? AND employee_id IN (SELECT value FROM json_each(?)) ORDER BY employee_id, code"
+    ),
+    "payroll_history": (
+        "SELECT period, net_pay FROM payslips WHERE employee_id = ? AND period BETWEEN ? AND ? ORDER BY period"
+    ),
+    "payroll_monthly": "SELECT employee_id, period, net_pay FROM payslips WHERE period >= ?",
+    "compensation": "SELECT employee_id, basic, allowance FROM compensation",
+    "delete_payslips": "DELETE FROM payslips WHERE period = ?",
+    "delete_payslip_items": "DELETE FROM payslip_items WHERE period = ?",
+    "leave_overlapping": (
+        "SELECT employee_id, start_date, end_date FROM leave_requests "
+        "WHERE leave_type = ? AND status = ? AND start_date <= ? AND end_date >= ?"
+    ),
+    "leave_requests_all": (
+        "SELECT request_id, employee_id, start_date, end_date, leave_type, status FROM leave_requests "
+        "ORDER BY employee_id, start_date"
+    ),
+    "leave_entitlements_all": "SELECT employee_id, leave_type, days FROM leave_entitlements",
+    "leave_fingerprint": (
+        "SELECT (SELECT count(*) FROM leave_requests), (SELECT coalesce(max(rowid), 0) FROM leave_requests), "
+        "(SELECT count(*) FROM leave_requests WHERE status IN ('submitted', 'needs_approval', 'approved')), "
+        "(SELECT count(*) FROM leave_requests WHERE status = 'approved'), "
+        "(SELECT count(*) FROM leave_entitlements), (SELECT total(days) FROM leave_entitlements)"
+    ),
+    "cancel_leave": (
+        "UPDATE leave_requests SET status = 'cancelled' "
+        "WHERE employee_id = ? AND request_id = ? AND status NOT IN ('cancelled', 'rejected')"
+    ),
+    "latest_attendance_period": "SELECT substr(MAX(day), 1, 7) FROM attendance WHERE employee_id = ?",
+    "attendance_anomalies": (
+        "SELECT day, status, late_minutes, note FROM attendance "
+        "WHERE employee_id = ? AND day BETWEEN ? AND ? AND status != 'present' ORDER BY day"
+    ),
+    "attendance_counts": (
+        "SELECT status, COUNT(*) FROM attendance WHERE employee_id = ? AND day BETWEEN ? AND ? GROUP BY status"
+    ),
+    "attendance_monthly": (
+        "SELECT employee_id, substr(day, 1, 7) AS period, SUM(status = 'present'), SUM(status = 'absent'), "
+        "SUM(status = 'late') FROM attendance WHERE day >= ? GROUP BY employee_id, period"
+    ),
+    "clock_events": "SELECT employee_id, ts, kind FROM clock_events WHERE ts >= ? ORDER BY ts",
+    "shifts": "SELECT shift_id, start_time, end_time, grace_minutes, weekmask FROM shifts",
+    "shift_assignments": "SELECT employee_id, shift_id FROM shift_assignments",
+    "holidays": "SELECT day FROM holidays ORDER BY day",
+    "benefits": "SELECT code, label, value FROM benefits WHERE employee_id = ? ORDER BY code",
+    "any_employee": "SELECT 1 FROM employees LIMIT 1",
+}
+
+_INSERT = {
+    table: f"INSERT OR REPLACE INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+    for table, cols in TABLES.items()
+}
+
+_memory_ids = itertools.count()
+
+
+class _ConnectionPool:
+    """Fixed-size pool of read connections; callers block (in their worker thread) when all are busy."""
+
+    def __init__(self, connect, size: int):
+        self._connect = connect
+        self._size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self._size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SQLiteRepository(HRRepository):
+    """
+    SQLite backend (WAL mode): one serialised writer connection plus a pool of
+    read-only connections, so concurrent tool calls read without blocking each other.
+    Lookups are primary-key / index range scans on (employee_id, period|day).
+    """
+
+    def __init__(self, path: Optional[str] = None, pool_size: Optional[int] = None):
+        path = path or os.getenv("HR_DB_PATH", DEFAULT_DB_PATH)
+        if path == ":memory:":
+            # Shared-cache in-memory DB so the pool sees the writer's data
+            self._uri = f"file:hr-{os.getpid()}-{next(_memory_ids)}?mode=memory&cache=shared"
+            self._read_uri = self._uri
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._uri = f"file:{os.path.abspath(path)}"
+            self._read_uri = f"{self._uri}?mode=ro"
+        self.path = path
+
+        self._writer = self._open(self._uri)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.executescript(SCHEMA)
+        self._write_lock = threading.Lock()
+
+        size = pool_size or int(os.getenv("HR_DB_POOL", "8"))
+        self._readers = _ConnectionPool(self._open_reader, size)
+        logger.info(f"[STORAGE] SQLite store at {path} (read pool={size})")
+
+    @staticmethod
+    def _open(uri: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=len(SQL) * 2)
+        conn.execute("PRAGMA cache_size=-65536")     # 64 MiB page cache
+        conn.execute("PRAGMA mmap_size=268435456")   # 256 MiB memory-mapped reads
+        return conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = self._open(self._read_uri)
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _all(self, name: str, *params) -> List[tuple]:
+        with self._readers.connection() as conn:
+            return conn.execute(SQL[name], params).fetchall()
+
+    def _one(self, name: str, *params) -> Optional[tuple]:
+        with self._readers.connection() as conn:
+            return conn.execute(SQL[name], params).fetchone()
+
+    # ---- Employees ----
+    def employee(self, employee_id: str) -> Optional[Dict[str, Any]]:
+        row = self._one("employee", employee_id)
+        return dict(zip(TABLES["employees"], row)) if row else None
+
+    def existing_employees(self, employee_ids: Sequence[str]) -> List[str]:
+        return [eid for (eid,) in self._all("existing_employees", json.dumps(list(employee_ids)))]
+
+    def direct_reports(self, manager_id: str) -> List[str]:
+        return [eid for (eid,) in self._all("direct_reports", manager_id, manager_id)]
+
+    # ---- Payroll ----
+    def latest_payroll_period(self, employee_id: str) -> Optional[str]:
+        return self._one("latest_payroll_period", employee_id)[0]
+
+    def payslip(self, employee_id: str, period: str) -> Optional[Dict[str, Any]]:
+        row = self._one("payslip", employee_id, period)
+        return {"period": row[0], "net_pay": row[1], "deduction_reason": row[2]} if row else None
+
+    def payslip_items(self, employee_id: str, period: str) -> List[Dict[str, Any]]:
+        return [
+            {"code": code, "label": label, "amount": amount}
+            for code, label, amount in self._all("payslip_items", employee_id, period)
+        ]
+
+    def payslips_many(self, employee_ids: Sequence[str], period: str) -> Dict[str, Dict[str, Any]]:
+        return {
+            eid: {"period": period, "net_pay": net, "deduction_reason": reason}
+            for eid, net, reason in self._all("payslips_many", period, json.dumps(list(employee_ids)))
+        }
+
+    def payslip_items_many(self, employee_ids: Sequence[str], period: str) -> Dict[str, List[Dict[str, Any]]]:
+        items: Dict[str, List[Dict[str, Any]]] = {}
+        for eid, code, label, amount in self._all("payslip_items_many", period, json.dumps(list(employee_ids))):
+            items.setdefault(eid, []).append({"code": code, "label": label, "amount": amount})
+        return items
+
+    def payroll_history(self, employee_id: str, start_period: str, end_period: str) -> List[Tuple[str, float]]:
+        return self._all("payroll_history", employee_id, start_period, end_period)
+
+    def payroll_monthly(self, since_period: Optional[str] = None) -> List[Tuple[str, str, float]]:
+        return self._all("payroll_monthly", since_period or "")
+
+    def compensation(self) -> List[Tuple[str, float, float]]:
+        return self._all("compensation")
+
+    def replace_payroll(self, period: str, payslips: Iterable[Sequence[Any]], items: Iterable[Sequence[Any]]) -> int:
+        with self._write_lock, self._writer:
+            self._writer.execute(SQL["delete_payslips"], (period,))
+            self._writer.execute(SQL["delete_payslip_items"], (period,))
+            count = self._writer.executemany(_INSERT["payslips"], payslips).rowcount
+            self._writer.executemany(_INSERT["payslip_items"], items)
+            return count
+
+    # ---- Leave ----
+    def leave_overlapping(self, first_day: str, last_day: str, leave_type: str,
+                          status: str = "approved") -> List[Tuple[str, str, str]]:
+        return self._all("leave_overlapping", leave_type, status, last_day, first_day)
+
+    def leave_requests_all(self) -> List[Tuple[str, str, str, str, str, str]]:
+        return self._all("leave_requests_all")
+
+    def leave_entitlements_all(self) -> List[Tuple[str, str, int]]:
+        return self._all("leave_entitlements_all")
+
+    def leave_fingerprint(self) -> tuple:
+        return self._one("leave_fingerprint")
+
+    def add_leave(self, record: Dict[str, Any]) -> None:
+        self.bulk_insert("leave_requests", [tuple(record.get(c) for c in TABLES["leave_requests"])])
+
+    def cancel_leave(self, employee_id: str, request_id: str) -> bool:
+        with self._write_lock, self._writer:
+            return self._writer.execute(SQL["cancel_leave"], (employee_id, request_id)).rowcount > 0
+
+    # ---- Attendance ----
+    def latest_attendance_period(self, employee_id: str) -> Optional[str]:
+        return self._one("latest_attendance_period", employee_id)[0]
+
+    def attendance_anomalies(self, employee_id: str, first_day: str, last_day: str) -> List[Dict[str, Any]]:
+        cols = ("day", "status", "late_minutes", "note")
+        return [dict(zip(cols, row)) for row in self._all("attendance_anomalies", employee_id, first_day, last_day)]
+
+    def attendance_counts(self, employee_id: str, first_day: str, last_day: str) -> Dict[str, int]:
+        return dict(self._all("attendance_counts", employee_id, first_day, last_day))
+
+    def attendance_monthly(self, since_period: Optional[str] = None) -> List[Tuple[str, str, int, int, int]]:
+        return self._all("attendance_monthly", f"{since_period}-01" if since_period else "")
+
+    def clock_events(self, since_ts: Optional[str] = None, batch_size: int = 100_000) -> Iterator[List[Tuple[str, str, str]]]:
+        with self._readers.connection() as conn:
+            cur = conn.execute(SQL["clock_events"], (since_ts or "",))
+            while True:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield batch
+
+    def shifts(self) -> List[Dict[str, Any]]:
+        return [dict(zip(TABLES["shifts"], row)) for row in self._all("shifts")]
+
+    def shift_assignments(self) -> Dict[str, str]:
+        return dict(self._all("shift_assignments"))
+
+    def holidays(self) -> List[str]:
+        return [day for (day,) in self._all("holidays")]
+
+    # ---- Benefits ----
+    def benefits(self, employee_id: str) -> List[Dict[str, Any]]:
+        return [
+            {"code": code, "label": label, "value": value}
+            for code, label, value in self._all("benefits", employee_id)
+        ]
+
+    # ---- Bulk / admin ----
+    def bulk_insert(self, table: str, rows: Iterable[Sequence[Any]], columns: Optional[Sequence[str]] = None) -> int:
+        if table not in TABLES:
+            raise ValueError(f"Unknown table '{table}', expected one of {tuple(TABLES)}")
+        sql = _INSERT[table]
+        if columns is not None and tuple(columns) != TABLES[table]:
+            sql = (f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                   f"VALUES ({', '.join('?' * len(columns))})")
+        with self._write_lock, self._writer:
+            cur = self._writer.executemany(sql, rows)
+            return cur.rowcount
+
+    def is_empty(self) -> bool:
+        with self._write_lock:
+            return self._writer.execute(SQL["any_employee"]).fetchone() is None
+
+    def analyze(self):
+        """Refresh planner statistics after large loads."""
+        with self._write_lock:
+            self._writer.execute("ANALYZE")
+
+    def close(self) -> None:
+        self._readers.close()
+        self._writer.close()
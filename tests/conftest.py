@@ -0,0 +1,19 @@
+import pytest
+
+from mcp_server.storage.seed import seed_demo
+from mcp_server.storage.sqlite_repository import SQLiteRepository
+
+
+@pytest.fixture
+def repo():
+    """Empty in-memory store (shared-cache, so the read pool sees the writer's rows)."""
+    repo = SQLiteRepository(":memory:")
+    yield repo
+    repo.close()
+
+
+@pytest.fixture
+def demo_repo(repo):
+    """In-memory store with the README demo dataset (E-001..E-005, 2025 calendar)."""
+    seed_demo(repo)
+    return repo
@@ -0,0 +1,44 @@
+import datetime
+
+from app.graph.arg_resume import find_dates, parse_pending_args
+
+TODAY = datetime.date(2025, 8, 5)
+d = datetime.date.fromisoformat
+
+LEAVE_SCHEMA = {
+    "properties": {
+        "employee_id": {"type": "string"},
+        "start_date": {"type": "string", "format": "date"},
+        "end_date": {"type": "string", "format": "date"},
+        "leave_type": {"enum": ["annual", "sick", "unpaid", "maternity", "other"]},
+    },
+}
+
+
+def test_range_starting_before_today_rolls_forward_as_a_unit():
+    # Starts before today, ends today: next month's 3rd to 5th, never an inverted range
+    assert find_dates("tgl 3 s/d 5 ya", TODAY) == [d("2025-09-03"), d("2025-09-05")]
+    assert find_dates("3 - 5 agustus", TODAY) == [d("2026-08-03"), d("2026-08-05")]
+
+
+def test_range_within_the_coming_days_stays_put():
+    assert find_dates("tanggal 5 sampai 7", TODAY) == [d("2025-08-05"), d("2025-08-07")]
+    assert find_dates("10-12 september", TODAY) == [d("2025-09-10"), d("2025-09-12")]
+
+
+def test_range_end_before_start_runs_into_the_next_month():
+    assert find_dates("tgl 28 s/d 2", TODAY) == [d("2025-08-28"), d("2025-09-02")]
+    assert find_dates("28 desember - 2 januari", TODAY)[0] == d("2025-12-28")
+
+
+def test_explicit_dates_are_not_rolled():
+    assert find_dates("2025-08-01 sampai 2025-08-03", TODAY) == [d("2025-08-01"), d("2025-08-03")]
+
+
+def test_parse_pending_args():
+    parsed = parse_pending_args("cuti tahunan e-002 tgl 3 s/d 5", ["employee_id", "start_date", "end_date", "leave_type"],
+                                LEAVE_SCHEMA, today=TODAY)
+    assert parsed == {"employee_id": "E-002", "start_date": "2025-09-03", "end_date": "2025-09-05", "leave_type": "annual"}
+    # "ke-25" is not an employee ID; a single date fills both ends
+    assert parse_pending_args("cuti ke-25 besok", ["employee_id", "start_date", "end_date"], LEAVE_SCHEMA,
+                              today=TODAY) == {"start_date": "2025-08-06", "end_date": "2025-08-06"}
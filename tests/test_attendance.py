@@ -0,0 +1,49 @@
+import datetime
+
+from mcp_server.engines.attendance import AttendanceEngine, Shift, StoreAttendanceEngine
+
+
+def test_classifies_against_the_shift_and_calendar():
+    engine = AttendanceEngine([Shift("early", 7 * 60, 16 * 60, 10)], {"E-002": "early"}, holidays=["2025-08-18"])
+    engine.ingest(
+        ["E-001", "E-001", "E-001", "E-002", "E-002"],
+        ["2025-08-04T09:10", "2025-08-04T08:55", "2025-08-05T09:16", "2025-08-04T07:11", "2025-08-05T07:05"],
+        ["in", "in", "in", "in", "in"],
+    )
+
+    # Earliest clock-in counts; default shift 09:00 with 15 minutes grace; no clock-in is absent
+    anomalies = engine.anomalies("E-001", "2025-08")
+    assert anomalies[1:3] == [
+        {"day": "2025-08-05", "status": "late", "late_minutes": 16, "note": "16 minutes late"},
+        {"day": "2025-08-06", "status": "absent", "late_minutes": 0, "note": "No clock-in"},
+    ]
+    assert "2025-08-18" not in [a["day"] for a in anomalies]      # holiday, not scheduled
+    # 07:00 shift with 10 minutes grace: late on the 4th, on time on the 5th; 20 working days
+    assert engine.counts("E-002", "2025-08") == {"present": 1, "late": 1, "absent": 18}
+    assert engine.counts("E-003", "2025-08") is None       # no events: not covered
+    assert engine.anomalies("E-001", "2025-09") is None
+
+
+def test_reingesting_events_is_harmless():
+    engine = AttendanceEngine()
+    for _ in range(2):
+        engine.ingest(["E-001", "E-001"], ["2025-08-04T08:50", "2025-08-04T18:05"], ["in", "out"])
+    assert engine.counts("E-001", "2025-08") == {"present": 1, "late": 0, "absent": 20}
+
+
+def test_days_after_as_of_are_not_scheduled():
+    engine = AttendanceEngine()
+    engine.ingest(["E-001"], ["2025-08-04T08:50"], ["in"])
+    result = engine.evaluate("2025-08", as_of=datetime.date(2025, 8, 6))
+    assert result.counts.tolist() == [[1, 0, 3]]       # absent on the 1st, 5th and 6th only
+
+
+def test_store_engine_reads_clock_events(demo_repo):
+    engine = StoreAttendanceEngine(demo_repo, refresh_s=0)
+    engine.maybe_refresh()
+    assert engine.periods == ["2025-08"]
+    # 21 working days; late on the 18th, no clock-in during unpaid leave 11-13 August
+    assert engine.counts("E-001", "2025-08") == {"present": 17, "late": 1, "absent": 3}
+    late = [a for a in engine.anomalies("E-001", "2025-08") if a["status"] == "late"]
+    assert late == [{"day": "2025-08-18", "status": "late", "late_minutes": 120, "note": "120 minutes late"}]
+    assert ("E-001", "2025-08", 17, 3, 1) in engine.monthly_counts()
@@ -0,0 +1,65 @@
+import datetime
+
+from mcp_server.engines.leave_ledger import LeaveLedger
+from mcp_server.storage.repository import TABLES
+
+d = datetime.date.fromisoformat
+
+
+def _persist(repo):
+    return lambda e: repo.add_leave({"request_id": e.request_id, "employee_id": e.employee_id,
+                                     "start_date": e.start.isoformat(), "end_date": e.end.isoformat(),
+                                     "leave_type": e.leave_type, "status": e.status})
+
+
+def test_working_days_net_of_holidays(demo_repo):
+    ledger = LeaveLedger.from_repo(demo_repo)
+    # Mon 31 Mar → Fri 4 Apr 2025: Idul Fitri on the 31st and the 1st
+    assert ledger.working_days(d("2025-03-31"), d("2025-04-04")) == 3
+    assert ledger.working_days(d("2025-08-16"), d("2025-08-17")) == 0     # weekend + holiday
+
+
+def test_overlap_rejection(demo_repo):
+    ledger = LeaveLedger.from_repo(demo_repo)
+    decision = ledger.submit("r-new", "E-001", d("2025-07-09"), d("2025-07-10"), "annual")
+    assert not decision.accepted
+    assert (decision.conflict.start, decision.conflict.end) == (d("2025-07-07"), d("2025-07-09"))
+    # The day after, or another employee's leave on the same days, is fine
+    assert ledger.submit("r-2", "E-001", d("2025-07-10"), d("2025-07-10"), "annual").accepted
+    assert ledger.submit("r-3", "E-002", d("2025-07-10"), d("2025-07-10"), "annual").accepted
+
+
+def test_entitlement_is_per_start_year(demo_repo):
+    ledger = LeaveLedger.from_repo(demo_repo)
+    assert ledger.remaining("E-001", 2025)["annual"] == 12 - 3
+    assert ledger.remaining("E-001", 2026)["annual"] == 12
+    decision = ledger.submit("r-big", "E-001", d("2025-10-01"), d("2025-10-31"), "annual")
+    assert not decision.accepted and "Only 9 annual leave days left" in decision.reason
+
+
+def test_balance_after_submit_then_cancel(demo_repo):
+    ledger = LeaveLedger.from_repo(demo_repo)
+    persist = _persist(demo_repo)
+    decision = ledger.submit("r-sep", "E-003", d("2025-09-01"), d("2025-09-05"), "annual", persist=persist)
+    assert decision.accepted and decision.entry.days == 5
+    assert ledger.remaining("E-003", 2025)["annual"] == 12 - 3 - 5
+
+    cancelled = ledger.cancel("E-003", "r-sep", persist=lambda e: demo_repo.cancel_leave(e.employee_id, e.request_id))
+    assert cancelled.status == "cancelled"
+    assert ledger.remaining("E-003", 2025)["annual"] == 12 - 3
+    assert ledger.cancel("E-003", "r-sep") is None                  # nothing active left to cancel
+    assert ledger.overlapping("E-003", d("2025-09-01"), d("2025-09-05")) is None
+    assert [e.request_id for e in ledger.records("E-003", include_cancelled=True)][-1] == "r-sep"
+
+
+def test_reloads_rows_written_elsewhere(demo_repo):
+    ledger = LeaveLedger.from_repo(demo_repo, refresh_s=0)
+    demo_repo.add_leave(dict(zip(TABLES["leave_requests"],
+                                 ("r-ext", "E-005", "2025-10-06", "2025-10-07", "annual", "approved", None))))
+    assert ledger.remaining("E-005", 2025)["annual"] == 12 - 3 - 2
+    assert not ledger.submit("r-dup", "E-005", d("2025-10-07"), d("2025-10-07"), "annual").accepted
+
+
+def test_end_before_start():
+    ledger = LeaveLedger()
+    assert not ledger.submit("r", "E-001", d("2025-09-05"), d("2025-09-01"), "annual").accepted
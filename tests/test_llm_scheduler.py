@@ -0,0 +1,72 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from app.intent.hf_client import run_in_llm_pool
+from app.intent.llm_scheduler import OutboundScheduler, _priority, _session, llm_context
+
+
+def _queue_behind_pause(scheduler, callers):
+    """Queue (label, session, priority) callers in order while the model is paused; returns grant order."""
+    granted = []
+
+    def call(label, session, priority):
+        with llm_context(session=session, priority=priority):
+            scheduler.acquire("m", 10)
+        granted.append(label)
+
+    scheduler.backoff("m", 0.3)
+    threads = []
+    for caller in callers:
+        threads.append(threading.Thread(target=call, args=caller))
+        threads[-1].start()
+        time.sleep(0.03)                # keep the queueing order deterministic
+    for t in threads:
+        t.join(5)
+    return granted
+
+
+def test_interactive_before_batch_and_sessions_take_turns():
+    scheduler = OutboundScheduler(limits={}, default_rpm=0, default_tpm=0, timeout_s=5)
+    granted = _queue_behind_pause(scheduler, [
+        ("batch", "s1", "batch"),
+        ("a1", "a", "interactive"),
+        ("a2", "a", "interactive"),
+        ("b1", "b", "interactive"),
+    ])
+    assert granted == ["a1", "b1", "a2", "batch"]
+
+
+def test_request_bucket_spaces_calls():
+    scheduler = OutboundScheduler(limits={"m": {"rpm": 600}}, timeout_s=5)
+    for _ in range(600):                # the one-minute burst
+        scheduler.acquire("m", 1)
+    assert scheduler.acquire("m", 1) == pytest.approx(0.1, abs=0.05)
+
+
+def test_wait_times_out():
+    scheduler = OutboundScheduler(limits={}, default_rpm=0, default_tpm=0, timeout_s=0.1)
+    scheduler.backoff("m", 5)
+    with pytest.raises(TimeoutError):
+        scheduler.acquire("m", 10)
+
+
+def test_unknown_priority():
+    with pytest.raises(ValueError):
+        with llm_context(priority="urgent"):
+            pass
+
+
+def test_llm_pool_carries_the_caller_context():
+    def tags():
+        return _session.get(), _priority.get(), threading.current_thread().name
+
+    async def main():
+        with llm_context(session="s9", priority="batch"):
+            return await run_in_llm_pool(tags)
+
+    session, priority, thread = asyncio.run(main())
+    assert (session, priority) == ("s9", "batch")
+    assert thread.startswith("hf-call")
@@ -0,0 +1,35 @@
+import pytest
+
+from mcp_server.pagination import decode_cursor, encode_cursor, paginate
+
+ITEMS = [("2025-0%d" % m, f"r-{m}") for m in range(1, 8)]
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor(["2025-08", "r-1"])) == ("2025-08", "r-1")
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!")
+
+
+def test_pages_cover_every_item_once():
+    pages, cursor = [], None
+    while True:
+        page, cursor = paginate(ITEMS, key=lambda item: item, cursor=cursor, limit=3)
+        pages.append(page)
+        if cursor is None:
+            break
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [item for p in pages for item in p] == ITEMS
+
+
+def test_cursor_is_stable_when_earlier_items_are_added():
+    page, cursor = paginate(ITEMS, key=lambda item: item, limit=3)
+    grown = sorted(ITEMS + [("2025-00", "r-0")])
+    page2, _ = paginate(grown, key=lambda item: item, cursor=cursor, limit=3)
+    assert page2 == ITEMS[3:6]
+
+
+def test_cursor_from_another_tool_is_rejected():
+    _, cursor = paginate(ITEMS, key=lambda item: item, limit=3)
+    with pytest.raises(ValueError):
+        paginate(list(range(10)), key=lambda n: n, cursor=cursor)
@@ -0,0 +1,43 @@
+import pytest
+
+from mcp_server.engines.payroll import PayrollEngine, compute_payroll
+
+
+def test_unpaid_leave_is_clipped_to_the_period_and_net_of_holidays():
+    run = compute_payroll(
+        "2025-08", ["E-001", "E-002", "E-003"], [21_000_000, 10_500_000, 5_000_000], [1_000_000, 0, 0],
+        # E-001: Thu 31 Jul → Tue 5 Aug (3 August working days); E-002: Fri 15 → Mon 18 Aug
+        # with the 17th (a Sunday) a holiday; E-404 is not on the payroll
+        leave_employee_ids=["E-001", "E-002", "E-404"],
+        leave_starts=["2025-07-31", "2025-08-15", "2025-08-04"],
+        leave_ends=["2025-08-05", "2025-08-18", "2025-08-08"],
+        holidays=["2025-08-17"],
+    )
+    assert run.working_days == 21
+    assert run.unpaid_days.tolist() == [3, 2, 0]
+    assert run.deduction.tolist() == [3_000_000, 1_000_000, 0]
+    assert run.net.tolist() == [19_000_000, 9_500_000, 5_000_000]
+    assert run.payslip_rows()[0] == ("E-001", "2025-08", 19_000_000, "Unpaid leave for 3 days in this period")
+    assert ("E-002", "2025-08", "DEDUCT", "Deduction (Unpaid leave)", -1_000_000) in run.item_rows()
+
+
+def test_unpaid_days_are_capped_at_the_month():
+    run = compute_payroll("2025-02", ["E-001"], [2_000_000], [0],
+                          ["E-001", "E-001"], ["2025-01-01", "2025-02-10"], ["2025-03-31", "2025-02-14"])
+    assert run.unpaid_days.tolist() == [run.working_days]
+    assert run.net.tolist() == [0]
+
+
+def test_engine_writes_itemised_payslips(demo_repo):
+    PayrollEngine(demo_repo).run("2025-08")
+    payslip = demo_repo.payslip("E-001", "2025-08")
+    deduction = round(20_000_000 / 21 * 3, 2)      # unpaid leave 11-13 August
+    assert payslip["net_pay"] == pytest.approx(23_000_000 - deduction)
+    assert payslip["deduction_reason"] == "Unpaid leave for 3 days in this period"
+    items = {item["code"]: item["amount"] for item in demo_repo.payslip_items("E-001", "2025-08")}
+    assert items == {"BASIC": 20_000_000, "ALLOW": 3_000_000, "DEDUCT": pytest.approx(-deduction)}
+
+
+def test_engine_needs_compensation(repo):
+    with pytest.raises(ValueError):
+        PayrollEngine(repo).compute("2025-08")
@@ -0,0 +1,55 @@
+import pytest
+
+from mcp_server.engines.period_index import LivePeriodIndex, PeriodIndex, ordinal_period, period_ordinal
+
+
+def test_period_ordinals():
+    assert period_ordinal("2025-01") - period_ordinal("2024-12") == 1
+    assert ordinal_period(period_ordinal("2025-08")) == "2025-08"
+    with pytest.raises(ValueError):
+        period_ordinal("2025-13")
+
+
+def test_range_totals_and_average_skip_missing_months():
+    index = PeriodIndex(["net_pay"])
+    index.upsert([("E-001", "2025-01", 100.0), ("E-001", "2025-02", 200.0), ("E-001", "2025-04", 400.0),
+                  ("E-002", "2025-03", 50.0)])
+    r = index.range("E-001", "2025-01", "2025-04")
+    assert r.total("net_pay") == 700.0
+    assert r.months == 3
+    assert r.average("net_pay") == pytest.approx(700 / 3)
+    assert r.items("net_pay") == [("2025-01", 100.0), ("2025-02", 200.0), ("2025-04", 400.0)]
+    # Clamped to the indexed months
+    assert index.range("E-001", "2024-06", "2030-01").total("net_pay") == 700.0
+    assert index.range("E-404") is None
+
+
+def test_restated_and_older_months():
+    index = PeriodIndex(["net_pay"])
+    index.upsert([("E-001", "2025-02", 200.0), ("E-001", "2025-03", 300.0)])
+    index.upsert([("E-001", "2025-02", 250.0)])                       # restatement
+    index.upsert([("E-001", "2024-12", 10.0)])                        # older history shifts the base
+    assert index.first_period == "2024-12" and index.last_period == "2025-03"
+    assert index.range("E-001", "2025-02", "2025-03").total("net_pay") == 550.0
+    assert index.range("E-001").total("net_pay") == 560.0
+
+
+def test_totals_for_many_employees():
+    index = PeriodIndex(["present", "absent"])
+    index.upsert([("E-001", "2025-07", 20, 1), ("E-001", "2025-08", 18, 3), ("E-002", "2025-08", 21, 0)])
+    found, totals = index.totals(["E-002", "E-404", "E-001"], "2025-08")
+    assert found == ["E-002", "E-001"]
+    assert totals.tolist() == [[21, 0], [18, 3]]
+
+
+def test_live_index_reads_only_from_the_latest_period(demo_repo):
+    calls = []
+
+    def loader(since):
+        calls.append(since)
+        return demo_repo.payroll_monthly(since)
+
+    index = LivePeriodIndex("payroll", ["net_pay"], loader, refresh_s=0)
+    assert index.range("E-001", "2025-03", "2025-08").months == 6
+    index.range("E-001")
+    assert calls == [None, "2025-08"]
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from mcp_server.engines.policy_index import PolicyIndex, split_passages, tokenize
+
+LEMBUR = """# Kebijakan Lembur
+
+## Perhitungan upah lembur
+Upah lembur per jam adalah 1/173 dari gaji pokok bulanan.
+
+## Pembayaran
+Lembur dibayarkan bersama gaji bulan berikutnya.
+"""
+
+CUTI = """# Kebijakan Cuti
+
+## Cuti tahunan
+Karyawan berhak atas 12 hari cuti tahunan setiap tahun.
+"""
+
+
+@pytest.fixture
+def docs(tmp_path):
+    root = tmp_path / "policies"
+    root.mkdir()
+    (root / "lembur.md").write_text(LEMBUR, encoding="utf-8")
+    (root / "cuti.md").write_text(CUTI, encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def index(docs, tmp_path):
+    return PolicyIndex(str(docs), str(tmp_path / "index"), refresh_s=3600)
+
+
+def test_tokenize_strips_indonesian_affixes_and_stopwords():
+    assert tokenize("Bagaimana perhitungan lembur saya?") == ["hitung", "lembur"]
+
+
+def test_split_passages_by_section():
+    passages = split_passages("lembur.md", LEMBUR)
+    assert [(p.title, p.section) for p in passages] == [
+        ("Kebijakan Lembur", "Perhitungan upah lembur"), ("Kebijakan Lembur", "Pembayaran"),
+    ]
+    assert len(split_passages("x.md", " ".join(["kata"] * 25), max_words=10)) == 3
+
+
+def test_search_ranks_the_matching_section_first(index):
+    hits = index.search("perhitungan upah lembur")
+    assert hits[0].passage.section == "Perhitungan upah lembur"
+    assert index.search("cuti tahunan", k=1)[0].passage.title == "Kebijakan Cuti"
+    assert index.search("xyzzy") == []
+    assert sorted(index.titles()) == ["Kebijakan Cuti", "Kebijakan Lembur"]
+
+
+def test_sync_picks_up_changed_and_removed_documents(index, docs, tmp_path):
+    index.search("lembur")
+    assert not index.sync()                                     # nothing changed
+
+    (docs / "cuti.md").write_text(CUTI.replace("12 hari", "14 hari") + "\nCuti sakit butuh surat dokter.\n",
+                                  encoding="utf-8")
+    os.remove(docs / "lembur.md")
+    assert index.sync()
+    assert index.titles() == ["Kebijakan Cuti"]
+    assert "14 hari" in index.search("surat dokter")[0].passage.text
+
+    # A fresh process opens the persisted generation without re-indexing
+    reopened = PolicyIndex(str(docs), str(tmp_path / "index"), refresh_s=3600)
+    assert reopened.open() and len(reopened) == len(index)
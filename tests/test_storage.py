@@ -0,0 +1,53 @@
+import pytest
+
+from mcp_server.storage.repository import TABLES
+
+
+def test_empty_store(repo):
+    assert repo.is_empty()
+    assert repo.employee("E-001") is None
+    assert repo.leave_requests_all() == []
+
+
+def test_employee_lookups(demo_repo):
+    assert demo_repo.employee("E-002") == {
+        "employee_id": "E-002", "name": "Budi Santoso", "department": "Finance",
+        "manager": "Dewi Lestari", "join_date": "2019-07-01",
+    }
+    assert demo_repo.existing_employees(["E-001", "E-404", "E-005"]) == ["E-001", "E-005"]
+    # By manager ID or by manager name
+    assert demo_repo.direct_reports("E-004") == ["E-001", "E-002", "E-005"]
+
+
+def test_bulk_insert_replaces_and_rejects_unknown_tables(repo):
+    repo.bulk_insert("holidays", [("2025-08-17", "Hari Kemerdekaan")])
+    repo.bulk_insert("holidays", [("2025-08-17", "HUT RI")])
+    assert repo.holidays() == ["2025-08-17"]
+    with pytest.raises(ValueError):
+        repo.bulk_insert("salaries", [("E-001", 1)])
+
+
+def test_bulk_insert_column_subset(repo):
+    repo.bulk_insert("employees", [("E-009", "Gita Hidayat")], columns=("employee_id", "name"))
+    assert repo.employee("E-009")["department"] is None
+
+
+def test_leave_writes_and_fingerprint(repo):
+    before = repo.leave_fingerprint()
+    record = dict(zip(TABLES["leave_requests"], ("r-1", "E-001", "2025-09-01", "2025-09-02", "annual", "approved", None)))
+    repo.add_leave(record)
+    after_add = repo.leave_fingerprint()
+    assert after_add != before
+    assert repo.leave_overlapping("2025-09-02", "2025-09-30", "annual") == [("E-001", "2025-09-01", "2025-09-02")]
+
+    assert repo.cancel_leave("E-001", "r-1")
+    assert not repo.cancel_leave("E-001", "r-1")        # already cancelled
+    assert repo.leave_fingerprint() != after_add
+    assert repo.leave_overlapping("2025-09-01", "2025-09-30", "annual") == []
+
+
+def test_payslip_reads(demo_repo):
+    assert demo_repo.latest_payroll_period("E-001") == "2025-08"
+    history = demo_repo.payroll_history("E-001", "2025-06", "2025-08")
+    assert [period for period, _ in history] == ["2025-06", "2025-07", "2025-08"]
+    assert set(demo_repo.payslips_many(["E-001", "E-002", "E-404"], "2025-08")) == {"E-001", "E-002"}